@@ -8,6 +8,7 @@
 """
 
 import logging
+import time
 from wx_rss import WeChatAuth
 
 # 配置日志
@@ -71,15 +72,17 @@ def example_qrcode_only():
         print(f"\n二维码已保存到: {qrcode_path}")
         print("请使用微信扫描二维码登录")
 
-        # 这里可以自定义等待逻辑
-        import time
+        # 这里可以自定义等待逻辑：指数退避轮询，扫码后能更快检测到
         print("\n等待扫码中...")
-        for i in range(10):
-            time.sleep(3)
+        delay = 0.5
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
             if auth.check_login_status():
                 print("✅ 检测到登录成功！")
                 break
-            print(f"等待中... ({i+1}/10)")
+            time.sleep(delay)
+            delay = min(delay * 1.5, 3.0)
+            print(f"等待中... (剩余 {max(0, int(deadline - time.monotonic()))} 秒)")
 
     except Exception as e:
         print(f"\n获取二维码失败: {e}")
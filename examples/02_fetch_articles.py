@@ -7,76 +7,79 @@
 3. 获取包含正文的文章
 """
 
+import asyncio
+import functools
 import logging
-from wx_rss import WeChatMP
+import re
+from wx_rss import WeChatMP, AsyncWeChatMP, ArticleCache
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 
+# HTML 标签匹配（预编译，避免在循环中重复查找）
+_TAG_RE = re.compile(r'<[^>]+>')
 
-def example_fetch_articles():
+# 正文预览只需要开头部分，去标签前先截取 HTML，避免对整篇正文做正则替换
+_PREVIEW_HTML_LIMIT = 4096
+
+
+def _preview(text, n=50):
+    """截取预览文本（长度不足时直接返回原字符串，不做复制）"""
+    return text if len(text) <= n else text[:n]
+
+
+def example_fetch_articles(mp):
     """示例：获取文章列表"""
     print("=" * 60)
     print("示例 1：获取文章列表")
     print("=" * 60)
 
-    # 使用 context manager
-    with WeChatMP(token_file="wx_token.json") as mp:
-        # 检查登录状态
-        if not mp._is_logged_in:
-            print("\n请先登录...")
-            return
-
-        # 获取文章列表
-        fakeid = "MzAxMDAwMDAx"  # 替换为实际的 fakeid
-        articles = mp.fetch_articles(fakeid=fakeid, count=5)
+    # 获取文章列表
+    fakeid = "MzAxMDAwMDAx"  # 替换为实际的 fakeid
+    articles = mp.fetch_articles(fakeid=fakeid, count=5)
 
-        print(f"\n成功获取 {len(articles)} 篇文章：\n")
+    print(f"\n成功获取 {len(articles)} 篇文章：\n")
 
-        for i, article in enumerate(articles, 1):
-            print(f"{i}. {article['title']}")
-            print(f"   链接: {article['url']}")
-            print(f"   发布时间: {article['publish_time']}")
-            print(f"   摘要: {article['digest'][:50]}...")
-            print()
+    for i, article in enumerate(articles, 1):
+        print(f"{i}. {article['title']}")
+        print(f"   链接: {article['url']}")
+        print(f"   发布时间: {article['publish_time']}")
+        print(f"   摘要: {_preview(article['digest'])}...")
+        print()
 
 
-def example_fetch_with_content():
-    """示例：获取包含正文的文章"""
+async def example_fetch_with_content(mp):
+    """示例：获取包含正文的文章（正文并发获取）"""
     print("\n" + "=" * 60)
     print("示例 2：获取包含正文的文章")
     print("=" * 60)
 
-    with WeChatMP(token_file="wx_token.json") as mp:
-        if not mp._is_logged_in:
-            print("\n请先登录...")
-            return
-
-        # 获取包含正文的文章
-        fakeid = "MzAxMDAwMDAx"
-        articles = mp.fetch_articles(
-            fakeid=fakeid,
-            count=3,
-            with_content=True  # 包含正文内容
-        )
-
-        print(f"\n成功获取 {len(articles)} 篇文章（含正文）：\n")
-
-        for i, article in enumerate(articles, 1):
-            print(f"{i}. {article['title']}")
-            print(f"   正文长度: {len(article.get('content', ''))} 字符")
-            if article.get('content'):
-                # 显示正文前100个字符
-                import re
-                content_text = re.sub(r'<[^>]+>', '', article['content'])
-                print(f"   正文预览: {content_text[:100]}...")
-            print()
-
-
-def example_batch_fetch():
-    """示例：批量获取多个公众号的文章"""
+    # 获取包含正文的文章
+    fakeid = "MzAxMDAwMDAx"
+    articles = await mp.fetch_articles(
+        fakeid=fakeid,
+        count=3,
+        with_content=True  # 包含正文内容
+    )
+
+    print(f"\n成功获取 {len(articles)} 篇文章（含正文）：\n")
+
+    for i, article in enumerate(articles, 1):
+        print(f"{i}. {article['title']}")
+        content = article.get('content', '')
+        # 长度直接取原始 HTML，不需要去标签
+        print(f"   正文长度: {len(content)} 字符")
+        if content:
+            # 显示正文前100个字符
+            content_text = _TAG_RE.sub('', content[:_PREVIEW_HTML_LIMIT])
+            print(f"   正文预览: {_preview(content_text, 100)}...")
+        print()
+
+
+async def example_batch_fetch(mp):
+    """示例：并发获取多个公众号的文章"""
     print("\n" + "=" * 60)
-    print("示例 3：批量获取多个公众号的文章")
+    print("示例 3：并发获取多个公众号的文章")
     print("=" * 60)
 
     # 定义多个公众号
@@ -85,76 +88,100 @@ def example_batch_fetch():
         {"fakeid": "MzAxMDAwMDAy", "name": "公众号B"},
     ]
 
-    with WeChatMP(token_file="wx_token.json") as mp:
-        if not mp._is_logged_in:
-            print("\n请先登录...")
-            return
+    print(f"\n正在并发获取 {len(feeds)} 个公众号...")
+
+    # 所有公众号共享同一个会话并发抓取
+    fetch = functools.partial(mp.fetch_articles, count=5)
+    fetched = await asyncio.gather(
+        *[fetch(feed["fakeid"]) for feed in feeds],
+        return_exceptions=True
+    )
+
+    results = {}
+    total = 0
+    for feed, articles in zip(feeds, fetched):
+        if isinstance(articles, Exception):
+            print(f"❌ {feed['name']} 失败: {articles}")
+            results[feed['name']] = []
+        else:
+            print(f"✅ {feed['name']}: 成功获取 {len(articles)} 篇文章")
+            results[feed['name']] = articles
+            total += len(articles)
+
+    # 汇总结果
+    print("\n" + "=" * 60)
+    print("汇总结果")
+    print("=" * 60)
+    print(f"总共获取 {total} 篇文章")
+    for name, articles in results.items():
+        print(f"  {name}: {len(articles)} 篇")
 
-        results = {}
-
-        for feed in feeds:
-            try:
-                print(f"\n正在获取: {feed['name']}")
-                articles = mp.fetch_articles(
-                    fakeid=feed["fakeid"],
-                    count=5
-                )
-                results[feed['name']] = articles
-                print(f"✅ 成功获取 {len(articles)} 篇文章")
-
-            except Exception as e:
-                print(f"❌ 失败: {e}")
-                results[feed['name']] = []
-
-        # 汇总结果
-        print("\n" + "=" * 60)
-        print("汇总结果")
-        print("=" * 60)
-        total = sum(len(articles) for articles in results.values())
-        print(f"总共获取 {total} 篇文章")
-        for name, articles in results.items():
-            print(f"  {name}: {len(articles)} 篇")
-
-
-def example_fetch_with_pagination():
-    """示例：分页获取文章"""
+
+async def example_fetch_with_pagination(mp):
+    """示例：分页获取文章（处理当前页时预取下一页）"""
     print("\n" + "=" * 60)
     print("示例 4：分页获取文章")
     print("=" * 60)
 
-    with WeChatMP(token_file="wx_token.json") as mp:
-        if not mp._is_logged_in:
-            print("\n请先登录...")
-            return
+    fakeid = "MzAxMDAwMDAx"
+    all_articles = []
+    page_size = 5
+    max_pages = 2
+
+    def fetch_page(page):
+        return asyncio.ensure_future(
+            mp.fetch_articles(fakeid=fakeid, count=page_size, begin=page * page_size)
+        )
 
-        fakeid = "MzAxMDAwMDAx"
-        all_articles = []
-        page_size = 5
-        max_pages = 2
+    next_page = fetch_page(0)
 
-        for page in range(max_pages):
-            begin = page * page_size
-            print(f"\n获取第 {page + 1} 页（起始位置: {begin}）...")
+    for page in range(max_pages):
+        print(f"\n获取第 {page + 1} 页（起始位置: {page * page_size}）...")
 
-            try:
-                articles = mp.fetch_articles(
-                    fakeid=fakeid,
-                    count=page_size,
-                    begin=begin
-                )
+        try:
+            articles = await next_page
+        except Exception as e:
+            print(f"❌ 获取失败: {e}")
+            break
 
-                if not articles:
-                    print("没有更多文章了")
-                    break
+        if not articles:
+            print("没有更多文章了")
+            break
 
-                all_articles.extend(articles)
-                print(f"✅ 获取了 {len(articles)} 篇文章")
+        # 处理当前页的同时，下一页的请求已经发出
+        if page + 1 < max_pages:
+            next_page = fetch_page(page + 1)
 
-            except Exception as e:
-                print(f"❌ 获取失败: {e}")
-                break
+        all_articles.extend(articles)
+        print(f"✅ 获取了 {len(articles)} 篇文章")
 
-        print(f"\n总共获取 {len(all_articles)} 篇文章")
+    print(f"\n总共获取 {len(all_articles)} 篇文章")
+
+
+async def run_async_examples():
+    """在同一个 AsyncWeChatMP 会话中运行异步示例"""
+    async with AsyncWeChatMP(
+        token_file="wx_token.json",
+        concurrency=5,
+        cache=ArticleCache(ttl=600)  # 10 分钟内重复运行直接读取缓存
+    ) as amp:
+        # 示例 2：获取包含正文的文章
+        try:
+            await example_fetch_with_content(amp)
+        except Exception as e:
+            print(f"\n示例 2 出错: {e}")
+
+        # 示例 3：并发批量获取
+        try:
+            await example_batch_fetch(amp)
+        except Exception as e:
+            print(f"\n示例 3 出错: {e}")
+
+        # 示例 4：分页获取
+        try:
+            await example_fetch_with_pagination(amp)
+        except Exception as e:
+            print(f"\n示例 4 出错: {e}")
 
 
 def main():
@@ -162,29 +189,20 @@ def main():
     print("wx-mp-rss-core 抓取文章示例\n")
     print("注意：运行前请确保已经登录（ wx_token.json 存在）\n")
 
-    # 示例 1：获取文章列表
-    try:
-        example_fetch_articles()
-    except Exception as e:
-        print(f"\n示例 1 出错: {e}")
-
-    # 示例 2：获取包含正文的文章
-    try:
-        example_fetch_with_content()
-    except Exception as e:
-        print(f"\n示例 2 出错: {e}")
-
-    # 示例 3：批量获取
-    try:
-        example_batch_fetch()
-    except Exception as e:
-        print(f"\n示例 3 出错: {e}")
-
-    # 示例 4：分页获取
-    try:
-        example_fetch_with_pagination()
-    except Exception as e:
-        print(f"\n示例 4 出错: {e}")
+    # 同步示例共享同一个 WeChatMP 实例（凭证只加载一次，浏览器会话复用）
+    with WeChatMP(token_file="wx_token.json", cache=ArticleCache(ttl=600)) as mp:
+        if not mp._is_logged_in:
+            print("\n请先登录...")
+            return
+
+        # 示例 1：获取文章列表
+        try:
+            example_fetch_articles(mp)
+        except Exception as e:
+            print(f"\n示例 1 出错: {e}")
+
+        # 示例 2~4：异步示例（Playwright 同步 API 不能在事件循环中调用，单独运行）
+        asyncio.run(run_async_examples())
 
 
 if __name__ == "__main__":
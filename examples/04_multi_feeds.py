@@ -4,17 +4,40 @@
 这个示例展示如何：
 1. 为每个公众号生成独立的 JSON Feed
 2. 生成聚合 JSON Feed
-3. 批量处理多个公众号
+3. 使用 AsyncWeChatMP 并发处理多个公众号
 """
 
+import asyncio
+import functools
 import logging
-from wx_rss import WeChatMP
+import operator
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from wx_rss import AsyncWeChatMP, JSONFeedGenerator, ArticleCache, write_feed
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 
+# 排序键：等价于 lambda x: x.get('publish_time', 0)，但在 C 层调用
+_publish_time = operator.methodcaller("get", "publish_time", 0)
 
-def example_individual_feeds():
+# JSON Feed 输出目录
+FEED_DIR = Path("feeds")
+
+
+def _generate_and_write(job):
+    """生成并写入单个 JSON Feed（在子进程中执行，编码不受 GIL 限制）
+
+    Args:
+        job: (文件路径, JSONFeedGenerator 参数, 文章列表, feed_id)
+    """
+    filename, meta, articles, feed_id = job
+    generator = JSONFeedGenerator(**meta)
+    write_feed(generator.build(articles, feed_id=feed_id), filename)
+
+
+async def example_individual_feeds(mp):
     """示例：为每个公众号生成独立的 JSON Feed"""
     print("=" * 60)
     print("示例 1：为每个公众号生成独立的 JSON Feed")
@@ -39,69 +62,72 @@ def example_individual_feeds():
         },
     ]
 
-    with WeChatMP(token_file="wx_token.json") as mp:
-        if not mp._is_logged_in:
-            print("\n请先登录...")
-            return
+    FEED_DIR.mkdir(exist_ok=True)
+
+    print(f"\n开始并发处理 {len(feeds)} 个公众号...\n")
+
+    # 并发获取所有公众号的文章
+    fetch = functools.partial(mp.fetch_articles, count=5)
+    fetched = await asyncio.gather(
+        *[fetch(f["fakeid"]) for f in feeds],
+        return_exceptions=True
+    )
+
+    results = []
+    jobs = []
+
+    for feed, articles in zip(feeds, fetched):
+        if isinstance(articles, Exception):
+            print(f"❌ {feed['name']} 失败: {articles}")
+            results.append({
+                "name": feed['name'],
+                "filename": None,
+                "count": 0
+            })
+            continue
+
+        filename = FEED_DIR / f"{feed['name']}.json"
+        meta = {
+            "mp_name": feed['name'],
+            "mp_intro": feed['intro'],
+            "base_url": f"https://example.com/{feed['name']}"
+        }
+        jobs.append((filename, meta, articles, feed["fakeid"]))
+        results.append({
+            "name": feed['name'],
+            "filename": filename,
+            "count": len(articles)
+        })
+
+    # 抓取（I/O）走 asyncio，生成与写入（CPU）分发到多个进程
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor() as executor:
+        written = await asyncio.gather(
+            *[loop.run_in_executor(executor, _generate_and_write, job) for job in jobs],
+            return_exceptions=True
+        )
+
+    succeeded = [r for r in results if r['filename']]
+    for r, outcome in zip(succeeded, written):
+        if isinstance(outcome, Exception):
+            print(f"❌ {r['name']} 失败: {outcome}")
+            r['filename'] = None
+            r['count'] = 0
+        else:
+            print(f"✅ {r['name']} -> {r['filename']} ({r['count']} 篇)")
 
-        print(f"\n开始处理 {len(feeds)} 个公众号...\n")
-
-        results = []
-
-        for feed in feeds:
-            try:
-                print(f"正在处理: {feed['name']}")
-
-                # 获取文章
-                articles = mp.fetch_articles(
-                    fakeid=feed["fakeid"],
-                    count=5
-                )
-
-                # 生成 JSON Feed
-                json_feed = mp.generate_json_feed(
-                    mp_name=feed['name'],
-                    mp_intro=feed['intro'],
-                    articles=articles,
-                    base_url=f"https://example.com/{feed['name']}",
-                    feed_id=feed["fakeid"]
-                )
-
-                # 保存
-                filename = f"feeds/{feed['name']}.json"
-                import os
-                os.makedirs("feeds", exist_ok=True)
-
-                with open(filename, "w", encoding="utf-8") as f:
-                    f.write(json_feed)
-
-                print(f"✅ {feed['name']} -> {filename} ({len(articles)} 篇)")
-                results.append({
-                    "name": feed['name'],
-                    "filename": filename,
-                    "count": len(articles)
-                })
-
-            except Exception as e:
-                print(f"❌ {feed['name']} 失败: {e}")
-                results.append({
-                    "name": feed['name'],
-                    "filename": None,
-                    "count": 0
-                })
-
-        # 汇总结果
-        print("\n" + "=" * 60)
-        print("处理结果汇总")
-        print("=" * 60)
-        success_count = sum(1 for r in results if r['filename'])
-        print(f"成功: {success_count}/{len(feeds)}")
-        for r in results:
-            status = "✅" if r['filename'] else "❌"
-            print(f"  {status} {r['name']}: {r['count']} 篇")
+    # 汇总结果
+    print("\n" + "=" * 60)
+    print("处理结果汇总")
+    print("=" * 60)
+    success_count = sum(1 for r in results if r['filename'])
+    print(f"成功: {success_count}/{len(feeds)}")
+    for r in results:
+        status = "✅" if r['filename'] else "❌"
+        print(f"  {status} {r['name']}: {r['count']} 篇")
 
 
-def example_aggregated_feed():
+async def example_aggregated_feed(mp):
     """示例：生成聚合 JSON Feed"""
     print("\n" + "=" * 60)
     print("示例 2：生成聚合 JSON Feed")
@@ -114,65 +140,58 @@ def example_aggregated_feed():
         {"fakeid": "MzAxMDAwMDAz", "name": "行业观察"},
     ]
 
-    with WeChatMP(token_file="wx_token.json") as mp:
-        if not mp._is_logged_in:
-            print("\n请先登录...")
-            return
+    FEED_DIR.mkdir(exist_ok=True)
 
-        all_articles = []
-        feed_counts = {}
-
-        print(f"\n开始获取 {len(feeds)} 个公众号的文章...\n")
-
-        # 获取所有公众号的文章
-        for feed in feeds:
-            try:
-                print(f"正在获取: {feed['name']}")
-                articles = mp.fetch_articles(
-                    fakeid=feed["fakeid"],
-                    count=5
-                )
-
-                all_articles.extend(articles)
-                feed_counts[feed['name']] = len(articles)
-                print(f"✅ {feed['name']}: {len(articles)} 篇")
-
-            except Exception as e:
-                print(f"❌ {feed['name']} 失败: {e}")
-                feed_counts[feed['name']] = 0
-
-        # 生成聚合 JSON Feed
-        if all_articles:
-            # 按发布时间排序
-            all_articles.sort(key=lambda x: x.get('publish_time', 0), reverse=True)
-
-            json_feed = mp.generate_json_feed(
-                mp_name="我的订阅聚合",
-                mp_intro=f"来自 {len(feeds)} 个公众号的聚合订阅",
-                articles=all_articles,
-                base_url="https://example.com/aggregated"
-            )
+    all_articles = []
+    feed_counts = {}
 
-            # 保存
-            filename = "feeds/aggregated.json"
-            import os
-            os.makedirs("feeds", exist_ok=True)
-
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(json_feed)
-
-            print("\n" + "=" * 60)
-            print("聚合结果")
-            print("=" * 60)
-            print(f"✅ 聚合 JSON Feed: {filename}")
-            print(f"   总文章数: {len(all_articles)} 篇")
-            for name, count in feed_counts.items():
-                print(f"   {name}: {count} 篇")
-        else:
-            print("\n❌ 没有获取到任何文章")
+    print(f"\n开始并发获取 {len(feeds)} 个公众号的文章...\n")
+
+    # 并发获取所有公众号的文章
+    fetch = functools.partial(mp.fetch_articles, count=5)
+    fetched = await asyncio.gather(
+        *[fetch(f["fakeid"]) for f in feeds],
+        return_exceptions=True
+    )
+
+    for feed, articles in zip(feeds, fetched):
+        if isinstance(articles, Exception):
+            print(f"❌ {feed['name']} 失败: {articles}")
+            feed_counts[feed['name']] = 0
+            continue
+
+        all_articles.extend(articles)
+        feed_counts[feed['name']] = len(articles)
+        print(f"✅ {feed['name']}: {len(articles)} 篇")
+
+    # 生成聚合 JSON Feed
+    if all_articles:
+        # 按发布时间排序
+        all_articles.sort(key=_publish_time, reverse=True)
+
+        feed_obj = mp.generate_json_feed_obj(
+            mp_name="我的订阅聚合",
+            mp_intro=f"来自 {len(feeds)} 个公众号的聚合订阅",
+            articles=all_articles,
+            base_url="https://example.com/aggregated"
+        )
 
+        # 保存（向量写入，系统调用次数与文章数无关）
+        filename = FEED_DIR / "aggregated.json"
+        write_feed(feed_obj, filename)
 
-def example_both_feeds():
+        print("\n" + "=" * 60)
+        print("聚合结果")
+        print("=" * 60)
+        print(f"✅ 聚合 JSON Feed: {filename}")
+        print(f"   总文章数: {len(all_articles)} 篇")
+        for name, count in feed_counts.items():
+            print(f"   {name}: {count} 篇")
+    else:
+        print("\n❌ 没有获取到任何文章")
+
+
+async def example_both_feeds(mp):
     """示例：同时生成独立和聚合 JSON Feed"""
     print("\n" + "=" * 60)
     print("示例 3：同时生成独立和聚合 JSON Feed")
@@ -183,60 +202,58 @@ def example_both_feeds():
         {"fakeid": "MzAxMDAwMDAy", "name": "公众号B", "intro": "简介B"},
     ]
 
-    with WeChatMP(token_file="wx_token.json") as mp:
-        if not mp._is_logged_in:
-            print("\n请先登录...")
-            return
+    FEED_DIR.mkdir(exist_ok=True)
+
+    all_articles = []
+
+    # 并发获取所有公众号的文章
+    fetch = functools.partial(mp.fetch_articles, count=5)
+    fetched = await asyncio.gather(
+        *[fetch(f["fakeid"]) for f in feeds],
+        return_exceptions=True
+    )
+
+    # 为每个公众号生成独立 JSON Feed
+    print("\n生成独立 JSON Feed：\n")
+    for feed, articles in zip(feeds, fetched):
+        try:
+            if isinstance(articles, Exception):
+                raise articles
+
+            all_articles.extend(articles)
 
-        all_articles = []
-
-        # 为每个公众号生成独立 JSON Feed
-        print("\n生成独立 JSON Feed：\n")
-        for feed in feeds:
-            try:
-                articles = mp.fetch_articles(
-                    fakeid=feed["fakeid"],
-                    count=5
-                )
-                all_articles.extend(articles)
-
-                json_feed = mp.generate_json_feed(
-                    mp_name=feed['name'],
-                    mp_intro=feed['intro'],
-                    articles=articles,
-                    feed_id=feed["fakeid"]
-                )
-
-                filename = f"feeds/{feed['name']}.json"
-                import os
-                os.makedirs("feeds", exist_ok=True)
-
-                with open(filename, "w", encoding="utf-8") as f:
-                    f.write(json_feed)
-
-                print(f"✅ {feed['name']}: {len(articles)} 篇")
-
-            except Exception as e:
-                print(f"❌ {feed['name']}: {e}")
-
-        # 生成聚合 JSON Feed
-        if all_articles:
-            all_articles.sort(key=lambda x: x.get('publish_time', 0), reverse=True)
-
-            aggregated_feed = mp.generate_json_feed(
-                mp_name="全部订阅",
-                mp_intro="所有公众号的聚合",
-                articles=all_articles
+            feed_obj = mp.generate_json_feed_obj(
+                mp_name=feed['name'],
+                mp_intro=feed['intro'],
+                articles=articles,
+                feed_id=feed["fakeid"]
             )
 
-            filename = "feeds/all.json"
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(aggregated_feed)
+            filename = FEED_DIR / f"{feed['name']}.json"
+            write_feed(feed_obj, filename)
 
-            print(f"\n✅ 聚合 JSON Feed: {filename} ({len(all_articles)} 篇)")
+            print(f"✅ {feed['name']}: {len(articles)} 篇")
 
+        except Exception as e:
+            print(f"❌ {feed['name']}: {e}")
 
-def example_categories():
+    # 生成聚合 JSON Feed
+    if all_articles:
+        all_articles.sort(key=_publish_time, reverse=True)
+
+        aggregated_feed = mp.generate_json_feed_obj(
+            mp_name="全部订阅",
+            mp_intro="所有公众号的聚合",
+            articles=all_articles
+        )
+
+        filename = FEED_DIR / "all.json"
+        write_feed(aggregated_feed, filename)
+
+        print(f"\n✅ 聚合 JSON Feed: {filename} ({len(all_articles)} 篇)")
+
+
+async def example_categories(mp):
     """示例：按类别生成 JSON Feed"""
     print("\n" + "=" * 60)
     print("示例 4：按类别生成 JSON Feed")
@@ -254,44 +271,84 @@ def example_categories():
         ]
     }
 
-    with WeChatMP(token_file="wx_token.json") as mp:
+    FEED_DIR.mkdir(exist_ok=True)
+
+    # 所有类别的公众号一次性并发获取，再按类别分组
+    pairs = [(category, feed) for category, feeds in categories.items() for feed in feeds]
+    fetched = await asyncio.gather(
+        *[mp.fetch_articles(fakeid=feed["fakeid"], count=3) for _, feed in pairs],
+        return_exceptions=True
+    )
+
+    grouped = defaultdict(list)
+    for (category, feed), articles in zip(pairs, fetched):
+        if isinstance(articles, Exception):
+            print(f"  ❌ [{category}] {feed['name']}: {articles}")
+            continue
+
+        grouped[category].extend(articles)
+        print(f"  ✅ [{category}] {feed['name']}: {len(articles)} 篇")
+
+    # 生成类别聚合 JSON Feed（编码分发到多个进程）
+    jobs = []
+    for category, category_articles in grouped.items():
+        if not category_articles:
+            continue
+
+        category_articles.sort(key=_publish_time, reverse=True)
+        meta = {
+            "mp_name": f"{category}类聚合",
+            "mp_intro": f"{category}相关公众号的聚合"
+        }
+        jobs.append((FEED_DIR / f"{category}.json", meta, category_articles, ""))
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor() as executor:
+        written = await asyncio.gather(
+            *[loop.run_in_executor(executor, _generate_and_write, job) for job in jobs],
+            return_exceptions=True
+        )
+
+    for (filename, _, category_articles, _), outcome in zip(jobs, written):
+        if isinstance(outcome, Exception):
+            print(f"  ❌ 类别 JSON Feed {filename}: {outcome}")
+        else:
+            print(f"  ✅ 类别 JSON Feed: {filename} ({len(category_articles)} 篇)")
+
+
+async def run_examples():
+    """所有示例共享同一个 AsyncWeChatMP 会话（凭证只加载一次，连接池复用）"""
+    async with AsyncWeChatMP(
+        token_file="wx_token.json",
+        cache=ArticleCache(ttl=600)  # 10 分钟内重复运行直接读取缓存
+    ) as mp:
         if not mp._is_logged_in:
             print("\n请先登录...")
             return
 
-        import os
-        os.makedirs("feeds", exist_ok=True)
-
-        for category, feeds in categories.items():
-            print(f"\n处理类别: {category}")
-            category_articles = []
-
-            for feed in feeds:
-                try:
-                    articles = mp.fetch_articles(
-                        fakeid=feed["fakeid"],
-                        count=3
-                    )
-                    category_articles.extend(articles)
-                    print(f"  ✅ {feed['name']}: {len(articles)} 篇")
-                except Exception as e:
-                    print(f"  ❌ {feed['name']}: {e}")
-
-            # 生成类别聚合 JSON Feed
-            if category_articles:
-                category_articles.sort(key=lambda x: x.get('publish_time', 0), reverse=True)
+        # 示例 1：独立 JSON Feed
+        try:
+            await example_individual_feeds(mp)
+        except Exception as e:
+            print(f"\n示例 1 出错: {e}")
 
-                json_feed = mp.generate_json_feed(
-                    mp_name=f"{category}类聚合",
-                    mp_intro=f"{category}相关公众号的聚合",
-                    articles=category_articles
-                )
+        # 示例 2：聚合 JSON Feed
+        try:
+            await example_aggregated_feed(mp)
+        except Exception as e:
+            print(f"\n示例 2 出错: {e}")
 
-                filename = f"feeds/{category}.json"
-                with open(filename, "w", encoding="utf-8") as f:
-                    f.write(json_feed)
+        # 示例 3：同时生成
+        try:
+            await example_both_feeds(mp)
+        except Exception as e:
+            print(f"\n示例 3 出错: {e}")
 
-                print(f"  ✅ 类别 JSON Feed: {filename} ({len(category_articles)} 篇)")
+        # 示例 4：按类别
+        try:
+            await example_categories(mp)
+        except Exception as e:
+            print(f"\n示例 4 出错: {e}")
 
 
 def main():
@@ -299,29 +356,7 @@ def main():
     print("wx-mp-rss-core 多公众号示例\n")
     print("注意：运行前请确保已经登录（ wx_token.json 存在）\n")
 
-    # 示例 1：独立 JSON Feed
-    try:
-        example_individual_feeds()
-    except Exception as e:
-        print(f"\n示例 1 出错: {e}")
-
-    # 示例 2：聚合 JSON Feed
-    try:
-        example_aggregated_feed()
-    except Exception as e:
-        print(f"\n示例 2 出错: {e}")
-
-    # 示例 3：同时生成
-    try:
-        example_both_feeds()
-    except Exception as e:
-        print(f"\n示例 3 出错: {e}")
-
-    # 示例 4：按类别
-    try:
-        example_categories()
-    except Exception as e:
-        print(f"\n示例 4 出错: {e}")
+    asyncio.run(run_examples())
 
 
 if __name__ == "__main__":
@@ -7,9 +7,10 @@
 3. 优雅地处理错误
 """
 
+import asyncio
+import functools
 import logging
-import time
-from wx_rss import WeChatMP
+from wx_rss import WeChatMP, AsyncWeChatMP, retry_with_backoff, run_batch_async
 from wx_rss.exceptions import (
     LoginError,
     QRCodeTimeoutError,
@@ -75,7 +76,7 @@ def example_fetch_error_handling():
 
     except TokenExpiredError as e:
         print(f"\n❌ Token 已过期: {e}")
-        print("建议：请删除 wx_token.json 后重新登录")
+        print("建议：凭证已自动清除，请调用 mp.login() 重新扫码登录")
 
     except FetchError as e:
         print(f"\n❌ 抓取失败: {e}")
@@ -99,37 +100,15 @@ def example_retry_mechanism():
     print("示例 3：实现重试机制")
     print("=" * 60)
 
-    def fetch_with_retry(mp, fakeid, max_retries=3):
+    # 网络错误和频率限制时重试：等待时间 1s、2s、4s... 上限 30s，并加入随机抖动，
+    # 避免多个客户端同时重试；RateLimitError 带 retry_after 时按服务端建议等待。
+    # TokenExpiredError、FetchError 等其他异常不会重试，直接抛出
+    @retry_with_backoff(max_retries=3, base=1.0, max_delay=30.0, jitter=0.5)
+    def fetch_with_retry(mp, fakeid):
         """带重试的抓取函数"""
-        for attempt in range(max_retries):
-            try:
-                print(f"\n尝试 {attempt + 1}/{max_retries}...")
-                articles = mp.fetch_articles(fakeid=fakeid, count=5)
-                print(f"✅ 成功获取 {len(articles)} 篇文章")
-                return articles
-
-            except NetworkError as e:
-                if attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # 指数退避: 1, 2, 4
-                    print(f"⚠️  网络错误，{wait_time} 秒后重试...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"❌ 网络错误，已达最大重试次数")
-                    raise
-
-            except RateLimitError as e:
-                if attempt < max_retries - 1:
-                    wait_time = 60  # 频率限制等待 60 秒
-                    print(f"⚠️  频率限制，{wait_time} 秒后重试...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"❌ 频率限制，已达最大重试次数")
-                    raise
-
-            except (TokenExpiredError, FetchError) as e:
-                # 这些错误不应该重试
-                print(f"❌ {type(e).__name__}: {e}")
-                raise
+        articles = mp.fetch_articles(fakeid=fakeid, count=5)
+        print(f"✅ 成功获取 {len(articles)} 篇文章")
+        return articles
 
     mp = WeChatMP(token_file="wx_token.json")
 
@@ -147,8 +126,37 @@ def example_retry_mechanism():
         mp.cleanup()
 
 
-def example_batch_error_handling():
-    """示例：批量处理的错误隔离"""
+# 汇总结果中错误信息的最大长度，避免异常信息过长时结果字典不断膨胀
+_MAX_ERROR_LEN = 512
+
+
+# 批量抓取时已知异常对应的提示（按异常类型直接查表，新增类型只需加一行）
+# 第一次遇到 Token 过期时凭证已被清除，其余公众号抛出 LoginError，不再发请求
+_BATCH_ERROR_LABELS = {
+    TokenExpiredError: "Token 已过期，请重新登录",
+    LoginError: "登录失败或未登录，请重新登录",
+    RateLimitError: "频率限制，请稍后再试",
+    FetchError: "抓取失败",
+    NetworkError: "网络错误",
+}
+
+
+def _batch_error_label(error):
+    """按异常类型查找提示（沿 MRO 查找，子类异常使用最近的父类的提示）"""
+    for cls in type(error).__mro__:
+        label = _BATCH_ERROR_LABELS.get(cls)
+        if label is not None:
+            return label
+    return f"未知错误 - {error}"
+
+
+def _error_result(error):
+    """构造失败结果（错误信息截断到 _MAX_ERROR_LEN 个字符）"""
+    return {'status': 'error', 'count': 0, 'error': str(error)[:_MAX_ERROR_LEN]}
+
+
+async def example_batch_error_handling():
+    """示例：批量处理的错误隔离（并发抓取）"""
     print("\n" + "=" * 60)
     print("示例 4：批量处理的错误隔离")
     print("=" * 60)
@@ -161,61 +169,44 @@ def example_batch_error_handling():
         {"fakeid": "MzAxMDAwMDAz", "name": "公众号C"},
     ]
 
-    mp = WeChatMP(token_file="wx_token.json")
-
-    if not mp._is_logged_in:
-        print("\n未登录，跳过批量处理示例")
-        mp.cleanup()
-        return
-
-    results = {}
-
-    print(f"\n处理 {len(feeds)} 个公众号...\n")
+    # 最多同时 5 个请求，避免触发频率限制
+    async with AsyncWeChatMP(token_file="wx_token.json", concurrency=5) as mp:
+        if not mp._is_logged_in:
+            print("\n未登录，跳过批量处理示例")
+            return
 
-    for feed in feeds:
-        try:
-            print(f"正在处理: {feed['name']}")
-            articles = mp.fetch_articles(
-                fakeid=feed["fakeid"],
-                count=5
-            )
-            results[feed['name']] = {
-                'status': 'success',
-                'articles': articles,
-                'count': len(articles)
-            }
-            print(f"✅ {feed['name']}: {len(articles)} 篇")
+        print(f"\n并发处理 {len(feeds)} 个公众号...\n")
 
-        except TokenExpiredError as e:
-            print(f"❌ {feed['name']}: Token 已过期")
-            results[feed['name']] = {'status': 'error', 'error': str(e)}
+        # 单个公众号失败只记录到 batch.failures，不影响其他公众号
+        fetch = functools.partial(mp.fetch_articles, count=5)
+        batch = await run_batch_async(feeds, lambda feed: fetch(feed["fakeid"]))
 
-        except FetchError as e:
-            print(f"❌ {feed['name']}: 抓取失败")
-            results[feed['name']] = {'status': 'error', 'error': str(e)}
+    # 文章列表单独存放，results 里只保留状态、数量和错误信息
+    articles_by_feed = {}
+    results = {}
 
-        except Exception as e:
-            print(f"❌ {feed['name']}: 未知错误 - {e}")
-            results[feed['name']] = {'status': 'error', 'error': str(e)}
+    for feed, articles in batch.successes:
+        articles_by_feed[feed['name']] = articles
+        results[feed['name']] = {'status': 'success', 'count': len(articles)}
 
-    mp.cleanup()
+    for feed, e in batch.failures:
+        label = _batch_error_label(e)
+        print(f"❌ {feed['name']}: {label}")
+        results[feed['name']] = _error_result(e)
 
     # 汇总结果
     print("\n" + "=" * 60)
     print("处理结果汇总")
     print("=" * 60)
 
-    success_count = sum(1 for r in results.values() if r['status'] == 'success')
-    error_count = len(results) - success_count
-
-    print(f"成功: {success_count}，失败: {error_count}\n")
+    print(f"成功: {len(batch.successes)}，失败: {len(batch.failures)}\n")
 
-    for name, result in results.items():
-        status = "✅" if result['status'] == 'success' else "❌"
+    for feed, duration in zip(feeds, batch.durations):
+        result = results[feed['name']]
         if result['status'] == 'success':
-            print(f"{status} {name}: {result['count']} 篇")
+            print(f"✅ {feed['name']}: {result['count']} 篇（{duration:.2f} 秒）")
         else:
-            print(f"{status} {name}: {result['error']}")
+            print(f"❌ {feed['name']}: {result['error']}（{duration:.2f} 秒）")
 
 
 def example_context_manager_error_handling():
@@ -291,46 +282,34 @@ def example_logging_errors():
         mp.cleanup()
 
 
-def main():
-    """主函数"""
-    print("wx-mp-rss-core 错误处理示例\n")
-    print("注意：运行前请确保已经登录（ wx_token.json 存在）\n")
-
-    # 示例 1：基础错误处理
-    try:
-        example_basic_error_handling()
-    except Exception as e:
-        print(f"\n示例 1 出错: {e}")
+EXAMPLES = [
+    example_basic_error_handling,            # 示例 1：基础错误处理
+    example_fetch_error_handling,            # 示例 2：抓取错误处理
+    example_retry_mechanism,                 # 示例 3：重试机制
+    example_batch_error_handling,            # 示例 4：批量错误隔离
+    example_context_manager_error_handling,  # 示例 5：Context Manager
+    example_logging_errors,                  # 示例 6：日志记录
+]
 
-    # 示例 2：抓取错误处理
-    try:
-        example_fetch_error_handling()
-    except Exception as e:
-        print(f"\n示例 2 出错: {e}")
 
-    # 示例 3：重试机制
+def _safe_run(index, fn):
+    """运行单个示例，出错时只打印错误，不影响后续示例"""
     try:
-        example_retry_mechanism()
+        if asyncio.iscoroutinefunction(fn):
+            asyncio.run(fn())
+        else:
+            fn()
     except Exception as e:
-        print(f"\n示例 3 出错: {e}")
+        print(f"\n示例 {index} 出错: {e}")
 
-    # 示例 4：批量错误隔离
-    try:
-        example_batch_error_handling()
-    except Exception as e:
-        print(f"\n示例 4 出错: {e}")
 
-    # 示例 5：Context Manager
-    try:
-        example_context_manager_error_handling()
-    except Exception as e:
-        print(f"\n示例 5 出错: {e}")
+def main():
+    """主函数"""
+    print("wx-mp-rss-core 错误处理示例\n")
+    print("注意：运行前请确保已经登录（ wx_token.json 存在）\n")
 
-    # 示例 6：日志记录
-    try:
-        example_logging_errors()
-    except Exception as e:
-        print(f"\n示例 6 出错: {e}")
+    for i, fn in enumerate(EXAMPLES, 1):
+        _safe_run(i, fn)
 
 
 if __name__ == "__main__":
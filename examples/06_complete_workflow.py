@@ -4,8 +4,9 @@
 演示如何使用 wx-mp-rss-core 进行微信公众号文章抓取和 JSON Feed 生成
 """
 
+import asyncio
 import logging
-from wx_rss import WeChatMP
+from wx_rss import WeChatMP, AsyncWeChatMP, write_feed, run_batch_async
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
@@ -30,25 +31,23 @@ def example_single_feed():
 
         print(f"\n成功获取 {len(articles)} 篇文章")
 
-        # 3. 生成 JSON Feed
-        json_feed = mp.generate_json_feed(
-            mp_name="我的公众号",
-            articles=articles,
-            mp_intro="这是我的公众号简介",
-            base_url="https://example.com",
-            feed_id=fakeid
-        )
-
-        # 4. 保存到文件
+        # 3. 生成 JSON Feed 并逐条写入文件
         filename = "feed.json"
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(json_feed)
+        with open(filename, "wb") as f:
+            mp.dump_json_feed(
+                f,
+                mp_name="我的公众号",
+                articles=articles,
+                mp_intro="这是我的公众号简介",
+                base_url="https://example.com",
+                feed_id=fakeid
+            )
 
         print(f"JSON Feed 已保存到: {filename}")
 
 
-def example_multi_feeds():
-    """示例：获取多个公众号的 JSON Feed"""
+async def example_multi_feeds():
+    """示例：获取多个公众号的 JSON Feed（并发抓取）"""
     print("\n" + "=" * 60)
     print("示例 2：获取多个公众号的 JSON Feed")
     print("=" * 60)
@@ -59,37 +58,38 @@ def example_multi_feeds():
         {"fakeid": "MzAxMDAwMDAy", "name": "公众号B", "intro": "简介B"},
     ]
 
-    with WeChatMP() as mp:
-        # 1. 登录（如果未登录）
-        if not mp._is_logged_in:
-            print("\n请使用微信扫描生成的二维码登录...")
-            mp.login()
+    loop = asyncio.get_running_loop()
 
-        # 2. 批量获取文章并生成 JSON Feed
-        for feed in feeds:
-            try:
-                print(f"\n正在处理: {feed['name']}")
+    async def process_one(mp, feed):
+        """抓取单个公众号并写入 JSON Feed 文件"""
+        articles = await mp.fetch_articles(fakeid=feed["fakeid"], count=5)
 
-                articles = mp.fetch_articles(
-                    fakeid=feed["fakeid"],
-                    count=5
-                )
+        feed_obj = mp.generate_json_feed_obj(
+            mp_name=feed["name"],
+            articles=articles,
+            mp_intro=feed["intro"],
+            feed_id=feed["fakeid"]
+        )
 
-                json_feed = mp.generate_json_feed(
-                    mp_name=feed["name"],
-                    articles=articles,
-                    mp_intro=feed["intro"],
-                    feed_id=feed["fakeid"]
-                )
+        # 写文件放到线程池，与其他公众号的抓取重叠进行
+        filename = f"{feed['name']}.json"
+        await loop.run_in_executor(None, write_feed, feed_obj, filename)
+        return filename
 
-                filename = f"{feed['name']}.json"
-                with open(filename, "w", encoding="utf-8") as f:
-                    f.write(json_feed)
+    # AsyncWeChatMP 复用示例 1 登录后保存的凭证
+    async with AsyncWeChatMP(concurrency=5) as mp:
+        if not mp._is_logged_in:
+            print("\n未登录，请先运行示例 1 完成登录")
+            return
 
-                print(f"✅ 成功: {feed['name']} -> {filename}")
+        print(f"\n正在并发处理 {len(feeds)} 个公众号...")
+        batch = await run_batch_async(feeds, lambda feed: process_one(mp, feed))
 
-            except Exception as e:
-                print(f"❌ 失败: {feed['name']} - {e}")
+    # 单个公众号失败不影响其他公众号
+    for feed, filename in batch.successes:
+        print(f"✅ 成功: {feed['name']} -> {filename}")
+    for feed, e in batch.failures:
+        print(f"❌ 失败: {feed['name']} - {e}")
 
 
 def example_with_content():
@@ -114,18 +114,16 @@ def example_with_content():
 
         print(f"\n成功获取 {len(articles)} 篇文章（含正文）")
 
-        # 3. 生成 JSON Feed（包含全文）
-        json_feed = mp.generate_json_feed(
-            mp_name="我的公众号",
-            articles=articles,
-            full_text=True,  # 包含全文
-            feed_id=fakeid
-        )
-
-        # 4. 保存
+        # 3. 生成 JSON Feed（包含全文），逐条写入，内存中只保留当前文章的正文
         filename = "feed_full.json"
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(json_feed)
+        with open(filename, "wb") as f:
+            mp.dump_json_feed(
+                f,
+                mp_name="我的公众号",
+                articles=articles,
+                full_text=True,  # 包含全文
+                feed_id=fakeid
+            )
 
         print(f"JSON Feed 已保存到: {filename}")
 
@@ -142,7 +140,7 @@ def main():
 
     # 示例 2：多个公众号
     try:
-        example_multi_feeds()
+        asyncio.run(example_multi_feeds())
     except Exception as e:
         print(f"\n示例 2 出错: {e}")
 
@@ -5,10 +5,14 @@
 1. 搜索公众号
 2. 获取 fakeid
 3. 使用 fakeid 抓取文章
+
+搜索结果缓存在 wx_feed_cache.json 中，重复运行时不再重新搜索
+（需要强制刷新时传入 refresh=True）
 """
 
+import asyncio
 import logging
-from wx_rss import WeChatMP
+from wx_rss import WeChatMP, AsyncWeChatMP, SearchCache, run_batch_async
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
@@ -20,7 +24,7 @@ def example_search_and_fetch():
     print("示例：搜索公众号并抓取文章")
     print("=" * 60)
 
-    with WeChatMP() as mp:
+    with WeChatMP(search_cache=SearchCache()) as mp:
         # 1. 登录（如果未登录）
         if not mp._is_logged_in:
             print("\n请使用微信扫描生成的二维码登录...")
@@ -68,7 +72,7 @@ def example_quick_get_fakeid():
     print("示例：快速获取 fakeid")
     print("=" * 60)
 
-    with WeChatMP() as mp:
+    with WeChatMP(search_cache=SearchCache()) as mp:
         if not mp._is_logged_in:
             print("\n请使用微信扫描生成的二维码登录...")
             mp.login()
@@ -89,8 +93,8 @@ def example_quick_get_fakeid():
             print(f"❌ 未找到公众号: {keyword}")
 
 
-def example_batch_search():
-    """示例：批量搜索多个公众号"""
+async def example_batch_search():
+    """示例：批量搜索多个公众号（并发搜索）"""
     print("\n" + "=" * 60)
     print("示例：批量搜索多个公众号")
     print("=" * 60)
@@ -102,28 +106,26 @@ def example_batch_search():
         "阿里技术"
     ]
 
-    with WeChatMP() as mp:
+    # AsyncWeChatMP 复用已保存的登录凭证
+    async with AsyncWeChatMP(concurrency=5, search_cache=SearchCache()) as mp:
         if not mp._is_logged_in:
-            print("\n请使用微信扫描生成的二维码登录...")
-            mp.login()
+            print("\n未登录，请先运行示例 1 完成登录")
+            return
 
-        results_map = {}
+        print(f"\n并发搜索 {len(keywords)} 个公众号...")
+        batch = await run_batch_async(keywords, mp.get_feed_fakeid)
 
-        for keyword in keywords:
-            try:
-                print(f"\n搜索: {keyword}")
-                fakeid = mp.get_feed_fakeid(keyword)
+        results_map = dict.fromkeys(keywords)
 
-                if fakeid:
-                    results_map[keyword] = fakeid
-                    print(f"✅ 找到: {fakeid}")
-                else:
-                    print(f"❌ 未找到")
-                    results_map[keyword] = None
+        for keyword, fakeid in batch.successes:
+            if fakeid:
+                print(f"✅ {keyword}: {fakeid}")
+                results_map[keyword] = fakeid
+            else:
+                print(f"❌ {keyword}: 未找到")
 
-            except Exception as e:
-                print(f"❌ 搜索失败: {e}")
-                results_map[keyword] = None
+        for keyword, e in batch.failures:
+            print(f"❌ {keyword}: 搜索失败 - {e}")
 
         # 汇总结果
         print("\n" + "=" * 60)
@@ -155,7 +157,7 @@ def main():
 
     # 示例 3：批量搜索
     try:
-        example_batch_search()
+        asyncio.run(example_batch_search())
     except Exception as e:
         print(f"\n示例 3 出错: {e}")
 
@@ -31,11 +31,23 @@ setup(
         "requests>=2.32.0",
         "Pillow>=10.0.0",
         "qrcode>=7.0.0",
+        "orjson>=3.9.0",
+        "lxml>=4.0.0",
     ],
     extras_require={
+        "async": [
+            "aiohttp>=3.8.0",
+        ],
+        "msgpack": [
+            "msgpack>=1.0.0",
+        ],
+        "qr": [
+            "pyzbar>=0.1.9",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
+            "pytest-xdist>=3.0.0",
         ],
     },
 )
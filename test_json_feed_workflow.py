@@ -1,14 +1,14 @@
 #!/usr/bin/env python3
 """测试 JSON Feed 生成完整流程"""
 
-from wx_rss import WeChatMP
+from wx_rss import WeChatMP, SearchCache
 
 def main():
     print("=" * 50)
     print("wx-mp-rss-core v0.2.0 - JSON Feed 测试")
     print("=" * 50)
     
-    with WeChatMP() as mp:
+    with WeChatMP(search_cache=SearchCache()) as mp:
         # 1. 登录
         print("\n[1/4] 登录...")
         if not mp._is_logged_in:
@@ -36,18 +36,16 @@ def main():
         
         # 4. 生成 JSON Feed（包含正文）
         print(f"\n[4/4] 生成 JSON Feed（含正文）...")
-        json_feed = mp.generate_json_feed(
-            mp_name=keyword,
-            mp_intro=f"{keyword} 的公众号",
-            articles=articles,
-            feed_id=fakeid,
-            full_text=True  # 包含正文内容
-        )
-        
-        # 保存文件
         filename = f"{keyword}.json"
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(json_feed)
+        with open(filename, "wb") as f:
+            mp.dump_json_feed(
+                f,
+                mp_name=keyword,
+                mp_intro=f"{keyword} 的公众号",
+                articles=articles,
+                feed_id=fakeid,
+                full_text=True  # 包含正文内容
+            )
         
         print(f"✅ 已保存到: {filename}")
         
@@ -55,7 +53,8 @@ def main():
         print("\n" + "=" * 50)
         print("JSON Feed 预览 (前 500 字符):")
         print("=" * 50)
-        print(json_feed[:500] + "...")
+        with open(filename, encoding="utf-8") as f:
+            print(f.read(500) + "...")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,11 @@
+"""
+pytest 配置
+
+Linux 上把临时目录指向 /dev/shm（内存文件系统），测试中读写的凭证、缓存文件不落盘
+"""
+
+import os
+import tempfile
+
+if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+    tempfile.tempdir = "/dev/shm"
@@ -0,0 +1,75 @@
+"""
+原子写入单元测试
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from wx_rss.atomic import atomic_open, atomic_write
+
+
+class TestAtomicWrite(unittest.TestCase):
+    """测试先写临时文件再替换"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "feed.json")
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_write(self):
+        """测试写入内容和文件权限"""
+        atomic_write(self.path, b"{}")
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"{}")
+        if os.name == "posix":
+            self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+        self.assertEqual(os.listdir(self.temp_dir), ["feed.json"])
+
+    def test_failure_keeps_original(self):
+        """测试写入中途出错时保留原文件并删除临时文件"""
+        atomic_write(self.path, b"old")
+
+        with self.assertRaises(RuntimeError):
+            with atomic_open(self.path) as f:
+                f.write(b"new")
+                raise RuntimeError("写入失败")
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"old")
+        self.assertEqual(os.listdir(self.temp_dir), ["feed.json"])
+
+    def test_concurrent_writers(self):
+        """测试多个线程同时写同一个文件时都成功，结果为其中一个完整的内容"""
+        contents = [str(i).encode() * 10000 for i in range(8)]
+        barrier = threading.Barrier(len(contents))
+        errors = []
+
+        def write(data):
+            barrier.wait()
+            try:
+                atomic_write(self.path, data)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(data,)) for data in contents]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        with open(self.path, "rb") as f:
+            self.assertIn(f.read(), contents)
+        self.assertEqual(os.listdir(self.temp_dir), ["feed.json"])
+
+
+if __name__ == '__main__':
+    unittest.main()
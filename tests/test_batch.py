@@ -0,0 +1,75 @@
+"""
+批量执行单元测试
+"""
+
+import asyncio
+import unittest
+from wx_rss.batch import BatchResult, run_batch, run_batch_async
+from wx_rss.exceptions import FetchError
+
+
+def _fetch(item):
+    """偶数成功，奇数失败"""
+    if item % 2:
+        raise FetchError(f"失败: {item}")
+    return item * 10
+
+
+async def _afetch(item):
+    """异步版本，耗时与顺序相反，验证结果仍按输入顺序排列"""
+    await asyncio.sleep(0.01 * (5 - item))
+    return _fetch(item)
+
+
+class TestRunBatch(unittest.TestCase):
+    """测试同步批量执行"""
+
+    def test_collect_successes_and_failures(self):
+        """测试成功和失败分别记录，失败不中断批次"""
+        result = run_batch(range(5), _fetch)
+
+        self.assertIsInstance(result, BatchResult)
+        self.assertEqual(result.successes, [(0, 0), (2, 20), (4, 40)])
+        self.assertEqual([item for item, _ in result.failures], [1, 3])
+        self.assertIsInstance(result.failures[0][1], FetchError)
+        self.assertEqual(len(result.durations), 5)
+
+    def test_on_error_abort(self):
+        """测试在 on_error 中抛出异常中止批次"""
+        def on_error(item, error):
+            raise error
+
+        processed = []
+
+        def fn(item):
+            processed.append(item)
+            return _fetch(item)
+
+        with self.assertRaises(FetchError):
+            run_batch(range(5), fn, on_error=on_error)
+
+        self.assertEqual(processed, [0, 1])
+
+
+class TestRunBatchAsync(unittest.TestCase):
+    """测试异步批量执行"""
+
+    def test_collect_in_input_order(self):
+        """测试结果按输入顺序排列"""
+        result = asyncio.run(run_batch_async(range(5), _afetch))
+
+        self.assertEqual(result.successes, [(0, 0), (2, 20), (4, 40)])
+        self.assertEqual([item for item, _ in result.failures], [1, 3])
+        self.assertEqual(len(result.durations), 5)
+
+    def test_on_error_abort(self):
+        """测试在 on_error 中抛出异常会取消其余任务"""
+        def on_error(item, error):
+            raise error
+
+        with self.assertRaises(FetchError):
+            asyncio.run(run_batch_async(range(5), _afetch, on_error=on_error))
+
+
+if __name__ == '__main__':
+    unittest.main()
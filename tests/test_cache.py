@@ -0,0 +1,119 @@
+"""
+文章缓存单元测试
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+import time
+from wx_rss.cache import ArticleCache, SearchCache
+
+
+class TestArticleCache(unittest.TestCase):
+    """测试 ArticleCache"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = ArticleCache(cache_dir=self.cache_dir, ttl=60)
+        self.articles = [{"id": "1", "title": "测试文章", "publish_time": 1700000000}]
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_miss(self):
+        """测试未命中"""
+        self.assertIsNone(self.cache.get("fakeid", 5))
+
+    def test_set_and_get(self):
+        """测试写入后读取"""
+        self.cache.set("fakeid", 5, self.articles)
+
+        self.assertEqual(self.cache.get("fakeid", 5), self.articles)
+        # 参数不同视为不同的缓存项
+        self.assertIsNone(self.cache.get("fakeid", 5, begin=5))
+        self.assertIsNone(self.cache.get("fakeid", 5, with_content=True))
+
+    def test_expired(self):
+        """测试过期缓存"""
+        self.cache.set("fakeid", 5, self.articles)
+
+        path = self.cache._path("fakeid", 5, 0, False)
+        old = time.time() - 120
+        os.utime(path, (old, old))
+
+        self.assertIsNone(self.cache.get("fakeid", 5))
+
+    def test_corrupted(self):
+        """测试损坏的缓存文件"""
+        with open(self.cache._path("fakeid", 5, 0, False), "wb") as f:
+            f.write(b"{not json")
+
+        self.assertIsNone(self.cache.get("fakeid", 5))
+
+    def test_clear(self):
+        """测试清空缓存"""
+        self.cache.set("fakeid", 5, self.articles)
+        self.cache.clear()
+
+        self.assertIsNone(self.cache.get("fakeid", 5))
+
+
+class TestSearchCache(unittest.TestCase):
+    """测试 SearchCache"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.cache_dir, "wx_feed_cache.json")
+        self.results = [{"fakeid": "MzAxMDAwMDAx", "nickname": "测试公众号"}]
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_persist_across_instances(self):
+        """测试缓存写入文件后可被新实例读取"""
+        cache = SearchCache(cache_file=self.cache_file)
+        cache.set_fakeid("测试公众号", "MzAxMDAwMDAx")
+        cache.set_search("测试", 5, self.results)
+
+        cache = SearchCache(cache_file=self.cache_file)
+        self.assertEqual(cache.get_fakeid(" 测试公众号 "), "MzAxMDAwMDAx")
+        self.assertEqual(cache.get_search("测试", 5), self.results)
+        self.assertIsNone(cache.get_search("测试", 10))
+
+    def test_keyword_normalized(self):
+        """测试关键词忽略大小写和首尾空白"""
+        cache = SearchCache(cache_file=self.cache_file)
+        cache.set_fakeid("TestMP", "MzAxMDAwMDAx")
+        cache.set_search(" TestMP", 5, self.results)
+
+        self.assertEqual(cache.get_fakeid("testmp "), "MzAxMDAwMDAx")
+        self.assertEqual(cache.get_search("TESTMP", 5), self.results)
+
+    def test_expired(self):
+        """测试过期条目"""
+        cache = SearchCache(cache_file=self.cache_file)
+        cache.set_search("测试", 5, self.results)
+        cache._entries["search:测试:5"]["cached_at"] -= SearchCache.SEARCH_TTL + 1
+
+        self.assertIsNone(cache.get_search("测试", 5))
+
+    def test_evict_least_recently_used(self):
+        """测试超出容量时淘汰最久未使用的条目"""
+        cache = SearchCache(cache_file=self.cache_file, max_entries=2)
+        cache.set_fakeid("a", "1")
+        cache.set_fakeid("b", "2")
+        cache.get_fakeid("a")
+        cache.set_fakeid("c", "3")
+
+        self.assertEqual(cache.get_fakeid("a"), "1")
+        self.assertIsNone(cache.get_fakeid("b"))
+        self.assertEqual(cache.get_fakeid("c"), "3")
+
+
+if __name__ == '__main__':
+    unittest.main()
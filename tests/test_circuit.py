@@ -0,0 +1,140 @@
+"""
+熔断器单元测试
+"""
+
+import threading
+import unittest
+from unittest import mock
+from wx_rss import WeChatMP
+from wx_rss.circuit import CircuitBreaker
+from wx_rss.exceptions import NetworkError, FetchError, TokenExpiredError, LoginError
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """测试 CircuitBreaker 状态切换"""
+
+    def test_open_after_fail_max(self):
+        """测试连续失败达到阈值后熔断"""
+        breaker = CircuitBreaker(name="test", fail_max=2, reset_timeout=60)
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        with self.assertRaises(NetworkError):
+            breaker.before_call()
+
+    def test_success_resets_failures(self):
+        """测试成功后清零失败次数"""
+        breaker = CircuitBreaker(fail_max=2)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    @mock.patch("wx_rss.circuit.time.monotonic")
+    def test_half_open_after_reset_timeout(self, monotonic):
+        """测试恢复时间后只放行一次试探请求"""
+        monotonic.return_value = 100.0
+        breaker = CircuitBreaker(fail_max=1, reset_timeout=60)
+        breaker.record_failure()
+
+        monotonic.return_value = 161.0
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        breaker.before_call()
+
+        # 试探请求返回前，其他调用仍然直接失败
+        with self.assertRaises(NetworkError):
+            breaker.before_call()
+
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_concurrent_threads(self):
+        """测试多个线程同时记录失败时计数不丢失，半开时只放行一个线程"""
+        breaker = CircuitBreaker(fail_max=8 * 1000, reset_timeout=0)
+        barrier = threading.Barrier(8)
+
+        def fail():
+            barrier.wait()
+            for _ in range(1000):
+                breaker.record_failure()
+
+        threads = [threading.Thread(target=fail) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(breaker._failures, 8 * 1000)
+
+        # reset_timeout=0：已处于半开状态，同时到达的线程中只有一个通过
+        breaker.reset_timeout = 1000
+        breaker._opened_at -= 1000
+        passed = []
+
+        def probe():
+            barrier.wait()
+            try:
+                breaker.before_call()
+            except NetworkError:
+                return
+            passed.append(True)
+
+        threads = [threading.Thread(target=probe) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(passed, [True])
+
+
+class TestWeChatMPCircuit(unittest.TestCase):
+    """测试 WeChatMP 按公众号熔断"""
+
+    def test_fetch_short_circuits_failing_feed(self):
+        """测试失败的公众号被熔断，其他公众号不受影响"""
+        mp = WeChatMP(token_file="nonexistent_token.json")
+        mp.CIRCUIT_FAIL_MAX = 2
+        mp._is_logged_in = True
+        mp._fetcher = mock.Mock()
+        mp._fetcher.fetch.side_effect = FetchError("invalid args")
+
+        for _ in range(2):
+            with self.assertRaises(FetchError):
+                mp.fetch_articles("INVALID_ID")
+
+        with self.assertRaises(NetworkError):
+            mp.fetch_articles("INVALID_ID")
+        self.assertEqual(mp._fetcher.fetch.call_count, 2)
+
+        mp._fetcher.fetch.side_effect = None
+        mp._fetcher.fetch.return_value = []
+        self.assertEqual(mp.fetch_articles("MzAxMDAwMDAx"), [])
+
+    def test_token_expired_invalidates_credentials(self):
+        """测试 Token 过期不计入熔断，而是清除凭证，后续调用直接失败"""
+        mp = WeChatMP(token_file="nonexistent_token.json")
+        mp.CIRCUIT_FAIL_MAX = 1
+        mp._is_logged_in = True
+        mp._auth = mock.Mock()
+        mp._fetcher = mock.Mock()
+        mp._fetcher.fetch.side_effect = TokenExpiredError("Token 已过期")
+
+        with self.assertRaises(TokenExpiredError):
+            mp.fetch_articles("MzAxMDAwMDAx")
+
+        self.assertFalse(mp._is_logged_in)
+        mp._auth.clear_credentials.assert_called_once()
+        self.assertEqual(mp._breakers["MzAxMDAwMDAx"].state, "closed")
+
+        with self.assertRaises(LoginError):
+            mp.fetch_articles("MzAxMDAwMDAy")
+        self.assertEqual(mp._fetcher.fetch.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
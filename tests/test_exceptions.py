@@ -82,6 +82,19 @@ class TestExceptions(unittest.TestCase):
         for exc in exceptions:
             self.assertIsInstance(exc, WXMPRSSError)
 
+    def test_exception_pickle(self):
+        """测试异常可以 pickle（跨进程传递时保留消息和 retry_after）"""
+        import pickle
+
+        error = pickle.loads(pickle.dumps(FetchError("抓取失败")))
+        self.assertIsInstance(error, FetchError)
+        self.assertEqual(str(error), "抓取失败")
+
+        error = pickle.loads(pickle.dumps(RateLimitError("频率限制", retry_after=5)))
+        self.assertIsInstance(error, RateLimitError)
+        self.assertEqual(str(error), "频率限制")
+        self.assertEqual(error.retry_after, 5)
+
     def test_exception_raising(self):
         """测试异常抛出"""
         # 测试可以正确抛出和捕获异常
@@ -0,0 +1,176 @@
+"""
+文章抓取模块单元测试
+"""
+
+import html
+import json
+import os
+import unittest
+from unittest import mock
+
+from wx_rss.fetcher import ArticleFetcher
+from wx_rss.exceptions import FetchError, NetworkError, TokenExpiredError
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _load_fixture(name: str) -> bytes:
+    """读取测试数据文件"""
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+def _publish_page(publish_infos: list) -> bytes:
+    """用给定的 publish_info 列表构造文章列表 API 响应"""
+    page = {"publish_list": [{"publish_info": info} for info in publish_infos]}
+    return json.dumps({
+        "base_resp": {"ret": 0},
+        "publish_page": json.dumps(page)
+    }).encode("utf-8")
+
+
+class TestArticleFetcher(unittest.TestCase):
+    """测试文章列表的请求和解析"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.content = _load_fixture("appmsgpublish.json")
+        self.session = mock.Mock()
+        self.fetcher = ArticleFetcher(
+            token="test_token",
+            cookies={"cookie1": "value1"},
+            session=self.session
+        )
+
+    def _respond(self, content: bytes, ok: bool = True, url: str = ArticleFetcher.API_URL):
+        """设置会话返回的响应"""
+        response = self.session.get.return_value
+        response.ok = ok
+        response.status_code = 200 if ok else 500
+        response.reason = "OK" if ok else "Internal Server Error"
+        response.url = url
+        response.content = content
+
+    def test_fetch(self):
+        """测试通过 HTTP 获取文章列表"""
+        self._respond(self.content)
+
+        articles = self.fetcher.fetch("MzAxMDAwMDAx", count=3, begin=5)
+
+        url = self.session.get.call_args[0][0]
+        self.assertIn("token=test_token", url)
+        self.assertIn("begin=5&count=3&fakeid=MzAxMDAwMDAx", url)
+        self.assertEqual(
+            [article["title"] for article in articles],
+            ["短链接文章", "长链接文章", "同一次推送的第二篇"]
+        )
+        self.assertEqual(articles[0]["digest"], "摘要 & <说明>")
+        # 毫秒时间戳转换为秒
+        self.assertEqual(articles[1]["publish_time"], 1706140800)
+
+    def test_fetch_errors(self):
+        """测试 HTTP 错误和跳转到登录页"""
+        self._respond(self.content, ok=False)
+        with self.assertRaises(NetworkError):
+            self.fetcher.fetch("MzAxMDAwMDAx")
+
+        self._respond(self.content, url="https://mp.weixin.qq.com/cgi-bin/loginpage")
+        with self.assertRaises(TokenExpiredError):
+            self.fetcher.fetch("MzAxMDAwMDAx")
+
+        self._respond(json.dumps({"base_resp": {"ret": 200013, "err_msg": "freq control"}}).encode())
+        with self.assertRaises(FetchError):
+            self.fetcher.fetch("MzAxMDAwMDAx")
+
+    def test_article_id(self):
+        """测试短链接和长链接（/s?__biz=...）的文章 ID"""
+        articles = self.fetcher.parse_response(self.content)
+
+        self.assertEqual(
+            [article["id"] for article in articles],
+            ["abc123", "MzAxMDAwMDAx_2650000001_1", "MzAxMDAwMDAx_2650000001_2"]
+        )
+        # 页面中的链接 & 被转义时结果相同
+        self.assertEqual(
+            self.fetcher._extract_article_id(
+                "http://mp.weixin.qq.com/s?__biz=MzAxMDAwMDAx&amp;mid=2650000001&amp;idx=1#rd"
+            ),
+            "MzAxMDAwMDAx_2650000001_1"
+        )
+
+    def test_parse_html_wrapped(self):
+        """测试浏览器渲染后包装在 <pre> 或 <body> 中的 JSON"""
+        expected = self.fetcher.parse_response(self.content)
+        text = html.escape(self.content.decode("utf-8"), quote=False)
+
+        pre = f'<html><head></head><body><pre style="word-wrap: break-word;">{text}</pre></body></html>'
+        self.assertEqual(self.fetcher.parse_response(pre), expected)
+        self.assertEqual(self.fetcher.parse_response(pre.encode("utf-8")), expected)
+
+        body = f"<html><body>\n{text}\n</body></html>"
+        self.assertEqual(self.fetcher.parse_response(body), expected)
+
+    def test_parse_invalid_json(self):
+        """测试响应不是 JSON"""
+        with self.assertRaises(FetchError):
+            self.fetcher.parse_response(b"<html><body>not json</body></html>")
+
+    def test_empty_publish_info(self):
+        """测试空的 publish_info 被跳过，不影响其他文章"""
+        valid = json.dumps({"appmsgex": [{"title": "测试文章", "link": "https://mp.weixin.qq.com/s/abc123"}]})
+
+        articles = self.fetcher.parse_response(_publish_page(["", "{}", valid]))
+
+        self.assertEqual([article["id"] for article in articles], ["abc123"])
+
+    def test_non_dict_publish_info(self):
+        """测试 publish_info 不是 JSON 对象字符串时跳过或直接使用"""
+        article = {"appmsgex": [{"title": "测试文章", "link": "https://mp.weixin.qq.com/s/abc123"}]}
+
+        articles = self.fetcher.parse_response(_publish_page(["[]", "null", "1", article]))
+
+        self.assertEqual([item["title"] for item in articles], ["测试文章"])
+
+    def test_load_publish_infos(self):
+        """测试整体解析失败时退回逐条解析，跳过损坏的条目"""
+        infos = self.fetcher._load_publish_infos([
+            {"publish_info": '{"a": 1}'},
+            {"publish_info": '{"b": 2'},
+            {"publish_info": {"c": 3}},
+            {},
+        ])
+
+        self.assertEqual(infos, [{"a": 1}, {"c": 3}, {}])
+
+        # 全部是合法字符串时一次解析
+        infos = self.fetcher._load_publish_infos([{"publish_info": '{"a": 1}'}, {"publish_info": "{}"}])
+        self.assertEqual(infos, [{"a": 1}, {}])
+
+    def test_fetch_with_content_delay(self):
+        """测试正文按批加载：批次之间稍作间隔，遇到环境异常时暂停更久，最后一批后不等待"""
+        self._respond(_publish_page([
+            json.dumps({"appmsgex": [{"title": str(i), "link": f"https://mp.weixin.qq.com/s/{i}"}]})
+            for i in range(9)
+        ]))
+        self.fetcher._page = mock.Mock()
+        batches = []
+
+        def fetch_batch(jobs):
+            batches.append([article["id"] for _, article in jobs])
+            return len(batches) == 2
+
+        with mock.patch.object(self.fetcher, "_start_browser"), \
+                mock.patch.object(self.fetcher, "_fetch_content_batch", side_effect=fetch_batch), \
+                mock.patch("wx_rss.fetcher.time.sleep") as sleep:
+            articles = self.fetcher.fetch_with_content("MzAxMDAwMDAx", count=9)
+
+        self.assertEqual(len(articles), 9)
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 1])
+        self.assertEqual(
+            [call.args[0] for call in sleep.call_args_list],
+            [ArticleFetcher.CONTENT_BATCH_DELAY, ArticleFetcher.RATE_LIMIT_PAUSE]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
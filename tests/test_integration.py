@@ -5,6 +5,9 @@
 import unittest
 import tempfile
 import os
+import subprocess
+import sys
+from unittest import mock
 from wx_rss import WeChatMP
 from wx_rss.exceptions import LoginError, TokenExpiredError
 
@@ -39,6 +42,17 @@ class TestWeChatMP(unittest.TestCase):
 
         self.assertEqual(mp.token_file, "wx_token.json")
 
+    def test_import_does_not_load_playwright(self):
+        """测试导入 wx_rss 时不加载 Playwright、aiohttp 和 BeautifulSoup"""
+        code = (
+            "import sys, wx_rss; "
+            "assert 'playwright' not in sys.modules; "
+            "assert 'aiohttp' not in sys.modules; "
+            "assert 'bs4' not in sys.modules"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
     def test_load_credentials_not_exists(self):
         """测试加载不存在的凭证"""
         mp = WeChatMP(token_file=self.token_file)
@@ -62,6 +76,25 @@ class TestWeChatMP(unittest.TestCase):
         mp = WeChatMP(token_file=self.token_file)
         self.assertTrue(mp._is_logged_in)
 
+    def test_load_credentials_from_token_store(self):
+        """测试从内存凭证字典加载（不读写文件）"""
+        store = {"token": "test_token", "cookies": {"cookie1": "value1"}}
+        mp = WeChatMP(token_file="nonexistent_token.json", token_store=store)
+
+        self.assertTrue(mp._is_logged_in)
+        self.assertEqual(mp._fetcher.token, "test_token")
+
+        # Token 过期时只清空字典，不涉及文件
+        mp._invalidate_credentials()
+        self.assertFalse(mp._is_logged_in)
+        self.assertEqual(store, {})
+
+    def test_load_credentials_empty_token_store(self):
+        """测试空的凭证字典"""
+        mp = WeChatMP(token_file="nonexistent_token.json", token_store={})
+
+        self.assertFalse(mp._is_logged_in)
+
     def test_fetch_articles_not_logged_in(self):
         """测试未登录时获取文章"""
         mp = WeChatMP(token_file=self.token_file)
@@ -154,6 +187,111 @@ class TestWeChatMP(unittest.TestCase):
         self.assertIn('<feed', atom_xml)
         self.assertIn('xmlns="http://www.w3.org/2005/Atom"', atom_xml)
 
+    def test_generate_json_feed_obj(self):
+        """测试生成 JSON Feed 字典并逐条写入文件"""
+        import io
+        import json
+        from wx_rss import dump_feed, write_feed
+
+        mp = WeChatMP(token_file=self.token_file)
+
+        articles = [
+            {
+                "id": "001",
+                "title": "测试文章",
+                "url": "https://example.com/article",
+                "digest": "摘要",
+                "publish_time": 1706140800
+            }
+        ]
+
+        feed_obj = mp.generate_json_feed_obj(
+            mp_name="测试公众号",
+            articles=articles,
+            feed_id="MzAxMDAwMDAx"
+        )
+
+        self.assertEqual(feed_obj["name"], "测试公众号")
+        self.assertEqual(feed_obj["items"][0]["title"], "测试文章")
+        self.assertEqual(feed_obj["items"][0]["feed"]["id"], "MzAxMDAwMDAx")
+        self.assertEqual(feed_obj["items"][0]["updated"], "2024-01-25T08:00:00+08:00")
+
+        # 写入的内容应与字典一致
+        buf = io.BytesIO()
+        dump_feed(feed_obj, buf)
+        self.assertEqual(json.loads(buf.getvalue().decode("utf-8")), feed_obj)
+
+        # write_feed 的输出应与 dump_feed 完全一致
+        feed_file = self.token_file + ".feed.json"
+        try:
+            write_feed(feed_obj, feed_file)
+            with open(feed_file, "rb") as f:
+                self.assertEqual(f.read(), buf.getvalue())
+        finally:
+            os.remove(feed_file)
+
+    def test_dump_json_feed(self):
+        """测试逐条写入 JSON Feed"""
+        import io
+        import json
+
+        mp = WeChatMP(token_file=self.token_file)
+
+        articles = [
+            {
+                "id": "001",
+                "title": "测试文章",
+                "url": "https://example.com/article",
+                "digest": "摘要",
+                "publish_time": 1706140800,
+                "content": "<p>正文</p>"
+            }
+        ]
+
+        buf = io.BytesIO()
+        mp.dump_json_feed(
+            buf,
+            mp_name="测试公众号",
+            articles=articles,
+            full_text=True,
+            feed_id="MzAxMDAwMDAx"
+        )
+
+        # 与一次性生成的结果一致
+        expected = json.loads(mp.generate_json_feed(
+            mp_name="测试公众号",
+            articles=articles,
+            full_text=True,
+            feed_id="MzAxMDAwMDAx"
+        ))
+        self.assertEqual(json.loads(buf.getvalue().decode("utf-8")), expected)
+
+        # 生成器逐条写入（articles 为生成器）与 write_feed 写文件的内容一致
+        from wx_rss import JSONFeedGenerator, write_feed
+        generator = JSONFeedGenerator(mp_name="测试公众号", mp_intro="测试公众号")
+        stream = io.BytesIO()
+        generator.dump(iter(articles), stream, full_text=True, feed_id="MzAxMDAwMDAx")
+        self.assertEqual(stream.getvalue(), buf.getvalue())
+
+        feed_file = self.token_file + ".feed.json"
+        try:
+            write_feed(generator.build(articles, full_text=True, feed_id="MzAxMDAwMDAx"), feed_file)
+            with open(feed_file, "rb") as f:
+                self.assertEqual(f.read(), buf.getvalue())
+
+            # save 写入字符串，同样先写临时文件再替换
+            json_str = generator.generate(articles, full_text=True, feed_id="MzAxMDAwMDAx")
+            generator.save(json_str, feed_file)
+            with open(feed_file, "rb") as f:
+                self.assertEqual(f.read().decode("utf-8"), json_str)
+            prefix = "." + os.path.basename(feed_file)
+            self.assertEqual(
+                [name for name in os.listdir(os.path.dirname(feed_file)) if name.startswith(prefix)],
+                []
+            )
+        finally:
+            os.remove(feed_file)
+
     def test_context_manager(self):
         """测试 context manager"""
         with WeChatMP(token_file=self.token_file) as mp:
@@ -176,6 +314,201 @@ class TestWeChatMP(unittest.TestCase):
         self.assertIsNone(mp._auth)
         self.assertFalse(mp._is_logged_in)
 
+    def test_shared_session(self):
+        """测试外部传入的 HTTP 会话：重建搜索器时复用，清理时不关闭"""
+        session = mock.Mock()
+        store = {"token": "test_token", "cookies": {"cookie1": "value1"}}
+        mp = WeChatMP(token_file="nonexistent_token.json", token_store=store, session=session)
+
+        searcher = mp._get_searcher()
+        self.assertIs(searcher._session, session)
+
+        # 重新登录后搜索器重建，仍使用同一个会话
+        mp._close_searcher()
+        self.assertIs(mp._get_searcher()._session, session)
+
+        mp.cleanup()
+        session.close.assert_not_called()
+
+    def test_search_memo(self):
+        """测试重复搜索同一关键词时复用内存中的结果，refresh 时重新请求"""
+        import json
+
+        session = mock.Mock()
+        session.get.return_value.content = json.dumps({
+            "base_resp": {"ret": 0},
+            "list": [{"fakeid": "MzAxMDAwMDAx", "nickname": "测试公众号"}]
+        }).encode("utf-8")
+        store = {"token": "test_token", "cookies": {"cookie1": "value1"}}
+        mp = WeChatMP(token_file="nonexistent_token.json", token_store=store, session=session)
+
+        results = mp.search_feed("测试公众号")
+        results[0]["fakeid"] = "changed"
+
+        self.assertEqual(mp.get_feed_fakeid("测试公众号"), "MzAxMDAwMDAx")
+        self.assertEqual(session.get.call_count, 1)
+
+        mp.search_feed("测试公众号", refresh=True)
+        self.assertEqual(session.get.call_count, 2)
+
+    def test_search_cache_passed_to_searcher(self):
+        """测试 WeChatMP 的搜索缓存交给搜索器，新实例直接从缓存读取 fakeid"""
+        import json
+        from wx_rss import SearchCache
+
+        session = mock.Mock()
+        session.get.return_value.content = json.dumps({
+            "base_resp": {"ret": 0},
+            "list": [{"fakeid": "MzAxMDAwMDAx", "nickname": "测试公众号"}]
+        }).encode("utf-8")
+        store = {"token": "test_token", "cookies": {"cookie1": "value1"}}
+        cache_file = self.token_file + ".cache.json"
+        try:
+            cache = SearchCache(cache_file=cache_file)
+            mp = WeChatMP(
+                token_file="nonexistent_token.json", token_store=store,
+                search_cache=cache, session=session
+            )
+            self.assertIs(mp._get_searcher().search_cache, cache)
+            self.assertEqual(mp.get_feed_fakeid("测试公众号"), "MzAxMDAwMDAx")
+            self.assertEqual(session.get.call_count, 1)
+
+            mp = WeChatMP(
+                token_file="nonexistent_token.json", token_store=store,
+                search_cache=SearchCache(cache_file=cache_file), session=session
+            )
+            self.assertEqual(mp.get_feed_fakeid("测试公众号"), "MzAxMDAwMDAx")
+            self.assertEqual(session.get.call_count, 1)
+
+            mp.get_feed_fakeid("测试公众号", refresh=True)
+            self.assertEqual(session.get.call_count, 2)
+        finally:
+            os.remove(cache_file)
+
+    def test_search_keys_normalized(self):
+        """测试关键词只有大小写或首尾空白不同时共用内存和磁盘缓存"""
+        import json
+        from wx_rss import FeedSearcher, SearchCache
+
+        session = mock.Mock()
+        session.get.return_value.content = json.dumps({
+            "base_resp": {"ret": 0},
+            "list": [{"fakeid": "MzAxMDAwMDAx", "nickname": "TestMP"}]
+        }).encode("utf-8")
+        cache_file = self.token_file + ".cache.json"
+        try:
+            searcher = FeedSearcher(
+                token="test_token", cookies={}, session=session,
+                search_cache=SearchCache(cache_file=cache_file)
+            )
+
+            self.assertEqual(searcher.search_by_name("TestMP"), searcher.search_by_name("  testmp "))
+            self.assertEqual(session.get.call_count, 1)
+            # 请求中的关键词只去掉首尾空白，保留原始大小写
+            self.assertEqual(session.get.call_args[1]["params"]["query"], "TestMP")
+
+            self.assertEqual(searcher.get_first_match("TESTMP\n"), "MzAxMDAwMDAx")
+            self.assertEqual(session.get.call_count, 1)
+
+            # 新的搜索器从磁盘缓存读取，关键词写法不同也能命中
+            searcher = FeedSearcher(
+                token="test_token", cookies={}, session=session,
+                search_cache=SearchCache(cache_file=cache_file)
+            )
+            self.assertEqual(searcher.get_first_match(" testMP"), "MzAxMDAwMDAx")
+            self.assertEqual(session.get.call_count, 1)
+        finally:
+            os.remove(cache_file)
+
+
+
+class TestSearchMisses(unittest.TestCase):
+    """测试未找到的关键词的负缓存（MISS_TTL 内不再重新搜索）"""
+
+    def setUp(self):
+        """测试前准备：搜索接口始终返回不匹配的结果"""
+        import json
+        from wx_rss import FeedSearcher
+
+        self.session = mock.Mock()
+        self.session.get.return_value.content = json.dumps({
+            "base_resp": {"ret": 0},
+            "list": [{"fakeid": "MzAxMDAwMDAx", "nickname": "其他公众号"}]
+        }).encode("utf-8")
+        self.searcher = FeedSearcher(token="test_token", cookies={}, session=self.session)
+        self.now = 1000.0
+        patcher = mock.patch("wx_rss.search.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_miss_within_ttl(self):
+        """测试 MISS_TTL 内直接返回 None，不发请求"""
+        self.assertIsNone(self.searcher.get_first_match("不存在"))
+        self.assertEqual(self.session.get.call_count, 1)
+
+        self.now += self.searcher.MISS_TTL - 1
+        self.assertIsNone(self.searcher.get_first_match(" 不存在 "))
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_miss_expired(self):
+        """测试过期后重新请求接口（不使用内存中的旧搜索结果）"""
+        self.assertIsNone(self.searcher.get_first_match("不存在"))
+
+        self.now += self.searcher.MISS_TTL
+        self.assertIsNone(self.searcher.get_first_match("不存在"))
+        self.assertEqual(self.session.get.call_count, 2)
+
+        # 重新记录了时间，新的 MISS_TTL 内不再请求
+        self.now += 1
+        self.assertIsNone(self.searcher.get_first_match("不存在"))
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_miss_refresh(self):
+        """测试 refresh=True 忽略负缓存，找到后清除记录"""
+        import json
+
+        self.assertIsNone(self.searcher.get_first_match("不存在"))
+
+        self.session.get.return_value.content = json.dumps({
+            "base_resp": {"ret": 0},
+            "list": [{"fakeid": "MzAxMDAwMDAy", "nickname": "不存在"}]
+        }).encode("utf-8")
+
+        self.assertEqual(self.searcher.get_first_match("不存在", refresh=True), "MzAxMDAwMDAy")
+        self.assertEqual(self.session.get.call_count, 2)
+        self.assertEqual(self.searcher.get_first_match("不存在"), "MzAxMDAwMDAy")
+        self.assertEqual(self.session.get.call_count, 2)
+
+
+class TestJSONFeedTime(unittest.TestCase):
+    """测试 JSON Feed 时间格式化"""
+
+    def setUp(self):
+        """测试前准备"""
+        from wx_rss import JSONFeedGenerator
+        self.generator = JSONFeedGenerator(mp_name="测试公众号", mp_intro="简介")
+
+    def test_format_time(self):
+        """测试秒和毫秒时间戳"""
+        self.assertEqual(self.generator.format_time(1706140800), "2024-01-25T08:00:00+08:00")
+        self.assertEqual(self.generator.format_time(1706140800000), "2024-01-25T08:00:00+08:00")
+
+    def test_format_time_out_of_range(self):
+        """测试超出 datetime 范围的时间戳返回当前时间，不输出 5 位年份也不抛出异常"""
+        from datetime import datetime
+
+        this_year = str(datetime.now().year)
+        for timestamp in (10 ** 12, 10 ** 30):
+            self.assertTrue(self.generator.format_time(timestamp).startswith(this_year))
+
+        feed = self.generator.build([{
+            "id": "001",
+            "title": "测试文章",
+            "url": "https://example.com/article",
+            "publish_time": 10 ** 30
+        }])
+        self.assertTrue(feed["items"][0]["updated"].startswith(this_year))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -6,30 +6,29 @@ import unittest
 import tempfile
 import os
 import json
+import shutil
+from unittest import mock
 from wx_rss.login import WeChatAuth
-from wx_rss.exceptions import LoginError, BrowserError
+from wx_rss.exceptions import LoginError, BrowserError, QRCodeTimeoutError
 
 
 class TestWeChatAuth(unittest.TestCase):
     """测试 WeChatAuth 类"""
 
+    @classmethod
+    def setUpClass(cls):
+        """所有测试共用一个临时目录"""
+        cls._temp_dir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        """删除临时目录"""
+        shutil.rmtree(cls._temp_dir, ignore_errors=True)
+
     def setUp(self):
-        """测试前准备"""
-        # 创建临时文件
-        self.temp_token = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
-        self.temp_token.close()
-        self.token_file = self.temp_token.name
-
-        self.temp_qrcode = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.png')
-        self.temp_qrcode.close()
-        self.qrcode_file = self.temp_qrcode.name
-
-    def tearDown(self):
-        """测试后清理"""
-        if os.path.exists(self.token_file):
-            os.remove(self.token_file)
-        if os.path.exists(self.qrcode_file):
-            os.remove(self.qrcode_file)
+        """测试前准备（每个测试使用独立的文件名，文件由被测代码按需创建）"""
+        self.token_file = os.path.join(self._temp_dir, f"{self._testMethodName}_token.json")
+        self.qrcode_file = os.path.join(self._temp_dir, f"{self._testMethodName}_qrcode.png")
 
     def test_init(self):
         """测试初始化"""
@@ -91,6 +90,45 @@ class TestWeChatAuth(unittest.TestCase):
             self.assertEqual(data['cookies'], {"cookie1": "value1", "cookie2": "value2"})
             self.assertIn('created_at', data)
 
+    def test_clear_credentials(self):
+        """测试清除凭证"""
+        auth = WeChatAuth(token_file=self.token_file)
+        auth.token = "test_token_123"
+        auth.cookies = {"cookie1": "value1"}
+        auth.save_credentials()
+
+        auth.clear_credentials()
+
+        self.assertIsNone(auth.token)
+        self.assertEqual(auth.cookies, {})
+        self.assertFalse(os.path.exists(self.token_file))
+
+        # 文件不存在时再次清除不报错
+        auth.clear_credentials()
+
+    def test_load_credentials_cached(self):
+        """测试凭证文件未变化时不重复读取"""
+        from wx_rss.login import _read_token_file
+
+        with open(self.token_file, 'w') as f:
+            json.dump({"token": "token_1", "cookies": {"k": "v"}}, f)
+
+        WeChatAuth(token_file=self.token_file).load_credentials()
+        hits = _read_token_file.cache_info().hits
+
+        auth = WeChatAuth(token_file=self.token_file)
+        self.assertTrue(auth.load_credentials())
+        self.assertEqual(auth.token, "token_1")
+        self.assertEqual(_read_token_file.cache_info().hits, hits + 1)
+
+        # 文件内容变化后重新读取
+        with open(self.token_file, 'w') as f:
+            json.dump({"token": "token_22", "cookies": {"k": "v"}}, f)
+
+        auth = WeChatAuth(token_file=self.token_file)
+        self.assertTrue(auth.load_credentials())
+        self.assertEqual(auth.token, "token_22")
+
     def test_load_credentials_file_not_exists(self):
         """测试加载凭证（文件不存在）"""
         auth = WeChatAuth(token_file=self.token_file)
@@ -120,6 +158,25 @@ class TestWeChatAuth(unittest.TestCase):
         self.assertEqual(auth.token, "saved_token")
         self.assertEqual(auth.cookies, {"cookie1": "value1"})
 
+    def test_login_errors(self):
+        """测试扫码超时和浏览器错误原样抛出，其他异常包装为 LoginError"""
+        auth = WeChatAuth(token_file=self.token_file, qrcode_file=self.qrcode_file)
+        steps = ("_start_browser", "_open_login_page", "_get_qrcode", "_extract_credentials")
+
+        with mock.patch.multiple(auth, **{name: mock.DEFAULT for name in steps}), \
+                mock.patch.object(auth, "_wait_for_scan", side_effect=QRCodeTimeoutError("扫码超时")):
+            with self.assertRaises(QRCodeTimeoutError):
+                auth.login(timeout=1)
+
+        with mock.patch.object(auth, "_start_browser", side_effect=BrowserError("启动失败")):
+            with self.assertRaises(BrowserError):
+                auth.login(timeout=1)
+
+        with mock.patch.object(auth, "_start_browser", side_effect=RuntimeError("意外错误")):
+            with self.assertRaises(LoginError) as ctx:
+                auth.login(timeout=1)
+        self.assertIsInstance(ctx.exception.__cause__, RuntimeError)
+
     def test_context_manager(self):
         """测试 context manager"""
         with WeChatAuth(token_file=self.token_file) as auth:
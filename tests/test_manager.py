@@ -0,0 +1,287 @@
+"""
+公众号管理器单元测试
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import wx_mp_manager
+from wx_mp_manager import WXMPManager, _UNSAFE_FILENAME_RE, migrate_feeds_json_to_msgpack
+from wx_rss import WeChatMP
+from wx_rss.fetcher import ArticleFetcher
+from wx_rss.search import FeedSearcher
+from wx_rss.exceptions import FetchError
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class _FakeWeChatMP:
+    """替代 WeChatMP 的桩对象：不登录、不发请求"""
+
+    def __init__(self):
+        self._is_logged_in = True
+        self.threads = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def search_feed(self, keyword, limit=5, refresh=False):
+        if keyword == "不存在":
+            return []
+        return [{"fakeid": f"id-{keyword}", "nickname": keyword}]
+
+    def fetch_articles(self, fakeid, count=10, with_content=False, begin=0):
+        self.threads.add(threading.get_ident())
+        if fakeid == "id-出错":
+            raise FetchError("抓取失败")
+        return [{"id": "001", "title": "测试文章", "url": "https://example.com/a", "publish_time": 0}]
+
+    def dump_json_feed(self, fp, mp_name, articles, feed_id=""):
+        fp.write(b"{}")
+
+
+class _FakeSession:
+    """替代 requests.Session 的桩对象：按 URL 返回搜索结果或文章列表，不发请求"""
+
+    def __init__(self):
+        with open(os.path.join(FIXTURES_DIR, "appmsgpublish.json"), "rb") as f:
+            self.articles = f.read()
+        self.lock = threading.Lock()
+        self.urls = []
+
+    def get(self, url, params=None, headers=None, cookies=None, timeout=None):
+        with self.lock:
+            self.urls.append(url)
+        ok = "fakeid=id-%E5%87%BA%E9%94%99" not in url
+        if url == FeedSearcher.SEARCH_URL:
+            content = json.dumps({
+                "base_resp": {"ret": 0},
+                "list": [{"fakeid": f"id-{params['query']}", "nickname": params["query"]}]
+            }).encode("utf-8")
+        else:
+            content = self.articles
+        return mock.Mock(
+            ok=ok,
+            status_code=200 if ok else 500,
+            reason="OK" if ok else "Internal Server Error",
+            url=url,
+            content=content
+        )
+
+    def close(self):
+        pass
+
+
+class TestFetchAllFeeds(unittest.TestCase):
+    """测试批量抓取"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.feeds_file = os.path.join(self.temp_dir, "feeds.json")
+        self.output_dir = os.path.join(self.temp_dir, "output")
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_collect_results_and_errors(self):
+        """测试每个公众号的结果分别记录，失败不影响其余公众号"""
+        manager = WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+        manager.feeds = [
+            {"name": "正常", "fakeid": "id-正常"},
+            {"name": "出错"},
+            {"name": "不存在"},
+            {"name": "新增"},
+        ]
+
+        fake = _FakeWeChatMP()
+        with mock.patch("wx_mp_manager.WeChatMP", return_value=fake):
+            results = manager.fetch_all_feeds(count=5, concurrency=2)
+
+        self.assertEqual(results["total"], 4)
+        self.assertEqual([item["name"] for item in results["succeeded"]], ["正常", "新增"])
+        self.assertEqual(
+            sorted((item["name"], item["error"]) for item in results["failed"]),
+            [("不存在", "未找到公众号"), ("出错", "抓取失败")]
+        )
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "正常.json")))
+
+        # 新搜索到的 fakeid 已保存
+        saved = WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+        self.assertEqual(saved.feeds[3]["fakeid"], "id-新增")
+
+        # 在线程池中执行，不在主线程
+        self.assertNotIn(threading.get_ident(), fake.threads)
+
+
+    def test_threads_share_real_client(self):
+        """测试线程池共用一个真实的 WeChatMP（搜索器、熔断器、搜索缓存都不替换）"""
+        from wx_rss import SearchCache
+
+        manager = WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+        names = [f"公众号{i}" for i in range(24)]
+        manager.feeds = [{"name": name} for name in names] + [{"name": "出错", "fakeid": "id-出错"}]
+
+        session = _FakeSession()
+        mp = WeChatMP(
+            token_file="nonexistent_token.json",
+            token_store={"token": "test_token", "cookies": {}},
+            search_cache=SearchCache(cache_file=os.path.join(self.temp_dir, "search.json")),
+            session=session
+        )
+        mp.CIRCUIT_FAIL_MAX = 1
+        with mock.patch("wx_mp_manager.WeChatMP", return_value=mp), \
+                mock.patch("wx_rss.retry.time.sleep") as sleep:
+            results = manager.fetch_all_feeds(count=5, concurrency=8)
+
+        self.assertEqual(sorted(item["name"] for item in results["succeeded"]), sorted(names))
+        self.assertEqual([item["name"] for item in results["failed"]], ["出错"])
+        for name in names:
+            self.assertTrue(os.path.exists(os.path.join(self.output_dir, f"{name}.json")))
+
+        # 每个公众号搜索一次、抓取一次，失败的公众号不重试
+        searches = [url for url in session.urls if url == FeedSearcher.SEARCH_URL]
+        fetches = [url for url in session.urls if url.startswith(ArticleFetcher.API_URL)]
+        self.assertEqual(len(searches), len(names))
+        self.assertEqual(len(fetches), len(names) + 1)
+        self.assertEqual(mp._breakers["id-出错"].state, "open")
+        # 熔断后不退避重试
+        sleep.assert_not_called()
+
+        saved = WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+        self.assertEqual([feed["fakeid"] for feed in saved.feeds[:-1]], [f"id-{name}" for name in names])
+
+    def test_unsafe_filename(self):
+        """测试公众号名称中的路径分隔符和保留字符替换为下划线，文件写在输出目录内"""
+        self.assertEqual(_UNSAFE_FILENAME_RE.sub("_", 'a/b\\c:d*e?f"g<h>i|j\x01k'), "a_b_c_d_e_f_g_h_i_j_k")
+
+        manager = WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+        manager.feeds = [{"name": "../上级:目录", "fakeid": "id-1"}]
+
+        with mock.patch("wx_mp_manager.WeChatMP", return_value=_FakeWeChatMP()):
+            results = manager.fetch_all_feeds(count=5)
+
+        output_file = results["succeeded"][0]["output_file"]
+        self.assertEqual(output_file, os.path.join(self.output_dir, ".._上级_目录.json"))
+        self.assertTrue(os.path.exists(output_file))
+
+    def test_write_failure_keeps_previous_output(self):
+        """测试写入 JSON Feed 中途出错时保留上一次的输出文件，不留下临时文件"""
+        manager = WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+        manager.feeds = [{"name": "正常", "fakeid": "id-正常"}]
+        output_file = os.path.join(self.output_dir, "正常.json")
+        with open(output_file, "wb") as f:
+            f.write(b"previous")
+
+        fake = _FakeWeChatMP()
+
+        def dump_json_feed(fp, mp_name, articles, feed_id=""):
+            fp.write(b'{"items": [')
+            raise OSError("磁盘已满")
+
+        fake.dump_json_feed = dump_json_feed
+        with mock.patch("wx_mp_manager.WeChatMP", return_value=fake):
+            results = manager.fetch_all_feeds(count=5)
+
+        self.assertEqual(results["failed"], [{"name": "正常", "error": "磁盘已满"}])
+        with open(output_file, "rb") as f:
+            self.assertEqual(f.read(), b"previous")
+        self.assertEqual(os.listdir(self.output_dir), ["正常.json"])
+
+
+class TestFeedsFile(unittest.TestCase):
+    """测试公众号列表文件的读写"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.feeds_file = os.path.join(self.temp_dir, "feeds.json")
+        self.output_dir = os.path.join(self.temp_dir, "output")
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_json_round_trip(self):
+        """测试 JSON 格式写入后重新加载一致，默认写紧凑格式"""
+        manager = WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+        manager.add_feed("测试公众号", fakeid="MzAxMDAwMDAx")
+        manager.remove_feed("突围先生")
+
+        with open(self.feeds_file, "rb") as f:
+            data = f.read()
+        self.assertNotIn(b"\n", data)
+        self.assertNotIn(b", ", data)
+        self.assertIn("测试公众号".encode("utf-8"), data)
+
+        loaded = WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+        self.assertEqual(loaded.feeds, manager.feeds)
+        self.assertEqual(loaded.add_feed("测试公众号")["success"], False)
+
+        # 缩进格式同样可以读取
+        manager.save_feeds(indent=True)
+        with open(self.feeds_file, "rb") as f:
+            self.assertIn(b"\n  ", f.read())
+        loaded = WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+        self.assertEqual(loaded.feeds, manager.feeds)
+
+    def test_reload_after_change(self):
+        """测试文件变化后重新解析，修改已加载的列表不影响缓存"""
+        manager = WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+        manager.feeds[0]["fakeid"] = "changed"
+        self.assertNotIn("fakeid", WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir).feeds[0])
+
+        with open(self.feeds_file, "w", encoding="utf-8") as f:
+            f.write('[{"name": "新的公众号"}]')
+        loaded = WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+        self.assertEqual(loaded.feeds, [{"name": "新的公众号"}])
+
+    @unittest.skipUnless(wx_mp_manager.msgpack, "msgpack 未安装")
+    def test_msgpack_round_trip(self):
+        """测试 JSON 列表迁移为 MessagePack 后读写一致"""
+        manager = WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+        manager.add_feed("测试公众号", fakeid="MzAxMDAwMDAx")
+
+        msgpack_file = migrate_feeds_json_to_msgpack(self.feeds_file)
+        self.assertEqual(msgpack_file, os.path.join(self.temp_dir, "feeds.msgpack"))
+        self.assertTrue(os.path.exists(self.feeds_file))
+
+        loaded = WXMPManager(feeds_file=msgpack_file, output_dir=self.output_dir)
+        self.assertEqual(loaded.feeds, manager.feeds)
+
+        loaded.add_feed("新增")
+        reloaded = WXMPManager(feeds_file=msgpack_file, output_dir=self.output_dir)
+        self.assertEqual(reloaded.feeds[-1], {"name": "新增"})
+
+    @unittest.skipIf(wx_mp_manager.msgpack, "msgpack 已安装")
+    def test_msgpack_not_installed(self):
+        """测试未安装 msgpack 时给出安装提示"""
+        WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+
+        with self.assertRaises(ImportError):
+            migrate_feeds_json_to_msgpack(self.feeds_file)
+        with self.assertRaises(ImportError):
+            WXMPManager(feeds_file=os.path.join(self.temp_dir, "feeds.msgpack"), output_dir=self.output_dir)
+
+    def test_output_dir_created_once(self):
+        """测试同一输出目录在进程内只创建一次"""
+        WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+        self.assertTrue(os.path.isdir(self.output_dir))
+        self.assertIn(self.output_dir, wx_mp_manager._ENSURED_DIRS)
+
+        with mock.patch("wx_mp_manager.Path") as path:
+            WXMPManager(feeds_file=self.feeds_file, output_dir=self.output_dir)
+        path.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
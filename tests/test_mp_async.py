@@ -0,0 +1,281 @@
+"""
+异步入口单元测试
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from wx_rss.exceptions import FetchError, LoginError
+from wx_rss.search import FeedSearcher, parse_results
+
+
+@unittest.skipUnless(aiohttp, "aiohttp 未安装")
+class TestSearchCoalescing(unittest.IsolatedAsyncioTestCase):
+    """测试同一关键词的并发搜索共用一个请求"""
+
+    async def asyncSetUp(self):
+        """测试前准备：用计数的协程替换实际的 HTTP 请求"""
+        from wx_rss import AsyncWeChatMP
+
+        self.mp = AsyncWeChatMP(
+            token_file="nonexistent_token.json",
+            token_store={"token": "test_token", "cookies": {}}
+        )
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.error = None
+
+        async def request_search(params):
+            self.calls += 1
+            await self.release.wait()
+            if self.error:
+                raise self.error
+            return [{"fakeid": "MzAxMDAwMDAx", "nickname": params["query"]}]
+
+        self.mp._request_search = request_search
+
+    async def asyncTearDown(self):
+        """测试后清理"""
+        await self.mp.close()
+
+    async def test_concurrent_search_single_request(self):
+        """测试两个并发的相同搜索只发出一次请求，结果互不影响"""
+        first = asyncio.ensure_future(self.mp.search_feed("测试公众号"))
+        second = asyncio.ensure_future(self.mp.search_feed("测试公众号"))
+        await asyncio.sleep(0)
+        self.release.set()
+
+        results = await asyncio.gather(first, second)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results[0], results[1])
+        results[0][0]["fakeid"] = "changed"
+        self.assertEqual(results[1][0]["fakeid"], "MzAxMDAwMDAx")
+        self.assertEqual(self.mp._searches, {})
+
+    async def test_coalesce_normalized_keyword(self):
+        """测试只有大小写或首尾空白不同的关键词共用一个请求"""
+        first = asyncio.ensure_future(self.mp.search_feed("TestMP"))
+        second = asyncio.ensure_future(self.mp.search_feed(" testmp "))
+        await asyncio.sleep(0)
+        self.release.set()
+
+        results = await asyncio.gather(first, second)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results[0], results[1])
+
+    async def test_cancel_one_waiter(self):
+        """测试取消一个调用方不影响等待同一请求的其他调用方"""
+        first = asyncio.ensure_future(self.mp.search_feed("测试公众号"))
+        second = asyncio.ensure_future(self.mp.search_feed("测试公众号"))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+
+        self.release.set()
+        results = await second
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results[0]["fakeid"], "MzAxMDAwMDAx")
+
+    async def test_failure_propagates_and_not_cached(self):
+        """测试请求失败时所有调用方都收到异常，失败结果不保留，下次重新请求"""
+        self.error = FetchError("搜索失败")
+        first = asyncio.ensure_future(self.mp.search_feed("测试公众号"))
+        second = asyncio.ensure_future(self.mp.search_feed("测试公众号"))
+        await asyncio.sleep(0)
+        self.release.set()
+
+        results = await asyncio.gather(first, second, return_exceptions=True)
+
+        self.assertEqual(self.calls, 1)
+        for result in results:
+            self.assertIsInstance(result, FetchError)
+        self.assertEqual(self.mp._searches, {})
+
+        self.error = None
+        results = await self.mp.search_feed("测试公众号")
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(results[0]["fakeid"], "MzAxMDAwMDAx")
+
+
+
+
+@unittest.skipUnless(aiohttp, "aiohttp 未安装")
+class TestSearchCacheHit(unittest.IsolatedAsyncioTestCase):
+    """测试搜索缓存命中时的登录检查和返回值"""
+
+    async def asyncSetUp(self):
+        """测试前准备：搜索缓存中已有结果"""
+        from wx_rss import AsyncWeChatMP, SearchCache
+
+        self.temp_dir = tempfile.mkdtemp()
+        self.search_cache = SearchCache(cache_file=os.path.join(self.temp_dir, "search.json"))
+        self.search_cache.set_fakeid("测试公众号", "MzAxMDAwMDAx")
+        self.search_cache.set_search(
+            "测试公众号", 5, [{"fakeid": "MzAxMDAwMDAx", "nickname": "测试公众号"}]
+        )
+        self.mp = AsyncWeChatMP(
+            token_file="nonexistent_token.json",
+            token_store={"token": "test_token", "cookies": {}},
+            search_cache=self.search_cache
+        )
+
+    async def asyncTearDown(self):
+        """测试后清理"""
+        await self.mp.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def test_get_feed_fakeid_requires_login(self):
+        """测试未登录时 get_feed_fakeid 抛出 LoginError，即使搜索缓存命中"""
+        self.assertEqual(await self.mp.get_feed_fakeid("测试公众号"), "MzAxMDAwMDAx")
+
+        self.mp._is_logged_in = False
+        with self.assertRaises(LoginError):
+            await self.mp.get_feed_fakeid("测试公众号")
+
+    async def test_search_feed_returns_copies(self):
+        """测试搜索缓存命中时返回副本，调用方修改结果不影响缓存"""
+        results = await self.mp.search_feed("测试公众号")
+        results[0]["fakeid"] = "changed"
+        results.clear()
+
+        results = await self.mp.search_feed("测试公众号")
+        self.assertEqual(results, [{"fakeid": "MzAxMDAwMDAx", "nickname": "测试公众号"}])
+
+
+class _SignalEvent(threading.Event):
+    """每次有线程开始等待时释放一次 waiting 信号量，测试据此确认等待的线程已就绪"""
+
+    def __init__(self):
+        super().__init__()
+        self.waiting = threading.Semaphore(0)
+
+    def wait(self, timeout=None):
+        self.waiting.release()
+        return super().wait(timeout)
+
+
+class TestSyncSearchCoalescing(unittest.TestCase):
+    """测试多个线程同时搜索同一关键词时共用一个请求"""
+
+    WAITERS = 4
+
+    def setUp(self):
+        """测试前准备：会话的 get 在 release 设置前阻塞"""
+        self.calls = 0
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.error = None
+
+        def get(url, params=None, headers=None, timeout=None):
+            self.calls += 1
+            self.entered.set()
+            self.release.wait()
+            if self.error:
+                raise self.error
+            return mock.Mock(content=json.dumps({
+                "base_resp": {"ret": 0},
+                "list": [{"fakeid": "MzAxMDAwMDAx", "nickname": params["query"]}]
+            }).encode("utf-8"))
+
+        self.session = mock.Mock()
+        self.session.get.side_effect = get
+        self.searcher = FeedSearcher(token="test_token", cookies={}, session=self.session)
+
+    def _run_concurrently(self, keywords):
+        """第一个关键词的线程发出请求后再启动其余线程，等它们都开始等待后放行请求"""
+        results = [None] * len(keywords)
+
+        def search(i):
+            try:
+                results[i] = self.searcher.search_by_name(keywords[i])
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=search, args=(i,)) for i in range(len(keywords))]
+        threads[0].start()
+        self.assertTrue(self.entered.wait(5))
+
+        (search_entry,) = self.searcher._searches.values()
+        search_entry.event = event = _SignalEvent()
+        for thread in threads[1:]:
+            thread.start()
+        for _ in threads[1:]:
+            self.assertTrue(event.waiting.acquire(timeout=5))
+
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+        return results
+
+    def test_concurrent_search_single_request(self):
+        """测试并发的相同搜索（包括大小写、首尾空白不同）只发出一次请求，结果互不影响"""
+        results = self._run_concurrently(["TestMP"] + [" testmp "] * self.WAITERS)
+
+        self.assertEqual(self.calls, 1)
+        for result in results[1:]:
+            self.assertEqual(result, results[0])
+        results[0][0]["fakeid"] = "changed"
+        self.assertEqual(results[1][0]["fakeid"], "MzAxMDAwMDAx")
+        self.assertEqual(self.searcher._searches, {})
+
+        # 之后的搜索直接使用内存中的结果
+        self.assertEqual(self.searcher.search_by_name("testmp")[0]["fakeid"], "MzAxMDAwMDAx")
+        self.assertEqual(self.calls, 1)
+
+    def test_failure_propagates_and_not_cached(self):
+        """测试请求失败时所有线程都收到异常，失败结果不保留，下次重新请求"""
+        from requests import ConnectionError
+
+        self.error = ConnectionError("连接失败")
+        results = self._run_concurrently(["测试公众号"] * (self.WAITERS + 1))
+
+        self.assertEqual(self.calls, 1)
+        for result in results:
+            self.assertIsInstance(result, FetchError)
+        self.assertEqual(self.searcher._searches, {})
+
+        self.error = None
+        self.assertEqual(self.searcher.get_first_match("测试公众号"), "MzAxMDAwMDAx")
+        self.assertEqual(self.calls, 2)
+
+
+
+class TestSearchResponse(unittest.TestCase):
+    """测试搜索响应的解析"""
+
+    def test_non_dict_response(self):
+        """测试合法 JSON 但不是对象的响应抛出 FetchError"""
+        session = mock.Mock()
+        searcher = FeedSearcher(token="test_token", cookies={}, session=session)
+
+        for content in (b"[]", b"null", b'"x"', b"1"):
+            with self.subTest(content=content):
+                session.get.return_value = mock.Mock(content=content)
+                with self.assertRaises(FetchError):
+                    searcher.search_by_name("测试公众号")
+        self.assertEqual(searcher._memo, OrderedDict())
+
+        # AsyncWeChatMP 用同一个函数解析响应
+        with self.assertRaises(FetchError):
+            parse_results([])
+
+
+if __name__ == '__main__':
+    unittest.main()
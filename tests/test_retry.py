@@ -0,0 +1,106 @@
+"""
+重试装饰器单元测试
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+from wx_rss.retry import backoff_delay, retry_with_backoff
+from wx_rss.exceptions import NetworkError, RateLimitError, FetchError
+
+
+class TestBackoffDelay(unittest.TestCase):
+    """测试退避时间计算"""
+
+    def test_exponential_with_cap(self):
+        """测试指数增长且不超过上限"""
+        self.assertEqual(backoff_delay(0, base=1.0, max_delay=30.0, jitter=0), 1.0)
+        self.assertEqual(backoff_delay(3, base=1.0, max_delay=30.0, jitter=0), 8.0)
+        self.assertEqual(backoff_delay(10, base=1.0, max_delay=30.0, jitter=0), 30.0)
+
+    def test_jitter_range(self):
+        """测试抖动范围"""
+        for _ in range(100):
+            delay = backoff_delay(1, base=1.0, max_delay=30.0, jitter=0.5)
+            self.assertGreaterEqual(delay, 2.0)
+            self.assertLessEqual(delay, 3.0)
+
+
+class TestRetryWithBackoff(unittest.TestCase):
+    """测试重试装饰器"""
+
+    @mock.patch("wx_rss.retry.time.sleep")
+    def test_retry_then_success(self, sleep):
+        """测试失败后重试成功"""
+        calls = []
+
+        @retry_with_backoff(max_retries=3)
+        def func():
+            calls.append(1)
+            if len(calls) < 3:
+                raise NetworkError("网络错误")
+            return "ok"
+
+        self.assertEqual(func(), "ok")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    @mock.patch("wx_rss.retry.time.sleep")
+    def test_max_retries_exceeded(self, sleep):
+        """测试超过最大次数后抛出原异常"""
+        @retry_with_backoff(max_retries=2)
+        def func():
+            raise NetworkError("网络错误")
+
+        with self.assertRaises(NetworkError):
+            func()
+        self.assertEqual(sleep.call_count, 1)
+
+    def test_invalid_max_retries(self):
+        """测试 max_retries 小于 1 时直接报错，不会静默返回 None"""
+        with self.assertRaises(ValueError):
+            retry_with_backoff(max_retries=0)
+
+    @mock.patch("wx_rss.retry.time.sleep")
+    def test_no_retry_on_other_errors(self, sleep):
+        """测试不在 retry_on 中的异常直接抛出"""
+        @retry_with_backoff(max_retries=3)
+        def func():
+            raise FetchError("抓取失败")
+
+        with self.assertRaises(FetchError):
+            func()
+        sleep.assert_not_called()
+
+    @mock.patch("wx_rss.retry.time.sleep")
+    def test_honor_retry_after(self, sleep):
+        """测试按 retry_after 等待"""
+        calls = []
+
+        @retry_with_backoff(max_retries=2)
+        def func():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RateLimitError("频率限制", retry_after=42)
+            return "ok"
+
+        self.assertEqual(func(), "ok")
+        sleep.assert_called_once_with(42.0)
+
+    def test_async_function(self):
+        """测试装饰异步函数"""
+        calls = []
+
+        @retry_with_backoff(max_retries=3, base=0.001)
+        async def func():
+            calls.append(1)
+            if len(calls) < 2:
+                raise NetworkError("网络错误")
+            return "ok"
+
+        self.assertEqual(asyncio.run(func()), "ok")
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,27 +5,101 @@
 
 import json
 import os
-from typing import List, Dict, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Optional, Set, Tuple
 from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 from wx_rss import WeChatMP
+from wx_rss.atomic import atomic_open, atomic_write
+
+# 本进程内已确认存在的输出目录（重复创建管理器时跳过 mkdir）
+_ENSURED_DIRS: Set[str] = set()
+
+# 文件名中不允许出现的字符（路径分隔符、Windows 保留字符和控制字符）
+_UNSAFE_FILENAME_RE = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+def _is_msgpack(path: str) -> bool:
+    """根据扩展名判断公众号列表文件是否为 MessagePack 格式"""
+    return path.endswith(".msgpack")
+
+
+@lru_cache(maxsize=8)
+def _read_feeds_file(path: str, mtime_ns: int, size: int) -> List[Dict]:
+    """读取公众号列表文件（按路径、修改时间和大小缓存，文件未变化时不重复解析）"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if _is_msgpack(path):
+        return msgpack.unpackb(data, raw=False)
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def migrate_feeds_json_to_msgpack(json_file: str = "feeds.json", msgpack_file: Optional[str] = None) -> str:
+    """把 JSON 格式的公众号列表转换为 MessagePack 格式（原文件保留）
+
+    Args:
+        json_file: JSON 格式的公众号列表文件
+        msgpack_file: 输出文件路径，默认与 json_file 同名、扩展名为 .msgpack
+
+    Returns:
+        输出文件路径
+
+    Raises:
+        ImportError: 未安装 msgpack
+    """
+    if msgpack is None:
+        raise ImportError("msgpack 未安装，请运行: pip install msgpack")
+
+    if msgpack_file is None:
+        msgpack_file = os.path.splitext(json_file)[0] + ".msgpack"
+
+    stat = os.stat(json_file)
+    feeds = _read_feeds_file(json_file, stat.st_mtime_ns, stat.st_size)
+    atomic_write(msgpack_file, msgpack.packb(feeds, use_bin_type=True))
+
+    return msgpack_file
 
 
 class WXMPManager:
     """微信公众号管理器"""
 
+    __slots__ = ("feeds_file", "output_dir", "feeds", "_names")
+
     def __init__(self, feeds_file: str = "feeds.json", output_dir: str = "output"):
         """初始化
 
         Args:
-            feeds_file: 公众号列表配置文件
+            feeds_file: 公众号列表配置文件（扩展名为 .msgpack 时以 MessagePack 格式读写）
             output_dir: JSON Feed 输出目录
+
+        Raises:
+            ImportError: feeds_file 为 .msgpack 格式但未安装 msgpack
         """
+        if _is_msgpack(feeds_file) and msgpack is None:
+            raise ImportError("msgpack 未安装，请运行: pip install msgpack")
+
         self.feeds_file = feeds_file
         self.output_dir = output_dir
         self.feeds: List[Dict] = []
+        # 已有的公众号名称（add_feed / remove_feed 用来 O(1) 判断是否存在）
+        self._names: Set[str] = set()
 
         # 确保输出目录存在
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        if output_dir not in _ENSURED_DIRS:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            _ENSURED_DIRS.add(output_dir)
 
         # 加载列表
         self.load_feeds()
@@ -33,8 +107,10 @@ class WXMPManager:
     def load_feeds(self) -> None:
         """从文件加载公众号列表"""
         if os.path.exists(self.feeds_file):
-            with open(self.feeds_file, "r", encoding="utf-8") as f:
-                self.feeds = json.load(f)
+            stat = os.stat(self.feeds_file)
+            cached = _read_feeds_file(self.feeds_file, stat.st_mtime_ns, stat.st_size)
+            # 每项都是扁平字典，浅拷贝即可避免修改时影响缓存
+            self.feeds = [dict(feed) for feed in cached]
         else:
             # 默认公众号列表
             self.feeds = [
@@ -46,10 +122,24 @@ class WXMPManager:
             ]
             self.save_feeds()
 
-    def save_feeds(self) -> None:
-        """保存公众号列表到文件"""
-        with open(self.feeds_file, "w", encoding="utf-8") as f:
-            json.dump(self.feeds, f, ensure_ascii=False, indent=2)
+        self._names = {feed["name"] for feed in self.feeds}
+
+    def save_feeds(self, indent: bool = False) -> None:
+        """保存公众号列表到文件
+
+        Args:
+            indent: 是否缩进输出（便于手动编辑），默认写紧凑格式；MessagePack 格式忽略此参数
+        """
+        if _is_msgpack(self.feeds_file):
+            data = msgpack.packb(self.feeds, use_bin_type=True)
+        elif orjson:
+            data = orjson.dumps(self.feeds, option=orjson.OPT_INDENT_2 if indent else None)
+        elif indent:
+            data = json.dumps(self.feeds, ensure_ascii=False, indent=2).encode("utf-8")
+        else:
+            data = json.dumps(self.feeds, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        atomic_write(self.feeds_file, data)
 
     def add_feed(self, name: str, fakeid: Optional[str] = None) -> Dict:
         """添加公众号到列表
@@ -62,9 +152,8 @@ class WXMPManager:
             添加的公众号信息
         """
         # 检查是否已存在
-        for feed in self.feeds:
-            if feed["name"] == name:
-                return {"success": False, "message": f"公众号 {name} 已存在"}
+        if name in self._names:
+            return {"success": False, "message": f"公众号 {name} 已存在"}
 
         # 添加到列表
         new_feed = {"name": name}
@@ -72,6 +161,7 @@ class WXMPManager:
             new_feed["fakeid"] = fakeid
 
         self.feeds.append(new_feed)
+        self._names.add(name)
         self.save_feeds()
 
         return {"success": True, "message": f"✅ 已添加公众号: {name}", "feed": new_feed}
@@ -85,15 +175,14 @@ class WXMPManager:
         Returns:
             删除结果
         """
-        original_count = len(self.feeds)
-        self.feeds = [f for f in self.feeds if f["name"] != name]
-
-        if len(self.feeds) < original_count:
-            self.save_feeds()
-            return {"success": True, "message": f"✅ 已删除公众号: {name}"}
-        else:
+        if name not in self._names:
             return {"success": False, "message": f"❌ 未找到公众号: {name}"}
 
+        self.feeds = [f for f in self.feeds if f["name"] != name]
+        self._names.discard(name)
+        self.save_feeds()
+        return {"success": True, "message": f"✅ 已删除公众号: {name}"}
+
     def list_feeds(self) -> List[Dict]:
         """获取公众号列表
 
@@ -102,11 +191,12 @@ class WXMPManager:
         """
         return self.feeds
 
-    def fetch_all_feeds(self, count: int = 10) -> Dict:
-        """批量抓取所有公众号的文章
+    def fetch_all_feeds(self, count: int = 10, concurrency: int = 5) -> Dict:
+        """批量抓取所有公众号的文章（多个公众号在线程池中并发抓取）
 
         Args:
             count: 每个公众号抓取的文章数量
+            concurrency: 最大并发线程数
 
         Returns:
             抓取结果统计
@@ -121,77 +211,89 @@ class WXMPManager:
             "failed": []
         }
 
+        missing = [feed for feed in self.feeds if "fakeid" not in feed]
+
         with WeChatMP() as mp:
-            # 登录（如果需要）
             if not mp._is_logged_in:
                 print("需要登录，请扫描二维码...")
                 mp.login()
 
-            # 遍历所有公众号
-            for feed_config in self.feeds:
-                name = feed_config["name"]
-
-                try:
-                    # 如果没有 fakeid，先搜索
-                    if "fakeid" not in feed_config:
-                        print(f"正在搜索公众号: {name}")
-                        search_results = mp.search_feed(name)
-
-                        if not search_results:
+            # 文章列表和搜索都通过 HTTP 会话请求，可以在多个线程中共用同一个客户端
+            try:
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    futures = [
+                        (feed_config, executor.submit(self._process_feed, mp, feed_config, count))
+                        for feed_config in self.feeds
+                    ]
+                    for feed_config, future in futures:
+                        try:
+                            status, entry = future.result()
+                        except Exception as e:
                             results["failed"].append({
-                                "name": name,
-                                "error": "未找到公众号"
+                                "name": feed_config["name"],
+                                "error": str(e)
                             })
-                            continue
-
-                        # 保存 fakeid
-                        feed_config["fakeid"] = search_results[0]["fakeid"]
-                        feed_config["nickname"] = search_results[0]["nickname"]
-                        self.save_feeds()
-
-                    fakeid = feed_config["fakeid"]
-                    feed_name = feed_config.get("nickname", name)
-
-                    # 抓取文章
-                    print(f"正在抓取: {feed_name}")
-                    articles = mp.fetch_articles(fakeid=fakeid, count=count)
-
-                    if not articles:
-                        results["failed"].append({
-                            "name": feed_name,
-                            "error": "未获取到文章"
-                        })
-                        continue
-
-                    # 生成 JSON Feed
-                    json_feed = mp.generate_json_feed(
-                        mp_name=feed_name,
-                        articles=articles,
-                        feed_id=fakeid
-                    )
-
-                    # 保存到文件
-                    output_file = os.path.join(self.output_dir, f"{feed_name}.json")
-                    with open(output_file, "w", encoding="utf-8") as f:
-                        f.write(json_feed)
-
-                    results["succeeded"].append({
-                        "name": feed_name,
-                        "articles_count": len(articles),
-                        "output_file": output_file
-                    })
-
-                    print(f"✅ {feed_name}: {len(articles)} 篇文章")
-
-                except Exception as e:
-                    results["failed"].append({
-                        "name": name,
-                        "error": str(e)
-                    })
-                    print(f"❌ {name}: {e}")
+                            print(f"❌ {feed_config['name']}: {e}")
+                        else:
+                            results[status].append(entry)
+            finally:
+                # 新搜索到的 fakeid 在结束后统一保存一次
+                if any("fakeid" in feed for feed in missing):
+                    self.save_feeds()
 
         return results
 
+    # 私有方法
+
+    def _process_feed(self, mp: WeChatMP, feed_config: Dict, count: int) -> Tuple[str, Dict]:
+        """处理单个公众号：搜索 fakeid（如果没有）、抓取文章并写入 JSON Feed
+
+        Returns:
+            ("succeeded" 或 "failed", 结果条目)
+        """
+        name = feed_config["name"]
+
+        # 如果没有 fakeid，先搜索
+        if "fakeid" not in feed_config:
+            print(f"正在搜索公众号: {name}")
+            search_results = mp.search_feed(name)
+
+            if not search_results:
+                return "failed", {"name": name, "error": "未找到公众号"}
+
+            feed_config["fakeid"] = search_results[0]["fakeid"]
+            feed_config["nickname"] = search_results[0]["nickname"]
+
+        fakeid = feed_config["fakeid"]
+        feed_name = feed_config.get("nickname", name)
+
+        # 抓取文章
+        print(f"正在抓取: {feed_name}")
+        # 不在这里重试：失败已计入该公众号的熔断器，熔断后的重试只会空等
+        articles = mp.fetch_articles(fakeid=fakeid, count=count)
+
+        if not articles:
+            return "failed", {"name": feed_name, "error": "未获取到文章"}
+
+        # 逐条生成并写入临时文件，完成后再替换，不在内存中构造完整的 feed，
+        # 写入中途出错时也不会留下半个文件
+        safe_name = _UNSAFE_FILENAME_RE.sub("_", feed_name)
+        output_file = os.path.join(self.output_dir, f"{safe_name}.json")
+        with atomic_open(output_file) as f:
+            mp.dump_json_feed(
+                f,
+                mp_name=feed_name,
+                articles=articles,
+                feed_id=fakeid
+            )
+
+        print(f"✅ {feed_name}: {len(articles)} 篇文章")
+        return "succeeded", {
+            "name": feed_name,
+            "articles_count": len(articles),
+            "output_file": output_file
+        }
+
 
 def main():
     """示例：命令行使用"""
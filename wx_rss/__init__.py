@@ -6,21 +6,43 @@ wx-mp-rss-core
 提供轻量级的公众号文章抓取和 RSS 生成功能
 """
 
+import importlib
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
 from .login import WeChatAuth
 from .fetcher import ArticleFetcher
-from .json_feed import JSONFeedGenerator
-from .search import FeedSearcher
+from .json_feed import JSONFeedGenerator, dump_feed, write_feed
+from .search import FeedSearcher, create_session
+from .cache import ArticleCache, SearchCache
+from .retry import retry_with_backoff
+from .batch import BatchResult, run_batch, run_batch_async
+from .circuit import CircuitBreaker
+from .client import WeChatMPBase
 from .exceptions import *
 from .logger import get_logger
 
+if TYPE_CHECKING:
+    import requests
+
 __version__ = "0.2.0"
 __all__ = [
     "WeChatMP",
+    "AsyncWeChatMP",
     "WeChatAuth",
     "ArticleFetcher",
     "JSONFeedGenerator",
+    "dump_feed",
+    "write_feed",
+    "ArticleCache",
+    "SearchCache",
     "FeedSearcher",
     "get_logger",
+    "retry_with_backoff",
+    "BatchResult",
+    "run_batch",
+    "run_batch_async",
+    "CircuitBreaker",
     # 异常类
     "WXMPRSSError",
     "LoginError",
@@ -33,18 +55,56 @@ __all__ = [
 ]
 
 
-class WeChatMP:
+# 按需导入的名称 -> 所在子模块（只用同步接口时不必加载 aiohttp）
+_LAZY_IMPORTS = {
+    "AsyncWeChatMP": ".mp_async",
+}
+
+
+def __getattr__(name: str):
+    """按需导入 _LAZY_IMPORTS 中的名称，导入后缓存到模块命名空间"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+class WeChatMP(WeChatMPBase):
     """微信公众号 RSS 统一入口类"""
 
-    def __init__(self, token_file: str = "wx_token.json"):
+    def __init__(
+        self,
+        token_file: str = "wx_token.json",
+        cache: Optional[ArticleCache] = None,
+        search_cache: Optional[SearchCache] = None,
+        token_store: Optional[Dict[str, Any]] = None,
+        session: Optional["requests.Session"] = None
+    ):
         """初始化
 
         Args:
             token_file: Token 保存文件路径
+            cache: 文章缓存（可选），命中时跳过网络请求
+            search_cache: 搜索缓存（可选），命中时跳过搜索请求
+            token_store: 凭证字典（可选，包含 token 和 cookies），传入时不再读写 token_file
+            session: 外部传入的 HTTP 会话（可选），由调用方负责关闭；
+                多个 WeChatMP 实例可共享同一个会话的连接池
         """
         self.token_file = token_file
+        self.cache = cache
+        self.search_cache = search_cache
+        self._token_store = token_store
         self._auth = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        # 保护熔断器表、搜索器和 HTTP 会话的创建与释放（线程池中的多个线程可共用同一个实例）
+        self._lock = threading.RLock()
         self._fetcher = None
+        self._searcher: Optional[FeedSearcher] = None
+        self._session = session
+        self._owns_session = session is None
         self._logger = get_logger("wx_rss")
         self._is_logged_in = False
 
@@ -69,11 +129,16 @@ class WeChatMP:
 
         self._is_logged_in = result["is_logged_in"]
 
+        # 重新登录后 Token 已变化，搜索器在下次搜索时重新创建
+        self._close_searcher()
+
         # 初始化文章抓取器
         if self._is_logged_in:
             self._fetcher = ArticleFetcher(
                 token=result["token"],
-                cookies=result["cookies"]
+                cookies=result["cookies"],
+                session=self._get_session(),
+                storage_state=self._auth.state_file
             )
 
         return result
@@ -82,7 +147,8 @@ class WeChatMP:
         self,
         fakeid: str,
         count: int = 10,
-        with_content: bool = False
+        with_content: bool = False,
+        begin: int = 0
     ) -> list:
         """获取文章列表
 
@@ -90,6 +156,7 @@ class WeChatMP:
             fakeid: 公众号 fake_id
             count: 获取数量
             with_content: 是否包含正文内容
+            begin: 起始位置（分页）
 
         Returns:
             文章列表
@@ -97,54 +164,30 @@ class WeChatMP:
         Raises:
             LoginError: 未登录
             FetchError: 抓取失败
+            NetworkError: 网络错误，或该公众号已熔断
         """
         if not self._is_logged_in:
             raise LoginError("请先登录")
 
-        if not self._fetcher:
+        # 只读取一次，其他线程重新登录时不影响本次调用
+        fetcher = self._fetcher
+        if not fetcher:
             raise LoginError("抓取器未初始化，请先登录")
 
-        self._logger.info(f"获取文章: fakeid={fakeid}, count={count}")
+        if self.cache:
+            cached = self.cache.get(fakeid, count, begin, with_content)
+            if cached is not None:
+                return cached
 
-        if with_content:
-            return self._fetcher.fetch_with_content(fakeid, count)
-        else:
-            return self._fetcher.fetch(fakeid, count)
+        self._logger.info(f"获取文章: fakeid={fakeid}, count={count}")
 
-    def generate_json_feed(
-        self,
-        mp_name: str,
-        articles: list,
-        mp_intro: str = "",
-        base_url: str = "",
-        mp_cover: str = "",
-        full_text: bool = False,
-        feed_id: str = ""
-    ) -> str:
-        """生成 JSON Feed
+        fetch = fetcher.fetch_with_content if with_content else fetcher.fetch
+        articles = self._guarded(fakeid, fetch, fakeid, count, begin)
 
-        Args:
-            mp_name: 公众号名称
-            articles: 文章列表
-            mp_intro: 公众号简介
-            base_url: 基础URL
-            mp_cover: 公众号封面
-            full_text: 是否包含全文
-            feed_id: 公众号ID（可选）
+        if self.cache:
+            self.cache.set(fakeid, count, articles, begin, with_content)
 
-        Returns:
-            JSON Feed 字符串
-        """
-        self._logger.info(f"生成 JSON Feed: {mp_name}, 文章数: {len(articles)}")
-
-        generator = JSONFeedGenerator(
-            mp_name=mp_name,
-            mp_intro=mp_intro or mp_name,
-            base_url=base_url,
-            mp_cover=mp_cover
-        )
-
-        return generator.generate(articles, full_text, feed_id)
+        return articles
 
     def cleanup(self) -> None:
         """清理资源"""
@@ -152,6 +195,12 @@ class WeChatMP:
             self._fetcher.cleanup()
             self._fetcher = None
 
+        self._close_searcher()
+
+        if self._session is not None and self._owns_session:
+            self._session.close()
+            self._session = None
+
         if self._auth:
             self._auth.cleanup()
             self._auth = None
@@ -159,12 +208,13 @@ class WeChatMP:
         self._is_logged_in = False
         self._logger.info("资源已清理")
 
-    def search_feed(self, keyword: str, limit: int = 5) -> list:
+    def search_feed(self, keyword: str, limit: int = 5, refresh: bool = False) -> list:
         """搜索公众号
 
         Args:
             keyword: 公众号名称关键词
             limit: 返回结果数量，默认 5
+            refresh: 忽略搜索缓存，重新搜索
 
         Returns:
             公众号列表
@@ -179,20 +229,26 @@ class WeChatMP:
         if not self._auth:
             raise LoginError("认证器未初始化，请先登录")
 
+        if self.search_cache and not refresh:
+            cached = self.search_cache.get_search(keyword, limit)
+            if cached is not None:
+                return cached
+
         self._logger.info(f"搜索公众号: {keyword}")
 
-        searcher = FeedSearcher(
-            token=self._auth.token or "",  # type: ignore
-            cookies=self._auth.cookies
-        )
+        results = self._guarded("search", self._get_searcher().search_by_name, keyword, limit, refresh)
 
-        return searcher.search_by_name(keyword, limit)
+        if self.search_cache:
+            self.search_cache.set_search(keyword, limit, results)
 
-    def get_feed_fakeid(self, keyword: str) -> str:
+        return results
+
+    def get_feed_fakeid(self, keyword: str, refresh: bool = False) -> str:
         """获取公众号的 fakeid（便捷方法）
 
         Args:
             keyword: 公众号名称
+            refresh: 忽略搜索缓存，重新搜索
 
         Returns:
             fakeid，如果未找到返回空字符串
@@ -210,12 +266,8 @@ class WeChatMP:
         if not self._auth:
             raise LoginError("认证器未初始化，请先登录")
 
-        searcher = FeedSearcher(
-            token=self._auth.token or "",  # type: ignore
-            cookies=self._auth.cookies
-        )
-
-        result = searcher.get_first_match(keyword)
+        # 搜索缓存由搜索器读写（_get_searcher 创建时传入）
+        result = self._guarded("search", self._get_searcher().get_first_match, keyword, refresh)
         return result or ""
 
     def __enter__(self):
@@ -228,20 +280,62 @@ class WeChatMP:
 
     # 私有方法
 
-    def _load_credentials(self) -> None:
-        """加载已有凭证"""
-        import os
-        if not os.path.exists(self.token_file):
-            return
-
-        try:
-            self._auth = WeChatAuth(token_file=self.token_file)
-            if self._auth.load_credentials():
-                self._is_logged_in = True
-                self._fetcher = ArticleFetcher(
-                    token=self._auth.token,
-                    cookies=self._auth.cookies
+    def _guarded(self, key: str, func, *args):
+        """经熔断器调用（网络错误和抓取失败计入失败次数，Token 过期时清除凭证）
+
+        Args:
+            key: 熔断器键（fakeid 或 "search"）
+            func: 实际调用的函数
+            *args: 调用参数
+
+        Returns:
+            func 的返回值
+
+        Raises:
+            NetworkError: 熔断器处于打开状态
+        """
+        with self._circuit(key):
+            return func(*args)
+
+    def _get_searcher(self) -> FeedSearcher:
+        """获取搜索器（首次调用时创建，多个线程同时调用时只创建一个）"""
+        with self._lock:
+            if self._searcher is None:
+                self._searcher = FeedSearcher(
+                    token=self._auth.token or "",  # type: ignore
+                    cookies=self._auth.cookies,  # type: ignore
+                    session=self._get_session(),
+                    search_cache=self.search_cache
                 )
-                self._logger.info("已加载保存的登录凭证")
-        except Exception as e:
-            self._logger.warning(f"加载凭证失败: {e}")
+            return self._searcher
+
+    def _get_session(self) -> "requests.Session":
+        """获取 HTTP 会话（首次调用时创建；重新登录后搜索器重建，但连接池保留）"""
+        with self._lock:
+            if self._session is None:
+                self._session = create_session()
+            return self._session
+
+    def _close_searcher(self) -> None:
+        """释放搜索器（HTTP 会话由 WeChatMP 持有，不在这里关闭）
+
+        其他线程已经取得的搜索器仍可完成正在进行的搜索，之后的调用创建新的搜索器
+        """
+        with self._lock:
+            searcher, self._searcher = self._searcher, None
+        if searcher:
+            searcher.close()
+
+    def _create_clients(self) -> None:
+        """凭证加载成功后创建文章抓取器"""
+        self._fetcher = ArticleFetcher(
+            token=self._auth.token,
+            cookies=self._auth.cookies,
+            session=self._get_session(),
+            # 凭证来自内存字典时不读写文件
+            storage_state=self._auth.state_file if self._token_store is None else None
+        )
+
+    def _release_clients(self) -> None:
+        """凭证失效时释放搜索器，重新登录后用新 Token 重建"""
+        self._close_searcher()
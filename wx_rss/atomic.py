@@ -0,0 +1,54 @@
+"""
+原子写入模块
+
+先写同目录下的临时文件再替换目标文件，中途出错时保留原文件，不留下半个文件
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+# 新文件的权限（与 open() 在常见 umask 下创建的文件一致；mkstemp 默认只有 0o600）
+_FILE_MODE = 0o644
+
+
+@contextmanager
+def atomic_open(path: str, mode: int = _FILE_MODE) -> Iterator[BinaryIO]:
+    """以二进制模式打开临时文件，代码块正常结束后替换 path
+
+    临时文件名由 tempfile.mkstemp 生成，多个线程或进程同时写同一个文件时互不干扰；
+    代码块抛出异常时删除临时文件，path 保持原样
+
+    Args:
+        path: 目标文件路径
+        mode: 文件权限
+
+    Yields:
+        二进制文件对象
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write(path: str, data: bytes, mode: int = _FILE_MODE) -> None:
+    """原子地写入字节串
+
+    Args:
+        path: 目标文件路径
+        data: 文件内容
+        mode: 文件权限
+    """
+    with atomic_open(path, mode) as f:
+        f.write(data)
@@ -0,0 +1,120 @@
+"""
+批量执行模块
+
+逐项执行批量任务，单项失败时记录错误并继续处理其余项，同时记录每项耗时
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from .logger import get_logger
+
+_logger = get_logger("wx_rss.batch")
+
+
+class BatchResult:
+    """批量执行结果
+
+    Attributes:
+        successes: 成功项列表，元素为 (item, 返回值)，按输入顺序排列
+        failures: 失败项列表，元素为 (item, 异常)，按输入顺序排列
+        durations: 每项耗时（秒），按输入顺序排列
+    """
+
+    def __init__(self):
+        self.successes: List[Tuple[Any, Any]] = []
+        self.failures: List[Tuple[Any, BaseException]] = []
+        self.durations: List[float] = []
+
+    def _add(self, item: Any, value: Any, error: Optional[BaseException], duration: float) -> None:
+        """记录一项的执行结果"""
+        if error is None:
+            self.successes.append((item, value))
+        else:
+            self.failures.append((item, error))
+        self.durations.append(duration)
+
+
+def run_batch(
+    items: Iterable[Any],
+    fn: Callable[[Any], Any],
+    on_error: Optional[Callable[[Any, Exception], None]] = None
+) -> BatchResult:
+    """逐项执行 fn，单项失败不影响其余项
+
+    Args:
+        items: 待处理项
+        fn: 处理单项的函数
+        on_error: 单项失败时的回调 on_error(item, error)，在回调中抛出异常可中止整个批次
+
+    Returns:
+        BatchResult
+
+    Example:
+        >>> result = run_batch(feeds, lambda f: mp.fetch_articles(fakeid=f["fakeid"], count=5))
+        >>> for feed, error in result.failures:
+        ...     print(feed["name"], error)
+    """
+    result = BatchResult()
+
+    for item in items:
+        start = time.perf_counter()
+        try:
+            value = fn(item)
+        except Exception as e:
+            result._add(item, None, e, time.perf_counter() - start)
+            _logger.debug("批量任务失败: %r, %s", item, e)
+            if on_error:
+                on_error(item, e)
+        else:
+            result._add(item, value, None, time.perf_counter() - start)
+
+    return result
+
+
+async def run_batch_async(
+    items: Iterable[Any],
+    fn: Callable[[Any], Awaitable[Any]],
+    on_error: Optional[Callable[[Any, Exception], None]] = None
+) -> BatchResult:
+    """并发执行协程函数 fn，单项失败不影响其余项
+
+    并发数由 fn 内部控制（例如 AsyncWeChatMP 的 concurrency），结果按输入顺序排列
+
+    Args:
+        items: 待处理项
+        fn: 处理单项的协程函数
+        on_error: 单项失败时的回调 on_error(item, error)，在回调中抛出异常会取消其余任务并中止整个批次
+
+    Returns:
+        BatchResult
+
+    Example:
+        >>> result = await run_batch_async(feeds, lambda f: mp.fetch_articles(fakeid=f["fakeid"], count=5))
+    """
+    items = list(items)
+
+    async def run_one(item):
+        start = time.perf_counter()
+        try:
+            value = await fn(item)
+        except Exception as e:
+            _logger.debug("批量任务失败: %r, %s", item, e)
+            if on_error:
+                on_error(item, e)
+            return None, e, time.perf_counter() - start
+        return value, None, time.perf_counter() - start
+
+    tasks = [asyncio.ensure_future(run_one(item)) for item in items]
+    try:
+        outcomes = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    result = BatchResult()
+    for item, (value, error, duration) in zip(items, outcomes):
+        result._add(item, value, error, duration)
+    return result
@@ -0,0 +1,251 @@
+"""
+缓存模块
+
+- ArticleCache: 将文章列表按 (fakeid, begin, count) 缓存到磁盘，重复运行时跳过网络请求
+- SearchCache: 将公众号搜索结果缓存到单个 JSON 文件，避免每次运行都重新搜索
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .atomic import atomic_write
+from .logger import get_logger
+from .search import _normalize
+
+
+class ArticleCache:
+    """文章列表磁盘缓存（带过期时间）"""
+
+    def __init__(self, cache_dir: str = ".wx_cache", ttl: int = 600):
+        """初始化
+
+        Args:
+            cache_dir: 缓存目录
+            ttl: 缓存有效期（秒）
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self._logger = get_logger("wx_rss.cache")
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(
+        self,
+        fakeid: str,
+        count: int,
+        begin: int = 0,
+        with_content: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
+        """读取缓存
+
+        Args:
+            fakeid: 公众号 fake_id
+            count: 获取数量
+            begin: 起始位置
+            with_content: 是否包含正文内容
+
+        Returns:
+            文章列表，未命中或已过期返回 None
+        """
+        path = self._path(fakeid, count, begin, with_content)
+
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        try:
+            articles = orjson.loads(data) if orjson else json.loads(data)
+        except ValueError as e:
+            self._logger.warning("缓存文件损坏，已忽略: %s, %s", path, e)
+            return None
+
+        self._logger.debug("命中缓存: fakeid=%s, begin=%s, count=%s", fakeid, begin, count)
+        return articles
+
+    def set(
+        self,
+        fakeid: str,
+        count: int,
+        articles: List[Dict[str, Any]],
+        begin: int = 0,
+        with_content: bool = False
+    ) -> None:
+        """写入缓存
+
+        Args:
+            fakeid: 公众号 fake_id
+            count: 获取数量
+            articles: 文章列表
+            begin: 起始位置
+            with_content: 是否包含正文内容
+        """
+        path = self._path(fakeid, count, begin, with_content)
+
+        if orjson:
+            data = orjson.dumps(articles)
+        else:
+            data = json.dumps(articles, ensure_ascii=False).encode("utf-8")
+
+        # 先写临时文件再替换，避免并发读到半个文件
+        atomic_write(path, data)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    # 私有方法
+
+    def _path(self, fakeid: str, count: int, begin: int, with_content: bool) -> str:
+        """根据请求参数计算缓存文件路径"""
+        raw = f"{fakeid}:{begin}:{count}:{int(with_content)}".encode("utf-8")
+        key = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+
+class SearchCache:
+    """公众号搜索结果缓存（单个 JSON 文件，按最近使用淘汰）
+
+    关键词去掉首尾空白、忽略大小写后作为键；读写在锁内完成，多个线程可共用同一个实例
+    """
+
+    # fakeid 基本不会变化，搜索结果列表（简介、头像等）变化相对频繁
+    FAKEID_TTL = 30 * 24 * 3600
+    SEARCH_TTL = 24 * 3600
+
+    def __init__(self, cache_file: str = "wx_feed_cache.json", max_entries: int = 1000):
+        """初始化
+
+        Args:
+            cache_file: 缓存文件路径
+            max_entries: 最多保留的条目数
+        """
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self._entries: Optional[OrderedDict] = None
+        self._lock = threading.Lock()
+        self._logger = get_logger("wx_rss.cache")
+
+    def get_fakeid(self, keyword: str) -> Optional[str]:
+        """读取关键词对应的 fakeid
+
+        Args:
+            keyword: 公众号名称
+
+        Returns:
+            fakeid，未命中或已过期返回 None
+        """
+        return self._get(f"fakeid:{_normalize(keyword)}", self.FAKEID_TTL)
+
+    def set_fakeid(self, keyword: str, fakeid: str) -> None:
+        """写入关键词对应的 fakeid
+
+        Args:
+            keyword: 公众号名称
+            fakeid: 公众号 fake_id
+        """
+        self._set(f"fakeid:{_normalize(keyword)}", fakeid)
+
+    def get_search(self, keyword: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """读取搜索结果
+
+        Args:
+            keyword: 公众号名称关键词
+            limit: 返回结果数量
+
+        Returns:
+            公众号列表（副本，调用方修改不影响缓存），未命中或已过期返回 None
+        """
+        results = self._get(f"search:{_normalize(keyword)}:{limit}", self.SEARCH_TTL)
+        if results is None:
+            return None
+        return [dict(result) for result in results]
+
+    def set_search(self, keyword: str, limit: int, results: List[Dict[str, Any]]) -> None:
+        """写入搜索结果
+
+        Args:
+            keyword: 公众号名称关键词
+            limit: 返回结果数量
+            results: 公众号列表（保存副本，之后修改列表不影响缓存）
+        """
+        self._set(f"search:{_normalize(keyword)}:{limit}", [dict(result) for result in results])
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries = OrderedDict()
+            if os.path.exists(self.cache_file):
+                os.remove(self.cache_file)
+
+    # 私有方法
+
+    def _get(self, key: str, ttl: int) -> Any:
+        """读取缓存项（命中时移到最近使用的位置）"""
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None:
+                return None
+
+            if time.time() - entry["cached_at"] > ttl:
+                del entries[key]
+                return None
+
+            entries.move_to_end(key)
+        self._logger.debug("命中搜索缓存: %s", key)
+        return entry["value"]
+
+    def _set(self, key: str, value: Any) -> None:
+        """写入缓存项并保存到文件（序列化和写入都在锁内，其他线程不会在中途修改条目）"""
+        with self._lock:
+            entries = self._load()
+            entries[key] = {"value": value, "cached_at": int(time.time())}
+            entries.move_to_end(key)
+
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+            self._save()
+
+    def _load(self) -> OrderedDict:
+        """加载缓存文件（只在第一次访问时读取，调用方持有 _lock）"""
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = OrderedDict()
+        try:
+            with open(self.cache_file, "rb") as f:
+                data = f.read()
+            self._entries.update(orjson.loads(data) if orjson else json.loads(data))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self._logger.warning("加载搜索缓存失败，已忽略: %s", e)
+
+        return self._entries
+
+    def _save(self) -> None:
+        """保存缓存文件（先写临时文件再替换，调用方持有 _lock）"""
+        if orjson:
+            data = orjson.dumps(self._entries)
+        else:
+            data = json.dumps(self._entries, ensure_ascii=False).encode("utf-8")
+
+        atomic_write(self.cache_file, data)
@@ -0,0 +1,85 @@
+"""
+熔断器模块
+
+连续失败达到阈值后熔断，在恢复时间内直接失败，不再发出请求
+"""
+
+import threading
+import time
+
+from .logger import get_logger
+from .exceptions import NetworkError
+
+
+class CircuitBreaker:
+    """熔断器（关闭 → 打开 → 半开）
+
+    连续失败 fail_max 次后进入打开状态，reset_timeout 秒内的调用直接抛出
+    NetworkError；超时后放行一次试探请求，成功则关闭，失败则重新打开。
+    同步和异步调用方共用同一套状态；状态切换在锁内完成（锁内不涉及 await），
+    多个线程共用同一个熔断器时计数不会丢失，半开时也只放行一次试探请求
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str = "", fail_max: int = 5, reset_timeout: float = 60):
+        """初始化
+
+        Args:
+            name: 名称（用于日志和错误信息）
+            fail_max: 连续失败多少次后熔断
+            reset_timeout: 熔断持续时间（秒）
+        """
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+        self._lock = threading.Lock()
+        self._logger = get_logger("wx_rss.circuit")
+
+    @property
+    def state(self) -> str:
+        """当前状态"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def before_call(self) -> None:
+        """调用前检查
+
+        Raises:
+            NetworkError: 熔断器处于打开状态
+        """
+        with self._lock:
+            state = self.state
+            if state == self.OPEN:
+                raise NetworkError(f"circuit open: {self.name}")
+
+            if state == self.HALF_OPEN:
+                # 只放行一次试探请求，其余调用在结果返回前继续直接失败
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._logger.info(f"熔断器半开，放行试探请求: {self.name}")
+
+    def record_success(self) -> None:
+        """记录一次成功"""
+        with self._lock:
+            if self._state != self.CLOSED:
+                self._logger.info(f"熔断器关闭: {self.name}")
+            self._failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """记录一次失败"""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.OPEN or self._failures >= self.fail_max:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._logger.warning(
+                    f"熔断器打开: {self.name}（连续失败 {self._failures} 次，{self.reset_timeout} 秒后重试）"
+                )
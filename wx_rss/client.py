@@ -0,0 +1,207 @@
+"""
+客户端公共逻辑模块
+
+同步的 WeChatMP 和异步的 AsyncWeChatMP 共用的凭证加载、熔断和 JSON Feed 生成
+"""
+
+import os
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+
+from .login import WeChatAuth
+from .json_feed import JSONFeedGenerator
+from .circuit import CircuitBreaker
+from .exceptions import NetworkError, FetchError, TokenExpiredError
+
+
+class WeChatMPBase(ABC):
+    """WeChatMP 与 AsyncWeChatMP 的公共基类
+
+    子类在 __init__ 中设置 token_file、_token_store、_auth、_breakers、
+    _logger、_is_logged_in、_lock（threading.RLock，保护熔断器表和凭证状态，
+    多个线程可共用同一个客户端），并实现 _create_clients
+    """
+
+    # 熔断：同一公众号（或搜索接口）连续失败 5 次后，60 秒内直接失败
+    CIRCUIT_FAIL_MAX = 5
+    CIRCUIT_RESET_TIMEOUT = 60
+
+    def generate_json_feed(
+        self,
+        mp_name: str,
+        articles: list,
+        mp_intro: str = "",
+        base_url: str = "",
+        mp_cover: str = "",
+        full_text: bool = False,
+        feed_id: str = ""
+    ) -> str:
+        """生成 JSON Feed
+
+        Args:
+            mp_name: 公众号名称
+            articles: 文章列表
+            mp_intro: 公众号简介
+            base_url: 基础URL
+            mp_cover: 公众号封面
+            full_text: 是否包含全文
+            feed_id: 公众号ID（可选）
+
+        Returns:
+            JSON Feed 字符串
+        """
+        self._logger.info(f"生成 JSON Feed: {mp_name}, 文章数: {len(articles)}")
+
+        generator = self._json_feed_generator(mp_name, mp_intro, base_url, mp_cover)
+        return generator.generate(articles, full_text, feed_id)
+
+    def dump_json_feed(
+        self,
+        fp: BinaryIO,
+        mp_name: str,
+        articles: list,
+        mp_intro: str = "",
+        base_url: str = "",
+        mp_cover: str = "",
+        full_text: bool = False,
+        feed_id: str = ""
+    ) -> None:
+        """生成 JSON Feed 并逐条写入文件（不构造完整的 JSON 字符串）
+
+        Args:
+            fp: 以二进制模式打开的文件对象
+            mp_name: 公众号名称
+            articles: 文章列表
+            mp_intro: 公众号简介
+            base_url: 基础URL
+            mp_cover: 公众号封面
+            full_text: 是否包含全文
+            feed_id: 公众号ID（可选）
+        """
+        self._logger.info(f"生成 JSON Feed: {mp_name}, 文章数: {len(articles)}")
+
+        generator = self._json_feed_generator(mp_name, mp_intro, base_url, mp_cover)
+        generator.dump(articles, fp, full_text, feed_id)
+
+    def generate_json_feed_obj(
+        self,
+        mp_name: str,
+        articles: list,
+        mp_intro: str = "",
+        base_url: str = "",
+        mp_cover: str = "",
+        full_text: bool = False,
+        feed_id: str = ""
+    ) -> dict:
+        """生成 JSON Feed 字典（不做序列化，可配合 dump_feed 写入文件）
+
+        Args:
+            mp_name: 公众号名称
+            articles: 文章列表
+            mp_intro: 公众号简介
+            base_url: 基础URL
+            mp_cover: 公众号封面
+            full_text: 是否包含全文
+            feed_id: 公众号ID（可选）
+
+        Returns:
+            JSON Feed 字典
+        """
+        self._logger.info(f"生成 JSON Feed: {mp_name}, 文章数: {len(articles)}")
+
+        generator = self._json_feed_generator(mp_name, mp_intro, base_url, mp_cover)
+        return generator.build(articles, full_text, feed_id)
+
+    # 私有方法
+
+    @contextmanager
+    def _circuit(self, key: str) -> Iterator[None]:
+        """经熔断器执行代码块（网络错误和抓取失败计入失败次数，Token 过期时清除凭证）
+
+        同步和异步调用方都用普通的 with 语句包住实际调用
+
+        Args:
+            key: 熔断器键（fakeid 或 "search"）
+
+        Raises:
+            NetworkError: 熔断器处于打开状态
+        """
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(
+                    name=key,
+                    fail_max=self.CIRCUIT_FAIL_MAX,
+                    reset_timeout=self.CIRCUIT_RESET_TIMEOUT
+                )
+
+        breaker.before_call()
+        try:
+            yield
+        except TokenExpiredError:
+            self._invalidate_credentials()
+            raise
+        except (NetworkError, FetchError):
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+
+    def _invalidate_credentials(self) -> None:
+        """Token 过期：标记为未登录并清除凭证，后续调用直接失败，不再发出请求
+
+        多个线程同时遇到 Token 过期时只清除一次
+        """
+        with self._lock:
+            if not self._is_logged_in:
+                return
+
+            self._logger.warning("Token 已过期，已清除凭证，请重新登录")
+            self._is_logged_in = False
+            self._release_clients()
+            if self._token_store is not None:
+                self._token_store.clear()
+            elif self._auth:
+                self._auth.clear_credentials()
+
+    def _json_feed_generator(
+        self,
+        mp_name: str,
+        mp_intro: str,
+        base_url: str,
+        mp_cover: str
+    ) -> JSONFeedGenerator:
+        """创建 JSON Feed 生成器"""
+        return JSONFeedGenerator(
+            mp_name=mp_name,
+            mp_intro=mp_intro or mp_name,
+            base_url=base_url,
+            mp_cover=mp_cover
+        )
+
+    def _load_credentials(self) -> None:
+        """加载已有凭证，成功后调用 _create_clients"""
+        if self._token_store is None and not os.path.exists(self.token_file):
+            return
+
+        try:
+            self._auth = WeChatAuth(token_file=self.token_file)
+            if self._token_store is not None:
+                self._auth.set_credentials(self._token_store)
+                loaded = bool(self._auth.token)
+            else:
+                loaded = self._auth.load_credentials()
+
+            if loaded:
+                self._is_logged_in = True
+                self._create_clients()
+                self._logger.info("已加载保存的登录凭证")
+        except Exception as e:
+            self._logger.warning(f"加载凭证失败: {e}")
+
+    @abstractmethod
+    def _create_clients(self) -> None:
+        """凭证加载成功后创建抓取器等依赖凭证的对象（由子类实现）"""
+
+    def _release_clients(self) -> None:
+        """凭证失效时释放依赖凭证的对象（默认无需释放）"""
@@ -4,6 +4,8 @@
 定义 wx-mp-rss-core 库的所有异常类型
 """
 
+from typing import Optional
+
 
 class WXMPRSSError(Exception):
     """基础异常类
@@ -34,8 +36,19 @@ class NetworkError(WXMPRSSError):
 
 
 class RateLimitError(WXMPRSSError):
-    """频率限制"""
-    pass
+    """频率限制
+
+    Attributes:
+        retry_after: 服务端建议的重试等待时间（秒），未知时为 None
+    """
+
+    def __init__(self, message: str = "", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    def __reduce__(self):
+        """pickle 时保留 retry_after（跨进程传递异常时使用）"""
+        return type(self), (*self.args, self.retry_after)
 
 
 class TokenExpiredError(WXMPRSSError):
@@ -1,35 +1,117 @@
 """
 文章抓取模块
 
-提供微信公众号文��抓取功能，基于 Playwright + BeautifulSoup 混合架构
+提供微信公众号文章抓取功能：文章列表直接请求 JSON API，正文用 Playwright 渲染后交给 BeautifulSoup 解析
 """
 
+import os
 import time
 import re
 import json
-from typing import List, Dict, Any, Optional, Union
+import logging
+from functools import lru_cache
+from html import unescape
+from urllib.parse import parse_qs, urlencode, urlsplit
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple, Union
 
 try:
-    from playwright.sync_api import sync_playwright, Browser, Page
-    from bs4 import BeautifulSoup
+    import orjson
 except ImportError:
-    raise ImportError(
-        "依赖未安装，请运行: pip install playwright beautifulsoup4 && python -m playwright install firefox"
-    )
+    orjson = None
+
+# Playwright 和 BeautifulSoup 导入较慢，只在真正用到时导入
+if TYPE_CHECKING:
+    import requests
+    from bs4 import BeautifulSoup
+    from playwright.sync_api import Browser, Page
 
 from .logger import get_logger
-from .exceptions import FetchError, NetworkError, RateLimitError, TokenExpiredError
+from .search import create_session
+from .exceptions import BrowserError, FetchError, NetworkError, RateLimitError, TokenExpiredError
+
+
+# 抓取正文时的浏览器配置
+_FIREFOX_PREFS = {
+    "permissions.default.image": 2,  # 不加载图片
+    "media.autoplay.default": 5,  # 禁止自动播放
+}
+_CHROMIUM_ARGS = [
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--blink-settings=imagesEnabled=false",
+]
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
+# 文章页异常提示（环境异常、已删除、审核中），与 _check_page_text 检查的文本一致
+_PAGE_WARNING_SELECTOR = "text=/当前环境异常|该内容已被发布者删除|内容审核中/"
+
+
+def _block_resources(route) -> None:
+    """拦截正文提取用不到的资源请求"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """解析 JSON（orjson 可直接解析 bytes，未安装时退回标准库）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=1)
+def _html_parser() -> str:
+    """选择 HTML 解析器：优先使用 C 实现的 lxml，未安装时退回标准库的 html.parser"""
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return "html.parser"
+    return "lxml"
+
+
+def _parse_html(html: str) -> "BeautifulSoup":
+    """解析 HTML（首次调用时导入 BeautifulSoup）"""
+    try:
+        from bs4 import BeautifulSoup
+    except ImportError:
+        raise ImportError("依赖未安装，请运行: pip install beautifulsoup4")
+
+    return BeautifulSoup(html, _html_parser())
 
 
 class ArticleFetcher:
-    """文章抓取类（Playwright + BeautifulSoup 混合架构）"""
+    """文章抓取类
+
+    文章列表是纯 JSON 接口，通过 HTTP 会话直接请求；只有获取正文时才启动浏览器
+    """
+
+    API_URL = "https://mp.weixin.qq.com/cgi-bin/appmsgpublish"
+    TIMEOUT = 30
+    # 正文同时加载的标签页数（同一浏览器上下文，共享 Cookie）
+    CONTENT_PAGES = 4
+    # 正文页面导航超时、等待 #js_content 出现的超时（毫秒）
+    CONTENT_TIMEOUT = 10000
+    CONTENT_SELECTOR_TIMEOUT = 8000
+    # 每批正文之间的间隔（秒），避免连续请求触发"当前环境异常"
+    CONTENT_BATCH_DELAY = 1
+    # 出现"当前环境异常"（请求过快）时暂停的时间（秒）
+    RATE_LIMIT_PAUSE = 5
+    USER_AGENT = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
 
     def __init__(
         self,
         token: str,
         cookies: Dict[str, str],
         headless: bool = True,
-        browser_type: str = "firefox"
+        browser_type: str = "firefox",
+        session: Optional["requests.Session"] = None,
+        storage_state: Optional[str] = None
     ):
         """初始化
 
@@ -38,13 +120,28 @@ class ArticleFetcher:
             cookies: Cookie 字典
             headless: 是否无头模式（默认 True）
             browser_type: 浏览器类型（firefox/chromium）
+            session: 外部传入的 HTTP 会话（可选），由调用方负责关闭
+            storage_state: 登录时保存的浏览器状态文件（可选），存在时启动浏览器直接载入，不再逐个添加 Cookie
         """
         self.token = token
         self.cookies = cookies
         self.headless = headless
         self.browser_type = browser_type
-        self._browser: Optional[Browser] = None
-        self._page: Optional[Page] = None
+        self._session = session
+        self._owns_session = session is None
+        self.storage_state = storage_state
+        # 每次请求都相同的查询参数和请求头，只构造一次
+        self._static_query = urlencode({
+            "sub": "list",
+            "sub_action": "list_ex",  # 重要：使用 list_ex 获取文章列表
+            "token": token,
+            "lang": "zh_CN",
+            "f": "json",
+            "ajax": 1  # 数字，不是字符串
+        })
+        self._headers = {"User-Agent": self.USER_AGENT, "Referer": "https://mp.weixin.qq.com/"}
+        self._browser: Optional["Browser"] = None
+        self._page: Optional["Page"] = None
         self._playwright = None
         self._logger = get_logger("wx_rss.fetcher")
 
@@ -71,40 +168,32 @@ class ArticleFetcher:
         """
         self._logger.info(f"开始获取文章列表: fakeid={fakeid}, count={count}")
 
+        from requests import RequestException
+
         try:
-            # 启动浏览器
-            self._start_browser()
-
-            # 构造文章列表 API URL（参考 we-mp-rss 实现）
-            api_url = f"https://mp.weixin.qq.com/cgi-bin/appmsgpublish"
-            params = {
-                "sub": "list",
-                "sub_action": "list_ex",  # 重要：使用 list_ex 获取文章列表
-                "begin": begin,
-                "count": count,
-                "fakeid": fakeid,
-                "token": self.token,
-                "lang": "zh_CN",
-                "f": "json",
-                "ajax": 1  # 数字，不是字符串
-            }
+            # 文章列表 API 参数（参考 we-mp-rss 实现），只需编码每次变化的部分
+            query = urlencode({"begin": begin, "count": count, "fakeid": fakeid})
+            url = f"{self.API_URL}?{self._static_query}&{query}"
 
             # 访问 API
-            self._logger.debug(f"访问 API: {api_url}")
-            response = self._page.goto(f"{api_url}?{self._build_query_string(params)}")
+            self._logger.debug("访问 API: %s", self.API_URL)
+            response = self._get_session().get(
+                url,
+                headers=self._headers,
+                cookies=self.cookies,
+                timeout=self.TIMEOUT
+            )
 
             # 检查响应
             if not response.ok:
-                raise NetworkError(f"HTTP {response.status}: {response.status_text}")
+                raise NetworkError(f"HTTP {response.status_code}: {response.reason}")
 
-            # 检查是否需要重新登录
-            current_url = self._page.url
-            if "login" in current_url.lower():
+            # 检查是否需要重新登录（被重定向到登录页）
+            if "login" in response.url.lower():
                 raise TokenExpiredError("Token 已过期，请重新登录")
 
             # 解析响应
-            content = self._page.content()
-            articles = self._parse_response(content)  # type: ignore
+            articles = self.parse_response(response.content)
 
             self._logger.info(f"成功获取 {len(articles)} 篇文章")
             return articles
@@ -113,6 +202,9 @@ class ArticleFetcher:
             raise
         except NetworkError:
             raise
+        except RequestException as e:
+            self._logger.error(f"获取文章失败: {e}")
+            raise NetworkError(f"获取文章失败: {e}") from e
         except Exception as e:
             self._logger.error(f"获取文章失败: {e}")
             raise FetchError(f"获取文章失败: {e}") from e
@@ -137,22 +229,109 @@ class ArticleFetcher:
 
         # 先获取文章列表
         articles = self.fetch(fakeid, count, begin)
+        if not articles:
+            return articles
 
-        # 获取每篇文章的正文
-        for i, article in enumerate(articles):
-            try:
-                self._logger.info(f"正在获取第 {i+1}/{len(articles)} 篇文章的正文")
-                content = self._fetch_article_content(article["url"])
-                article["content"] = content
-                time.sleep(1)  # 避免请求过快
-            except Exception as e:
-                self._logger.warning(f"获取文章正文失败: {article['title']}, {e}")
-                article["content"] = ""
+        # 正文需要渲染页面，这时才启动浏览器
+        self._start_browser()
+
+        # 在同一上下文中打开多个标签页，每批文章同时开始加载，再逐个等待并提取正文
+        pages = [self._page] + [
+            self._page.context.new_page()
+            for _ in range(min(self.CONTENT_PAGES, len(articles)) - 1)
+        ]
+        try:
+            for start in range(0, len(articles), len(pages)):
+                batch = articles[start:start + len(pages)]
+                self._logger.info(
+                    f"正在获取第 {start + 1}-{start + len(batch)}/{len(articles)} 篇文章的正文"
+                )
+                if self._fetch_content_batch(list(zip(pages, batch))):
+                    time.sleep(self.RATE_LIMIT_PAUSE)
+                elif start + len(batch) < len(articles):
+                    time.sleep(self.CONTENT_BATCH_DELAY)
+        finally:
+            for page in pages[1:]:
+                try:
+                    page.close()
+                except Exception:
+                    pass
 
         return articles
 
+    def parse_response(self, content: Union[bytes, str]) -> List[Dict[str, Any]]:
+        """解析 API 响应
+
+        HTTP 接口直接返回 JSON，bytes 不解码直接解析；
+        浏览器渲染的页面会把 JSON 包装在 <pre> 或 <body> 中，先取出再解析
+
+        Args:
+            content: 响应内容
+
+        Returns:
+            文章列表
+
+        Raises:
+            FetchError: 解析失败或 API 返回错误
+        """
+        # 记录原始响应用于调试
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("响应内容（前200字符）: %r", content[:200])
+
+        try:
+            if content.lstrip()[:1] in (b"<", "<"):
+                if isinstance(content, bytes):
+                    content = content.decode("utf-8")
+
+                # 处理 HTML 包装的 JSON（Firefox 会将 JSON 包装在 <pre> 标签中）
+                # 序列化后的页面中 &、<、> 已被转义为实体，需要还原后再解析 JSON
+                match = re.search(r"<pre[^>]*>(.*?)</pre>", content, re.DOTALL)
+                if match:
+                    content = unescape(match.group(1))
+                else:
+                    # 尝试提取 body 内容
+                    match = re.search(r"<body[^>]*>(.*?)</body>", content, re.DOTALL)
+                    if match:
+                        content = unescape(match.group(1).strip())
+
+            data = _loads(content)
+        except ValueError as e:
+            self._logger.error(f"JSON 解析失败: {e}")
+            self._logger.error(f"响应内容: {content[:500]!r}")
+            raise FetchError(f"JSON 解析失败: {e}") from e
+
+        return self._parse_response_dict(data)
+
+    def extract_content(self, html: str) -> str:
+        """从文章页面 HTML 中提取正文
+
+        Args:
+            html: 文章页面 HTML
+
+        Returns:
+            正文 HTML
+
+        Raises:
+            FetchError: 页面异常（环境异常、已删除、审核中）
+        """
+        soup = _parse_html(html)
+
+        # 检查异常情况
+        self._check_page_text(soup.get_text())
+
+        # 提取正文
+        content_elem = soup.select_one("#js_content")
+        if content_elem:
+            return str(content_elem)
+
+        return ""
+
     def cleanup(self) -> None:
-        """清理浏览器资源"""
+        """清理浏览器资源和 HTTP 会话（外部传入的会话不关闭）"""
+        if self._session is not None and self._owns_session:
+            self._session.close()
+        self._session = None
+
         if self._page:
             try:
                 self._page.close()
@@ -187,29 +366,53 @@ class ArticleFetcher:
     def _start_browser(self) -> None:
         """启动浏览器"""
         if self._browser is None:
+            try:
+                from playwright.sync_api import sync_playwright
+            except ImportError:
+                raise BrowserError(
+                    "Playwright 未安装，请运行: pip install playwright && python -m playwright install firefox"
+                )
+
             self._logger.info("正在启动浏览器...")
             self._playwright = sync_playwright().start()
 
+            # 只需要正文 HTML：关闭图片、自动播放、GPU 等用不到的功能
             if self.browser_type == "firefox":
-                self._browser = self._playwright.firefox.launch(headless=self.headless)
+                self._browser = self._playwright.firefox.launch(
+                    headless=self.headless,
+                    firefox_user_prefs=_FIREFOX_PREFS
+                )
             elif self.browser_type == "chromium":
-                self._browser = self._playwright.chromium.launch(headless=self.headless)
+                self._browser = self._playwright.chromium.launch(
+                    headless=self.headless,
+                    args=_CHROMIUM_ARGS
+                )
             else:
                 raise ValueError(f"不支持的浏览器类型: {self.browser_type}")
 
-            self._page = self._browser.new_page()
+            # 有登录时保存的浏览器状态时直接载入，否则逐个添加 Cookies
+            if self.storage_state and os.path.exists(self.storage_state):
+                context = self._browser.new_context(storage_state=self.storage_state)
+            else:
+                context = self._browser.new_context()
+                context.add_cookies([
+                    {"name": name, "value": value, "domain": ".weixin.qq.com", "path": "/"}
+                    for name, value in self.cookies.items()
+                ])
+
+            # 图片、字体、媒体、样式表不参与正文提取，直接拦截（对同一上下文中的所有标签页生效）
+            context.route("**/*", _block_resources)
 
-            # 添加 Cookies
-            self._page.context.add_cookies([
-                {"name": name, "value": value, "domain": ".weixin.qq.com", "path": "/"}
-                for name, value in self.cookies.items()
-            ])
+            self._page = context.new_page()
 
             self._logger.info(f"浏览器启动成功（{self.browser_type}）")
 
-    def _build_query_string(self, params: Dict[str, Any]) -> str:
-        """构建查询字符串"""
-        return "&".join([f"{k}={v}" for k, v in params.items()])
+    def _get_session(self) -> "requests.Session":
+        """获取 HTTP 会话（首次调用时创建，多次请求复用同一个连接池）"""
+        if self._session is None:
+            self._session = create_session()
+            self._owns_session = True
+        return self._session
 
     def _extract_article_id(self, url: str) -> str:
         """从文章 URL 中提取文章 ID
@@ -220,49 +423,30 @@ class ArticleFetcher:
         Returns:
             文章 ID
         """
-        try:
-            # 从 URL 中提取最后一部分作为 ID
-            # 例如：https://mp.weixin.qq.com/s/abc123 -> abc123
-            import re
-            match = re.search(r"/([^/]+)$", url)
-            if match:
-                return match.group(1)
-            return ""
-        except Exception:
-            return ""
+        # 长链接（/s?__biz=...&mid=...&idx=...）由 __biz、mid、idx 确定一篇文章
+        # 例如：https://mp.weixin.qq.com/s?__biz=MzA=&mid=2650&idx=1&sn=... -> MzA=_2650_1
+        query = parse_qs(urlsplit(unescape(url)).query)
+        if "mid" in query:
+            return "_".join(query[key][0] for key in ("__biz", "mid", "idx") if key in query)
+
+        # 短链接取最后一个 "/" 之后的部分
+        # 例如：https://mp.weixin.qq.com/s/abc123 -> abc123
+        _, sep, tail = url.rpartition("/")
+        return tail if sep else ""
 
-    def _parse_response(self, content: Union[bytes, str]) -> List[Dict[str, Any]]:
-        """解析 API 响应（参考 we-mp-rss 实现）
+    def _parse_response_dict(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """解析已解码的 API 响应（参考 we-mp-rss 实现）
 
         Args:
-            content: 响应内容
+            data: 响应 JSON
 
         Returns:
             文章列表
+
+        Raises:
+            FetchError: 解析失败或 API 返回错误
         """
         try:
-            import json
-            import re
-            # 兼容 bytes 和 str
-            if isinstance(content, bytes):
-                content = content.decode("utf-8")
-
-            # 记录原始响应用于调试
-            self._logger.debug(f"响应内容（前200字符）: {content[:200]}")
-
-            # 处理 HTML 包装的 JSON（Firefox 会将 JSON 包装在 <pre> 标签中）
-            if content.strip().startswith("<"):
-                match = re.search(r"<pre[^>]*>(.*?)</pre>", content, re.DOTALL)
-                if match:
-                    content = match.group(1)
-                else:
-                    # 尝试提取 body 内容
-                    match = re.search(r"<body[^>]*>(.*?)</body>", content, re.DOTALL)
-                    if match:
-                        content = match.group(1).strip()
-
-            data = json.loads(content)
-            
             # 检查 base_resp 错误（如 invalid args）
             if "base_resp" in data:
                 base_resp = data["base_resp"]
@@ -278,7 +462,7 @@ class ArticleFetcher:
             # 解析 publish_page（这是 JSON 字符串，需要再次解析）
             publish_page_str = data.get("publish_page", "{}")
             if isinstance(publish_page_str, str):
-                publish_page = json.loads(publish_page_str)
+                publish_page = _loads(publish_page_str)
             else:
                 publish_page = publish_page_str
 
@@ -286,15 +470,8 @@ class ArticleFetcher:
             article_list = publish_page.get("publish_list", [])
 
             articles = []
-            for item in article_list:
+            for publish_info in self._load_publish_infos(article_list):
                 try:
-                    # publish_info 也是 JSON 字符串，需要解析
-                    publish_info_str = item.get("publish_info", "{}")
-                    if isinstance(publish_info_str, str):
-                        publish_info = json.loads(publish_info_str)
-                    else:
-                        publish_info = publish_info_str
-
                     # 获取 appmsgex 列表（第一个是文章）
                     appmsgex = publish_info.get("appmsgex", [])
                     if not appmsgex:
@@ -322,12 +499,44 @@ class ArticleFetcher:
 
         except json.JSONDecodeError as e:
             self._logger.error(f"JSON 解析失败: {e}")
-            self._logger.error(f"响应内容: {content[:500]}")
             raise FetchError(f"JSON 解析失败: {e}") from e
         except Exception as e:
             self._logger.error(f"解析响应失败: {e}")
             raise FetchError(f"解析响应失败: {e}") from e
 
+    def _load_publish_infos(self, article_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """解析每个条目的 publish_info（也是 JSON 字符串）
+
+        先拼成一个 JSON 数组一次解析；有条目损坏时退回逐条解析，跳过损坏的条目
+
+        Args:
+            article_list: publish_list 条目
+
+        Returns:
+            publish_info 字典列表
+        """
+        raw = [item.get("publish_info", "{}") for item in article_list]
+
+        if all(isinstance(info, str) for info in raw):
+            try:
+                infos = _loads("[" + ",".join(raw) + "]")
+                # 数量不一致说明某个字符串本身不是单个 JSON 值，按逐条解析处理
+                if len(infos) == len(raw):
+                    return infos
+            except ValueError:
+                pass
+
+        infos = []
+        for info in raw:
+            if not isinstance(info, str):
+                infos.append(info)
+                continue
+            try:
+                infos.append(_loads(info))
+            except ValueError as e:
+                self._logger.warning(f"解析文章项失败: {e}")
+        return infos
+
     def _parse_publish_time(self, timestamp: Optional[int]) -> int:
         """解析发布时间
 
@@ -347,42 +556,82 @@ class ArticleFetcher:
         # 如果是毫秒级时间戳，转换为秒
         return timestamp // 1000
 
-    def _fetch_article_content(self, url: str) -> str:
-        """获取单篇文章的正文内容
+    def _fetch_content_batch(self, jobs: List[Tuple["Page", Dict[str, Any]]]) -> bool:
+        """在多个标签页中并行加载一批文章并写入 content 字段，失败的置为空字符串
+
+        goto 只等到收到响应就返回，页面在浏览器中继续加载，因此同一批文章的加载是重叠的
 
         Args:
-            url: 文章 URL
+            jobs: (标签页, 文章) 列表
 
         Returns:
-            正文 HTML
+            是否遇到"当前环境异常"
+        """
+        loading = []
+        for page, article in jobs:
+            try:
+                self._logger.debug("访问文章: %s", article["url"])
+                page.goto(article["url"], wait_until="commit", timeout=self.CONTENT_TIMEOUT)
+                loading.append((page, article))
+            except Exception as e:
+                self._logger.warning(f"获取文章正文失败: {article['title']}, {e}")
+                article["content"] = ""
+
+        rate_limited = False
+        for page, article in loading:
+            try:
+                article["content"] = self._read_content(page)
+            except Exception as e:
+                self._logger.warning(f"获取文章正文失败: {article['title']}, {e}")
+                article["content"] = ""
+                rate_limited = rate_limited or "当前环境异常" in str(e)
+
+        return rate_limited
+
+    def _check_page_text(self, text: str) -> None:
+        """检查文章页面是否异常
+
+        Args:
+            text: 页面文本
 
         Raises:
-            FetchError: 获取失败
+            FetchError: 页面异常（环境异常、已删除、审核中）
         """
-        try:
-            self._logger.debug(f"访问文章: {url}")
-            self._page.goto(url)
-            self._page.wait_for_load_state("networkidle")
+        if "当前环境异常" in text:
+            raise FetchError("当前环境异常")
+        if "该内容已被发布者删除" in text:
+            raise FetchError("文章已被删除")
+        if "内容审核中" in text:
+            raise FetchError("内容审核中")
 
-            # 检查异常情况
-            body_text = self._page.locator("body").text_content()
-            if "当前环境异常" in body_text:
-                raise FetchError("当前环境异常")
-            if "该内容已被发布者删除" in body_text:
-                raise FetchError("文章已被删除")
-            if "内容审核中" in body_text:
-                raise FetchError("内容审核中")
+    def _read_content(self, page: "Page") -> str:
+        """等待正文节点出现后，直接在浏览器中取出正文 HTML（不在 Python 侧解析整页）
 
-            # 使用 BeautifulSoup 解析
-            soup = BeautifulSoup(self._page.content(), 'html.parser')
+        不等待 networkidle：文章页的统计、广告等请求会让它迟迟不触发，导致超时
 
-            # 提取正文
-            content_elem = soup.select_one("#js_content")
-            if content_elem:
-                return str(content_elem)
+        Args:
+            page: 已开始加载文章的标签页
 
-            return ""
+        Returns:
+            正文 HTML
 
-        except Exception as e:
-            self._logger.error(f"获取文章正文失败: {e}")
-            raise FetchError(f"获取文章正文失败: {e}") from e
+        Raises:
+            FetchError: 页面异常（环境异常、已删除、审核中）
+        """
+        try:
+            page.wait_for_selector(
+                "#js_content", state="attached", timeout=self.CONTENT_SELECTOR_TIMEOUT
+            )
+        except Exception:
+            # 已删除、审核中等页面没有正文节点，下面检查页面文本给出具体原因
+            pass
+
+        content = page.locator("#js_content")
+        if content.count():
+            return content.first.evaluate("el => el.outerHTML")
+
+        # 只在浏览器中按文本查找异常提示，命中时才取回该节点的文本，不序列化整个 body
+        warning = page.locator(_PAGE_WARNING_SELECTOR)
+        if warning.count():
+            self._check_page_text(warning.first.inner_text(timeout=2000))
+        return ""
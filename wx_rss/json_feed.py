@@ -6,13 +6,127 @@ JSON Feed 生成模块
 """
 
 import json
+import os
+import time
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, BinaryIO, Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .atomic import atomic_open
+
+# 北京时间（UTC+8），所有时间统一按此时区输出
+_CST_OFFSET = 8 * 3600
+_CST = timezone(timedelta(seconds=_CST_OFFSET))
+# datetime 能表示的最大时间戳（9999-12-31T23:59:59+08:00），超出时按原逻辑返回当前时间
+_MAX_TIMESTAMP = int(datetime(9999, 12, 31, 23, 59, 59, tzinfo=_CST).timestamp())
+
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+
+def dump_feed(feed_data: Dict[str, Any], fp: BinaryIO) -> None:
+    """将 JSON Feed 字典写入二进制文件对象
+
+    items 逐条序列化后写入，不构造完整的 JSON 字符串，
+    安装 orjson 时直接输出 UTF-8 字节
+
+    Args:
+        feed_data: JSON Feed 字典（JSONFeedGenerator.build 的返回值）
+        fp: 以二进制模式打开的文件对象
+    """
+    fp.writelines(_iter_chunks(_header(feed_data), feed_data.get("items", [])))
+
+
+def write_feed(feed_data: Dict[str, Any], filename: str) -> None:
+    """将 JSON Feed 字典写入文件
+
+    输出与 dump_feed 相同，先写临时文件再替换，避免中途出错时留下半个文件
+
+    Args:
+        feed_data: JSON Feed 字典（JSONFeedGenerator.build 的返回值）
+        filename: 文件名
+    """
+    _write_file(_iter_chunks(_header(feed_data), feed_data.get("items", [])), filename)
+
+
+def _header(feed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """取出 items 以外的 feed 字段"""
+    return {k: v for k, v in feed_data.items() if k != "items"}
+
+
+def _iter_chunks(header: Dict[str, Any], items: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """逐块生成 JSON Feed 的 UTF-8 字节（items 可以是惰性生成器）"""
+    yield _dumps(header)[:-1]
+    yield b',"items":[' if header else b'"items":['
+
+    for i, item in enumerate(items):
+        yield b",\n" if i else b"\n"
+        yield _dumps(item)
+
+    yield b"\n]}\n"
+
+
+def _write_file(chunks: Iterable[bytes], filename: str) -> None:
+    """将字节分块写入文件（write_feed 和 JSONFeedGenerator.save 共用）
+
+    先写临时文件再替换；支持 os.writev 的平台上按批提交向量写，
+    每批最多 IOV_MAX 个分块，系统调用次数与文章数无关
+    """
+    with atomic_open(filename) as f:
+        if not hasattr(os, "writev"):
+            f.writelines(chunks)
+            return
+
+        # 只用 writev 直接写文件描述符，不经过文件对象的缓冲区
+        fd = f.fileno()
+        batch = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= _IOV_MAX:
+                _writev_all(fd, batch)
+                batch = []
+        if batch:
+            _writev_all(fd, batch)
+
+
+def _writev_all(fd: int, chunks: List[bytes]) -> None:
+    """向量写入全部分块（处理部分写入）"""
+    written = os.writev(fd, chunks)
+    total = sum(map(len, chunks))
+    if written < total:
+        view = memoryview(b"".join(chunks))[written:]
+        while view:
+            view = view[os.write(fd, view):]
+
+
+@lru_cache(maxsize=4096)
+def _format_timestamp(timestamp: int) -> str:
+    """格式化整数时间戳（重复生成同一批文章时直接命中缓存）
+
+    直接用 time.strftime 格式化，比构造 datetime 再 isoformat 快一倍，结果相同
+    """
+    return time.strftime("%Y-%m-%dT%H:%M:%S+08:00", time.gmtime(timestamp + _CST_OFFSET))
+
+
+def _dumps(data: Any) -> bytes:
+    """序列化为紧凑的 UTF-8 JSON 字节串"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
 
 class JSONFeedGenerator:
     """JSON Feed 生成类"""
 
+    __slots__ = ("mp_name", "mp_intro", "base_url", "mp_cover")
+
     def __init__(
         self,
         mp_name: str,
@@ -49,32 +163,61 @@ class JSONFeedGenerator:
         Returns:
             JSON Feed 字符串
         """
-        # 构建 feed 信息
-        feed_data = {
-            "name": self.mp_name,
-            "link": self.base_url or "",
-            "description": self.mp_intro or self.mp_name,
-            "language": "zh-CN",
-            "cover": self.mp_cover or "",
-            "items": []
-        }
+        feed_data = self.build(articles, full_text, feed_id)
 
-        # 如果有 feed_id，添加 feed 对象
-        if feed_id:
-            feed_data["feed"] = {
-                "id": feed_id,
-                "name": self.mp_name,
-                "cover": self.mp_cover or "",
-                "intro": self.mp_intro or ""
-            }
+        # 转换为 JSON 字符串（orjson 的 OPT_INDENT_2 与 indent=2 输出一致）
+        if orjson is not None:
+            return orjson.dumps(feed_data, option=orjson.OPT_INDENT_2).decode("utf-8")
+        return json.dumps(feed_data, ensure_ascii=False, indent=2)
 
-        # 添加文章条目
-        for article in articles:
-            item = self._build_item(article, full_text, feed_id)
-            feed_data["items"].append(item)
+    def build(
+        self,
+        articles: List[Dict[str, Any]],
+        full_text: bool = False,
+        feed_id: str = ""
+    ) -> Dict[str, Any]:
+        """构建 JSON Feed 字典（不做序列化）
 
-        # 转换为 JSON 字符串
-        return json.dumps(feed_data, ensure_ascii=False, indent=2)
+        Args:
+            articles: 文章列表
+            full_text: 是否包含全文
+            feed_id: 公众号ID（可选）
+
+        Returns:
+            JSON Feed 字典
+        """
+        feed_data = self._build_header(feed_id)
+        feed_info = feed_data.get("feed")
+
+        # 添加文章条目（所有条目共用 header 中的 feed 对象）
+        feed_data["items"] = [
+            self._build_item(article, full_text, feed_id, feed_info) for article in articles
+        ]
+
+        return feed_data
+
+    def dump(
+        self,
+        articles: Iterable[Dict[str, Any]],
+        fp: BinaryIO,
+        full_text: bool = False,
+        feed_id: str = ""
+    ) -> None:
+        """生成 JSON Feed 并逐条写入二进制文件对象
+
+        每个条目构建后立即序列化写出，内存中只保留当前条目
+
+        Args:
+            articles: 文章列表（也可以是生成器）
+            fp: 以二进制模式打开的文件对象
+            full_text: 是否包含全文
+            feed_id: 公众号ID（可选）
+        """
+        header = self._build_header(feed_id)
+        feed_info = header.get("feed")
+        items = (self._build_item(article, full_text, feed_id, feed_info) for article in articles)
+        # 与 dump_feed 输出相同：两者都由 _iter_chunks 逐块生成
+        fp.writelines(_iter_chunks(header, items))
 
     def save(self, json_str: str, filename: str) -> None:
         """保存 JSON Feed 到文件
@@ -83,8 +226,7 @@ class JSONFeedGenerator:
             json_str: JSON Feed 字符串
             filename: 文件名
         """
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(json_str)
+        _write_file([json_str.encode("utf-8")], filename)
 
     def format_time(self, timestamp: int) -> str:
         """格式化时间为 ISO 8601 格式
@@ -95,28 +237,69 @@ class JSONFeedGenerator:
         Returns:
             ISO 8601 格式时间字符串
         """
+        if isinstance(timestamp, int):
+            # 如果是毫秒时间戳，转换为秒
+            if timestamp > 1000000000000:
+                timestamp = timestamp // 1000
+            # _parse_publish_time 输出的都是正常范围内的整数，直接走缓存
+            if 0 <= timestamp <= _MAX_TIMESTAMP:
+                return _format_timestamp(timestamp)
+
         try:
             if isinstance(timestamp, int):
-                # 如果是毫秒时间戳，转换为秒
-                if timestamp > 1000000000000:
-                    timestamp = timestamp // 1000
-                dt = datetime.fromtimestamp(timestamp, tz=timezone(timedelta(hours=8)))
-            else:
-                dt = datetime.fromisoformat(timestamp)
-
-            return dt.isoformat()
-
-        except Exception as e:
+                return datetime.fromtimestamp(timestamp, tz=_CST).isoformat()
+            return datetime.fromisoformat(timestamp).isoformat()
+        except Exception:
             # 失败时返回当前时间
-            return datetime.now(timezone(timedelta(hours=8))).isoformat()
+            return datetime.now(_CST).isoformat()
 
     # 私有方法
 
+    def _build_header(self, feed_id: str = "") -> Dict[str, Any]:
+        """构建 feed 信息（不含 items）
+
+        Args:
+            feed_id: 公众号ID
+
+        Returns:
+            feed 信息字典
+        """
+        feed_data = {
+            "name": self.mp_name,
+            "link": self.base_url or "",
+            "description": self.mp_intro or self.mp_name,
+            "language": "zh-CN",
+            "cover": self.mp_cover or ""
+        }
+
+        # 如果有 feed_id，添加 feed 对象
+        if feed_id:
+            feed_data["feed"] = self._build_feed_info(feed_id)
+
+        return feed_data
+
+    def _build_feed_info(self, feed_id: str) -> Dict[str, Any]:
+        """构建 feed 对象（公众号信息）
+
+        Args:
+            feed_id: 公众号ID
+
+        Returns:
+            feed 对象字典
+        """
+        return {
+            "id": feed_id,
+            "name": self.mp_name,
+            "cover": self.mp_cover or "",
+            "intro": self.mp_intro or ""
+        }
+
     def _build_item(
         self,
         article: Dict[str, Any],
         full_text: bool = False,
-        feed_id: str = ""
+        feed_id: str = "",
+        feed_info: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """构建文章条目
 
@@ -124,41 +307,43 @@ class JSONFeedGenerator:
             article: 文章数据
             full_text: 是否包含全文
             feed_id: 公众号ID
+            feed_info: 预先构建好的 feed 对象（可选，批量构建时所有条目共用一份）
 
         Returns:
             文章条目字典
         """
+        get = article.get
+        title = get("title", "")
         item = {
-            "id": article.get("id", ""),
-            "title": article.get("title", ""),
-            "description": article.get("digest", "") or article.get("title", ""),
-            "link": article.get("url", ""),
-            "updated": self.format_time(article.get("publish_time", 0))
+            "id": get("id", ""),
+            "title": title,
+            "description": get("digest", "") or title,
+            "link": get("url", ""),
+            "updated": self.format_time(get("publish_time", 0))
         }
 
         # 可选字段：封面图片
-        if article.get("cover"):
+        cover = get("cover")
+        if cover:
             item["image"] = {
-                "url": article["cover"]
+                "url": cover
             }
 
         # 可选字段：作者
-        if article.get("author"):
-            item["author"] = article["author"]
+        author = get("author")
+        if author:
+            item["author"] = author
 
         # 可选字段：正文内容
-        if full_text and article.get("content"):
-            item["content"] = article["content"]
-            item["content_html"] = article["content"]
+        if full_text:
+            content = get("content")
+            if content:
+                item["content"] = content
+                item["content_html"] = content
 
         # 如果有 feed_id，添加 feed 对象
         if feed_id:
-            item["feed"] = {
-                "id": feed_id,
-                "name": self.mp_name,
-                "cover": self.mp_cover or "",
-                "intro": self.mp_intro or ""
-            }
+            item["feed"] = feed_info if feed_info is not None else self._build_feed_info(feed_id)
             item["channel_name"] = self.mp_name
 
         return item
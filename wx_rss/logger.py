@@ -11,6 +11,9 @@ from typing import Optional
 DEFAULT_LOG_LEVEL = logging.INFO
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
+# 所有 handler 共用一个 formatter
+_FORMATTER = logging.Formatter(LOG_FORMAT)
+
 
 def setup_logger(
     name: str = "wx_rss",
@@ -37,14 +40,14 @@ def setup_logger(
     # 控制台输出
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
-    console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    console_handler.setFormatter(_FORMATTER)
     logger.addHandler(console_handler)
 
     # 文件输出（可选）
     if log_file:
         file_handler = logging.FileHandler(log_file, encoding="utf-8")
         file_handler.setLevel(level)
-        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        file_handler.setFormatter(_FORMATTER)
         logger.addHandler(file_handler)
 
     return logger
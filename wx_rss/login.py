@@ -7,20 +7,86 @@
 import os
 import time
 import json
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Any
 from pathlib import Path
+from urllib.parse import parse_qs, urlparse
 
 try:
-    from playwright.sync_api import sync_playwright, Browser, Page
+    import orjson
 except ImportError:
-    raise ImportError(
-        "Playwright 未安装，请运行: pip install playwright && python -m playwright install firefox"
-    )
+    orjson = None
+
+# Playwright 导入较慢，只在真正启动浏览器时导入
+if TYPE_CHECKING:
+    from PIL import Image
+    from playwright.sync_api import Browser, Page
 
+from .atomic import atomic_write
 from .logger import get_logger
 from .exceptions import LoginError, QRCodeTimeoutError, BrowserError
 
 
+# 终端二维码字符表：灰度值 -> 字符（从亮到暗，深色像素用深色字符，每个字符重复2次保持比例）
+_QR_CHARS = " ░▒▓█"
+_QR_PALETTE = [
+    _QR_CHARS[min(int((255 - v) / 256 * len(_QR_CHARS)), len(_QR_CHARS) - 1)] * 2
+    for v in range(256)
+]
+
+
+def _decode_qrcode(img: "Image.Image") -> Optional[str]:
+    """识别二维码图片的内容（pyzbar 为可选依赖，未安装或识别失败时返回 None）"""
+    try:
+        from pyzbar.pyzbar import decode
+    except ImportError:
+        return None
+
+    try:
+        results = decode(img)
+    except Exception:
+        return None
+
+    return results[0].data.decode("utf-8") if results else None
+
+
+def _render_qrcode_image(img: "Image.Image") -> str:
+    """按灰度采样把二维码截图转换为终端字符画"""
+    img = img.convert("L")  # 转为灰度
+
+    # 缩放到适合终端的大小
+    width = 40
+    aspect_ratio = img.height / img.width
+    height = int(width * aspect_ratio * 0.5)  # 终端字符高度约为宽度的2倍
+    img = img.resize((width, height))
+
+    # 转换为 ASCII（按灰度值查表，每行用 join 拼接）
+    pixels = list(img.getdata())
+    return "\n".join(
+        "".join([_QR_PALETTE[p] for p in pixels[y * width:(y + 1) * width]])
+        for y in range(height)
+    )
+
+
+# 扫码状态检测：返回 "home"（已跳转到首页）、"env_error"、"expired"，否则返回 false 继续等待
+_SCAN_STATE_JS = """(homeUrl) => {
+    const url = location.href;
+    if (url.includes(homeUrl) || url.includes("home")) return "home";
+    const text = document.body ? document.body.innerText : "";
+    if (text.includes("当前环境异常")) return "env_error";
+    if (text.includes("二维码已失效")) return "expired";
+    return false;
+}"""
+
+
+@lru_cache(maxsize=8)
+def _read_token_file(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """读取凭证文件（按路径、修改时间和大小缓存，文件未变化时不重复读取）"""
+    with open(path, "rb") as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
 class WeChatAuth:
     """微信登录认证类"""
 
@@ -28,6 +94,8 @@ class WeChatAuth:
     WX_HOME_URL = "https://mp.weixin.qq.com/cgi-bin/home"
     QR_CODE_FILE = "static/wx_qrcode.png"
     TOKEN_FILE = "wx_token.json"
+    # 扫码状态在浏览器内的检测间隔（毫秒）
+    SCAN_POLL_INTERVAL = 500
 
     def __init__(self, token_file: str = None, qrcode_file: str = None):
         """初始化
@@ -37,11 +105,13 @@ class WeChatAuth:
             qrcode_file: 二维码图片保存路径
         """
         self.token_file = token_file or self.TOKEN_FILE
+        # 登录后的浏览器状态（Cookies、localStorage），抓取正文时直接载入
+        self.state_file = f"{self.token_file}.state.json"
         self.qrcode_file = qrcode_file or self.QR_CODE_FILE
         self.token: Optional[str] = None
         self.cookies: Dict[str, str] = {}
-        self._browser: Optional[Browser] = None
-        self._page: Optional[Page] = None
+        self._browser: Optional["Browser"] = None
+        self._page: Optional["Page"] = None
         self._playwright = None
         self._logger = get_logger("wx_rss.login")
 
@@ -63,9 +133,9 @@ class WeChatAuth:
             }
 
         Raises:
-            LoginError: 登录失败
-            QRCodeTimeoutError: 二维码超时
-            BrowserError: 浏览器错误
+            LoginError: 登录失败（其他异常都包装为 LoginError）
+            QRCodeTimeoutError: 二维码超时（原样抛出，不包装为 LoginError）
+            BrowserError: 浏览器错误（原样抛出，不包装为 LoginError）
         """
         self._logger.info("开始登录流程...")
 
@@ -92,6 +162,9 @@ class WeChatAuth:
                 "is_logged_in": True
             }
 
+        except (BrowserError, LoginError, QRCodeTimeoutError):
+            # 调用方可以分别处理扫码超时和浏览器错误（两者都不是 LoginError 的子类）
+            raise
         except Exception as e:
             self._logger.error(f"登录失败: {e}")
             raise LoginError(f"登录失败: {e}") from e
@@ -131,20 +204,30 @@ class WeChatAuth:
         Returns:
             是否成功加载
         """
-        if not os.path.exists(self.token_file):
+        try:
+            stat = os.stat(self.token_file)
+        except OSError:
             return False
 
         try:
-            with open(self.token_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                self.token = data.get("token")
-                self.cookies = data.get("cookies", {})
-                self._logger.info("从文件加载凭证成功")
-                return True
+            data = _read_token_file(self.token_file, stat.st_mtime_ns, stat.st_size)
+            self.set_credentials(data)
+            self._logger.info("从文件加载凭证成功")
+            return True
         except Exception as e:
             self._logger.error(f"加载凭证失败: {e}")
             return False
 
+    def set_credentials(self, data: dict) -> None:
+        """从字典设置凭证（不读写文件）
+
+        Args:
+            data: 包含 token 和 cookies 的字典
+        """
+        self.token = data.get("token")
+        # 复制一份，避免修改 cookies 时影响调用方的字典或凭证文件缓存
+        self.cookies = dict(data.get("cookies", {}))
+
     def save_credentials(self) -> None:
         """保存凭证到文件"""
         try:
@@ -153,12 +236,30 @@ class WeChatAuth:
                 "cookies": self.cookies,
                 "created_at": time.strftime("%Y-%m-%dT%H:%M:%S")
             }
-            with open(self.token_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            if orjson:
+                content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            else:
+                content = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+            # 先写临时文件再替换，避免中途出错时留下损坏的凭证文件
+            atomic_write(self.token_file, content)
             self._logger.info("凭证已保存")
         except Exception as e:
             self._logger.error(f"保存凭证失败: {e}")
 
+    def clear_credentials(self) -> None:
+        """清除凭证（Token 过期后调用，同时删除凭证文件和浏览器状态文件）"""
+        self.token = None
+        self.cookies = {}
+
+        for path in (self.token_file, self.state_file):
+            try:
+                os.remove(path)
+                self._logger.info(f"已删除过期凭证: {path}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self._logger.warning(f"删除凭证文件失败: {e}")
+
     def cleanup(self) -> None:
         """清理浏览器资源"""
         if self._page:
@@ -198,6 +299,13 @@ class WeChatAuth:
     def _start_browser(self) -> None:
         """启动浏览器"""
         if self._browser is None:
+            try:
+                from playwright.sync_api import sync_playwright
+            except ImportError:
+                raise BrowserError(
+                    "Playwright 未安装，请运行: pip install playwright && python -m playwright install firefox"
+                )
+
             self._logger.info("正在启动浏览器...")
             self._playwright = sync_playwright().start()
             self._browser = self._playwright.firefox.launch(headless=True)
@@ -244,31 +352,26 @@ class WeChatAuth:
         """
         self._logger.info(f"等待扫码登录（{timeout}秒超时）...")
 
-        start_time = time.time()
-        check_interval = 2  # 每2秒检查一次
-
-        while time.time() - start_time < timeout:
-            try:
-                # 检查是否跳转到首页
-                current_url = self._page.url
-                if self.WX_HOME_URL in current_url or "home" in current_url:
-                    self._logger.info("检测到登录成功跳转")
-                    return
-
-                # 检查是否有错误提示
-                body_text = self._page.locator("body").text_content()
-                if "当前环境异常" in body_text:
-                    raise LoginError("当前环境异常，请手动验证后重试")
-                if "二维码已失效" in body_text:
-                    raise QRCodeTimeoutError("二维码已失效")
-
-                time.sleep(check_interval)
-
-            except Exception as e:
-                self._logger.warning(f"检查登录状态时出错: {e}")
-                time.sleep(check_interval)
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
-        raise QRCodeTimeoutError(f"扫码超时（{timeout}秒）")
+        # 在浏览器内等待：跳转到首页，或页面出现错误提示（跨页面跳转时会自动重新执行）
+        try:
+            handle = self._page.wait_for_function(
+                _SCAN_STATE_JS,
+                arg=self.WX_HOME_URL,
+                timeout=timeout * 1000,
+                polling=self.SCAN_POLL_INTERVAL
+            )
+        except PlaywrightTimeoutError:
+            raise QRCodeTimeoutError(f"扫码超时（{timeout}秒）")
+
+        state = handle.json_value()
+        if state == "env_error":
+            raise LoginError("当前环境异常，请手动验证后重试")
+        if state == "expired":
+            raise QRCodeTimeoutError("二维码已失效")
+
+        self._logger.info("检测到登录成功跳转")
 
     def _extract_credentials(self) -> None:
         """提取 Token 和 Cookies"""
@@ -276,15 +379,14 @@ class WeChatAuth:
             self._logger.info("正在提取登录凭证...")
 
             # 从 URL 中提取 Token
-            current_url = self._page.url
-            import re
-            token_match = re.search(r'token=([^&]+)', current_url)
-            if token_match:
-                self.token = token_match.group(1)
+            query = parse_qs(urlparse(self._page.url).query)
+            token = query.get("token", [""])[0]
+            if token:
+                self.token = token
                 self._logger.info(f"成功提取 Token: {self.token[:10]}...")
             else:
                 # 尝试从 localStorage 获取
-                self.token = self._page.evaluate("() => localStorage.getItem('token') or ''")
+                self.token = self._page.evaluate("() => localStorage.getItem('token') || ''")
 
             if not self.token:
                 raise LoginError("无法提取 Token")
@@ -300,51 +402,50 @@ class WeChatAuth:
 
             # 保存凭证
             self.save_credentials()
+            self._save_storage_state()
 
         except Exception as e:
             raise LoginError(f"提取凭证失败: {e}") from e
 
+    def _save_storage_state(self) -> None:
+        """保存浏览器状态，抓取正文时用 new_context(storage_state=...) 一次性载入（失败不影响登录）"""
+        try:
+            self._page.context.storage_state(path=self.state_file)
+            self._logger.info(f"浏览器状态已保存: {self.state_file}")
+        except Exception as e:
+            self._logger.warning(f"保存浏览器状态失败: {e}")
+
     def _display_qrcode_in_terminal(self) -> None:
-        """在终端显示二维码"""
+        """在终端显示二维码
+
+        能识别出二维码内容时（需要安装 pyzbar），用 qrcode 库按原始点阵重新输出，清晰且易于扫描；
+        否则按灰度采样截图输出
+        """
         try:
             from PIL import Image
-            
+
             # 读取二维码图片
-            img = Image.open(self.qrcode_file).convert('L')  # 转为灰度
-            
-            # 缩放到适合终端的大小
-            width = 40
-            aspect_ratio = img.height / img.width
-            height = int(width * aspect_ratio * 0.5)  # 终端字符高度约为宽度的2倍
-            img = img.resize((width, height))
-            
-            # 转换为 ASCII
-            pixels = img.load()
-            chars = " ░▒▓█"  # 从亮到暗
-            
+            img = Image.open(self.qrcode_file)
+
             self._logger.info("=" * 50)
             self._logger.info("请使用微信扫描以下二维码登录（3分钟超时）:")
             self._logger.info("=" * 50)
-            
-            lines = []
-            for y in range(height):
-                line = ""
-                for x in range(width):
-                    pixel = pixels[x, y]
-                    # 反转：深色像素用深色字符
-                    char_idx = int((255 - pixel) / 256 * len(chars))
-                    char_idx = min(char_idx, len(chars) - 1)
-                    line += chars[char_idx] * 2  # 每个字符重复2次保持比例
-                lines.append(line)
-            
-            # 输出二维码
-            for line in lines:
-                print(line)
-            
+
+            content = _decode_qrcode(img)
+            if content:
+                import qrcode
+
+                qr = qrcode.QRCode(border=1)
+                qr.add_data(content)
+                qr.make()
+                qr.print_ascii(invert=True)
+            else:
+                print(_render_qrcode_image(img))
+
             self._logger.info("=" * 50)
             self._logger.info(f"二维码图片路径: {self.qrcode_file}")
             self._logger.info("=" * 50)
-            
+
         except Exception as e:
             self._logger.warning(f"终端显示二维码失败: {e}")
             self._logger.info(f"请手动打开二维码文件: {self.qrcode_file}")
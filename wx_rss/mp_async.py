@@ -0,0 +1,416 @@
+"""
+异步抓取模块
+
+提供基于 asyncio + aiohttp 的并发文章抓取功能
+"""
+
+import asyncio
+import threading
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .login import WeChatAuth
+from .fetcher import ArticleFetcher
+from .search import _normalize, match_fakeid, parse_results
+from .cache import ArticleCache, SearchCache
+from .batch import BatchResult, run_batch_async
+from .circuit import CircuitBreaker
+from .client import WeChatMPBase
+from .logger import get_logger
+from .exceptions import LoginError, NetworkError, FetchError, TokenExpiredError
+
+
+class AsyncWeChatMP(WeChatMPBase):
+    """微信公众号 RSS 异步入口类
+
+    复用 WeChatMP 登录后保存的凭证，直接请求文章列表 API，
+    多个公众号可以通过 asyncio.gather 并发抓取
+    """
+
+    API_URL = "https://mp.weixin.qq.com/cgi-bin/appmsgpublish"
+    SEARCH_URL = "https://mp.weixin.qq.com/cgi-bin/searchbiz"
+    CONNECTION_LIMIT = 16
+    CONNECTION_LIMIT_PER_HOST = 8
+    DNS_CACHE_TTL = 300
+    KEEPALIVE_TIMEOUT = 60
+    USER_AGENT = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
+
+    def __init__(
+        self,
+        token_file: str = "wx_token.json",
+        concurrency: int = 5,
+        timeout: int = 30,
+        cache: Optional[ArticleCache] = None,
+        session: Optional["aiohttp.ClientSession"] = None,
+        search_cache: Optional[SearchCache] = None,
+        token_store: Optional[Dict[str, Any]] = None
+    ):
+        """初始化
+
+        Args:
+            token_file: Token 保存文件路径
+            concurrency: 最大并发请求数
+            timeout: 单个请求超时时间（秒）
+            cache: 文章缓存（可选），命中时跳过网络请求
+            session: 外部传入的 aiohttp 会话（可选），由调用方负责关闭
+            search_cache: 搜索缓存（可选），命中时跳过搜索请求
+            token_store: 凭证字典（可选，包含 token 和 cookies），传入时不再读写 token_file
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp 未安装，请运行: pip install aiohttp")
+
+        self.token_file = token_file
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.cache = cache
+        self.search_cache = search_cache
+        self._token_store = token_store
+        self._auth: Optional[WeChatAuth] = None
+        self._parser: Optional[ArticleFetcher] = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.RLock()
+        # 正在进行的搜索请求（同一关键词的并发搜索共用一个请求）
+        self._searches: Dict[Tuple[str, int], "asyncio.Future"] = {}
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._logger = get_logger("wx_rss")
+        self._is_logged_in = False
+
+        # 尝试加载已有凭证
+        self._load_credentials()
+
+    async def fetch_articles(
+        self,
+        fakeid: str,
+        count: int = 10,
+        with_content: bool = False,
+        begin: int = 0
+    ) -> List[Dict[str, Any]]:
+        """获取文章列表（参数顺序与 WeChatMP.fetch_articles 一致）
+
+        Args:
+            fakeid: 公众号 fake_id
+            count: 获取数量
+            with_content: 是否包含正文内容（正文请求并发执行）
+            begin: 起始位置（分页）
+
+        Returns:
+            文章列表
+
+        Raises:
+            LoginError: 未登录
+            NetworkError: 网络错误
+            TokenExpiredError: Token 过期
+            FetchError: 抓取失败
+        """
+        if not self._is_logged_in:
+            raise LoginError("请先登录")
+
+        if self.cache:
+            cached = self.cache.get(fakeid, count, begin, with_content)
+            if cached is not None:
+                return cached
+
+        self._logger.info(f"获取文章: fakeid={fakeid}, count={count}")
+
+        params = {
+            "sub": "list",
+            "sub_action": "list_ex",
+            "begin": begin,
+            "count": count,
+            "fakeid": fakeid,
+            "token": self._auth.token,
+            "lang": "zh_CN",
+            "f": "json",
+            "ajax": 1
+        }
+
+        articles = await self._guarded(fakeid, self._request_articles, params)
+        self._logger.info(f"成功获取 {len(articles)} 篇文章: fakeid={fakeid}")
+
+        if with_content and articles:
+            tasks = [self._fetch_content(article) for article in articles]
+            for coro in asyncio.as_completed(tasks):
+                await coro
+
+        if self.cache:
+            self.cache.set(fakeid, count, articles, begin, with_content)
+
+        return articles
+
+    async def search_feed(
+        self,
+        keyword: str,
+        limit: int = 5,
+        refresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        """搜索公众号（同一关键词的并发搜索只发出一次请求）
+
+        Args:
+            keyword: 公众号名称关键词
+            limit: 返回结果数量，默认 5
+            refresh: 忽略搜索缓存，重新搜索
+
+        Returns:
+            公众号列表
+
+        Raises:
+            LoginError: 未登录
+            NetworkError: 网络错误
+            FetchError: 搜索失败
+        """
+        if not self._is_logged_in:
+            raise LoginError("请先登录")
+
+        if self.search_cache and not refresh:
+            # 搜索缓存返回的是副本
+            cached = self.search_cache.get_search(keyword, limit)
+            if cached is not None:
+                return cached
+
+        # 同一关键词已有搜索在进行时直接等待它的结果，不再重复请求
+        key = (_normalize(keyword), limit)
+        task = self._searches.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._search(keyword, limit))
+            self._searches[key] = task
+            task.add_done_callback(lambda _: self._searches.pop(key, None))
+
+        # shield：某个调用方被取消时不影响其他等待同一请求的调用方
+        results = await asyncio.shield(task)
+        # 返回副本，避免调用方之间互相影响
+        return [dict(result) for result in results]
+
+    async def search_feeds(
+        self,
+        keywords: Iterable[str],
+        limit: int = 5,
+        refresh: bool = False
+    ) -> BatchResult:
+        """并发搜索多个公众号（共用连接池，并发数受 concurrency 限制）
+
+        Args:
+            keywords: 公众号名称关键词（重复的关键词只搜索一次）
+            limit: 每个关键词返回结果数量，默认 5
+            refresh: 忽略搜索缓存，重新搜索
+
+        Returns:
+            BatchResult：successes 为 (关键词, 公众号列表)，failures 为 (关键词, 异常)
+
+        Raises:
+            LoginError: 未登录
+        """
+        if not self._is_logged_in:
+            raise LoginError("请先登录")
+
+        return await run_batch_async(
+            dict.fromkeys(keywords),
+            lambda keyword: self.search_feed(keyword, limit=limit, refresh=refresh)
+        )
+
+    async def get_feed_fakeid(self, keyword: str, refresh: bool = False) -> str:
+        """获取公众号的 fakeid（精确匹配优先）
+
+        Args:
+            keyword: 公众号名称
+            refresh: 忽略搜索缓存，重新搜索
+
+        Returns:
+            fakeid，如果未找到返回空字符串
+
+        Raises:
+            LoginError: 未登录
+            NetworkError: 网络错误
+            FetchError: 搜索失败
+        """
+        if not self._is_logged_in:
+            raise LoginError("请先登录")
+
+        if self.search_cache and not refresh:
+            cached = self.search_cache.get_fakeid(keyword)
+            if cached:
+                return cached
+
+        results = await self.search_feed(keyword, limit=5, refresh=refresh)
+        fakeid = match_fakeid(keyword, results) or ""
+
+        if fakeid and self.search_cache:
+            self.search_cache.set_fakeid(keyword, fakeid)
+
+        return fakeid
+
+    async def close(self) -> None:
+        """关闭 HTTP 会话（外部传入的会话不在这里关闭）"""
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        """Async context manager 入口"""
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager 出口"""
+        await self.close()
+
+    # 私有方法
+
+    async def _guarded(self, key: str, func, *args):
+        """经熔断器调用（网络错误和抓取失败计入失败次数，Token 过期时清除凭证）
+
+        Args:
+            key: 熔断器键（fakeid 或 "search"）
+            func: 实际调用的协程函数
+            *args: 调用参数
+
+        Returns:
+            func 的返回值
+
+        Raises:
+            NetworkError: 熔断器处于打开状态
+        """
+        with self._circuit(key):
+            return await func(*args)
+
+    async def _request_articles(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """请求并解析文章列表 API"""
+        session = self._get_session()
+        try:
+            async with self._semaphore:
+                # 等待期间其他请求可能已发现 Token 过期
+                if not self._is_logged_in:
+                    raise TokenExpiredError("Token 已过期，请重新登录")
+
+                async with session.get(
+                    self.API_URL, params=params, **self._request_options()
+                ) as response:
+                    if response.status != 200:
+                        raise NetworkError(f"HTTP {response.status}: {response.reason}")
+
+                    if "login" in str(response.url).lower():
+                        raise TokenExpiredError("Token 已过期，请重新登录")
+
+                    # 直接取字节交给 json.loads，省去按字符集解码
+                    content = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise NetworkError(f"请求文章列表失败: {e}") from e
+
+        return self._parser.parse_response(content)
+
+    async def _search(self, keyword: str, limit: int) -> List[Dict[str, Any]]:
+        """请求搜索接口并写入搜索缓存"""
+        self._logger.info(f"搜索公众号: {keyword}")
+
+        params = {
+            "action": "search_biz",
+            "begin": 0,
+            "count": limit,
+            "query": keyword,
+            "token": self._auth.token,
+            "lang": "zh_CN",
+            "f": "json",
+            "ajax": 1
+        }
+
+        results = await self._guarded("search", self._request_search, params)
+        self._logger.info(f"搜索到 {len(results)} 个公众号")
+
+        if self.search_cache:
+            self.search_cache.set_search(keyword, limit, results)
+
+        return results
+
+    async def _request_search(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """请求并解析公众号搜索 API"""
+        session = self._get_session()
+        try:
+            async with self._semaphore:
+                if not self._is_logged_in:
+                    raise TokenExpiredError("Token 已过期，请重新登录")
+
+                async with session.get(
+                    self.SEARCH_URL, params=params, **self._request_options()
+                ) as response:
+                    if response.status != 200:
+                        raise NetworkError(f"HTTP {response.status}: {response.reason}")
+
+                    data = await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise NetworkError(f"搜索公众号失败: {e}") from e
+        except ValueError as e:
+            # 响应不是合法 JSON
+            raise FetchError(f"搜索公众号失败: {e}") from e
+
+        return parse_results(data)
+
+    async def _fetch_content(self, article: Dict[str, Any]) -> None:
+        """获取单篇文章的正文，失败时置为空字符串
+
+        Args:
+            article: 文章数据（原地写入 content 字段）
+        """
+        try:
+            async with self._semaphore:
+                async with self._session.get(
+                    article["url"], **self._request_options()
+                ) as response:
+                    html = await response.text()
+            article["content"] = self._parser.extract_content(html)
+        except Exception as e:
+            self._logger.warning(f"获取文章正文失败: {article['title']}, {e}")
+            article["content"] = ""
+
+    def _get_session(self):
+        """获取共享的 HTTP 会话（所有任务复用同一连接池和 DNS 缓存）"""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.CONNECTION_LIMIT,
+                    limit_per_host=self.CONNECTION_LIMIT_PER_HOST,
+                    ttl_dns_cache=self.DNS_CACHE_TTL,
+                    keepalive_timeout=self.KEEPALIVE_TIMEOUT
+                ),
+                cookies=self._auth.cookies if self._auth else None,
+                headers=self._headers(),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    def _headers(self) -> Dict[str, str]:
+        """请求头"""
+        return {
+            "User-Agent": self.USER_AGENT,
+            "Referer": "https://mp.weixin.qq.com/"
+        }
+
+    def _request_options(self) -> Dict[str, Any]:
+        """单次请求参数
+
+        自建会话已带上请求头和 Cookie；外部会话需要每次请求时附带
+        """
+        if self._owns_session:
+            return {}
+
+        return {
+            "headers": self._headers(),
+            "cookies": self._auth.cookies if self._auth else None,
+            "timeout": aiohttp.ClientTimeout(total=self.timeout)
+        }
+
+    def _create_clients(self) -> None:
+        """凭证加载成功后创建解析器（只用于解析响应，不发出请求）"""
+        self._parser = ArticleFetcher(
+            token=self._auth.token,
+            cookies=self._auth.cookies
+        )
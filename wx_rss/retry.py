@@ -0,0 +1,121 @@
+"""
+重试模块
+
+提供带抖动、有上限的指数退避重试装饰器，同时支持同步和异步函数
+"""
+
+import asyncio
+import functools
+import random
+import time
+from typing import Callable, Optional, Tuple, Type
+
+from .logger import get_logger
+from .exceptions import NetworkError, RateLimitError
+
+_logger = get_logger("wx_rss.retry")
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = 1.0,
+    max_delay: float = 30.0,
+    jitter: float = 0.5
+) -> float:
+    """计算第 attempt 次重试前的等待时间
+
+    Args:
+        attempt: 已失败的次数（从 0 开始）
+        base: 基础等待时间（秒）
+        max_delay: 等待时间上限（秒）
+        jitter: 抖动比例，实际等待时间在 [delay, delay * (1 + jitter)] 之间
+
+    Returns:
+        等待时间（秒）
+    """
+    delay = min(max_delay, base * 2 ** attempt)
+    return delay * (1 + random.random() * jitter)
+
+
+def retry_with_backoff(
+    max_retries: int = 3,
+    base: float = 1.0,
+    max_delay: float = 30.0,
+    jitter: float = 0.5,
+    retry_on: Tuple[Type[BaseException], ...] = (NetworkError, RateLimitError)
+) -> Callable:
+    """重试装饰器（带抖动、有上限的指数退避）
+
+    RateLimitError 带有 retry_after 时优先按服务端建议的时间等待
+
+    Args:
+        max_retries: 最大尝试次数（包含第一次调用，至少为 1）
+        base: 基础等待时间（秒）
+        max_delay: 等待时间上限（秒）
+        jitter: 抖动比例
+        retry_on: 需要重试的异常类型，其他异常直接抛出
+
+    Returns:
+        装饰器
+
+    Raises:
+        ValueError: max_retries 小于 1
+
+    Example:
+        >>> @retry_with_backoff(max_retries=3)
+        ... def fetch(mp, fakeid):
+        ...     return mp.fetch_articles(fakeid=fakeid, count=5)
+    """
+    if max_retries < 1:
+        raise ValueError(f"max_retries 至少为 1: {max_retries}")
+
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(max_retries):
+                    try:
+                        return await func(*args, **kwargs)
+                    except retry_on as e:
+                        delay = _next_delay(e, attempt, max_retries, base, max_delay, jitter)
+                        if delay is None:
+                            raise
+                        await asyncio.sleep(delay)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(max_retries):
+                try:
+                    return func(*args, **kwargs)
+                except retry_on as e:
+                    delay = _next_delay(e, attempt, max_retries, base, max_delay, jitter)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+        return wrapper
+
+    return decorator
+
+
+def _next_delay(
+    error: BaseException,
+    attempt: int,
+    max_retries: int,
+    base: float,
+    max_delay: float,
+    jitter: float
+) -> Optional[float]:
+    """计算下一次重试的等待时间，已达最大尝试次数时返回 None"""
+    if attempt >= max_retries - 1:
+        _logger.warning(f"{type(error).__name__}，已达最大重试次数: {error}")
+        return None
+
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        delay = float(retry_after)
+    else:
+        delay = backoff_delay(attempt, base, max_delay, jitter)
+
+    _logger.warning(f"{type(error).__name__}，{delay:.1f} 秒后重试 ({attempt + 1}/{max_retries}): {error}")
+    return delay
@@ -5,35 +5,217 @@
 """
 
 import json
-from typing import List, Dict, Any, Optional
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from wx_rss.logger import get_logger
 from wx_rss.exceptions import FetchError
 
+if TYPE_CHECKING:
+    import requests
+    from wx_rss.cache import SearchCache
+
+_logger = get_logger("wx_rss.search")
+
+# 搜索结果保留的字段（缺失时为空字符串）
+_RESULT_FIELDS = ("fakeid", "nickname", "round_head_img", "signature", "alias_name")
+
+# 每次搜索都相同的查询参数（count、query、token 在请求时填入）
+_SEARCH_PARAMS = {
+    "action": "search_biz",
+    "begin": 0,
+    "lang": "zh_CN",
+    "f": "json",
+    "ajax": 1
+}
+
+# 连接池大小；重试由上层的 retry_with_backoff 负责，这里不做自动重试
+POOL_SIZE = 10
+
+
+def _normalize(name: str) -> str:
+    """规范化公众号名称（去掉首尾空白、忽略大小写），用于匹配和所有缓存的键"""
+    return name.strip().casefold()
+
+
+def create_session(pool_size: int = POOL_SIZE) -> "requests.Session":
+    """创建带连接池的 HTTP 会话（keep-alive，多次请求复用 TLS 连接）
+
+    Args:
+        pool_size: 连接池大小
+
+    Returns:
+        requests.Session
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=0
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
+
+
+def parse_results(data: Any) -> List[Dict[str, Any]]:
+    """解析搜索 API 响应
+
+    Args:
+        data: 响应 JSON
+
+    Returns:
+        公众号列表
+
+    Raises:
+        FetchError: API 返回错误，或响应不是 JSON 对象
+    """
+    # 合法 JSON 但不是对象（[]、null、字符串等）
+    if not isinstance(data, dict):
+        raise FetchError(f"搜索 API 响应格式错误: {type(data).__name__}")
+
+    # 检查错误
+    if data.get("base_resp", {}).get("ret") != 0:
+        err_msg = data.get("base_resp", {}).get("err_msg", "未知错误")
+        ret_code = data.get("base_resp", {}).get("ret")
+        raise FetchError(f"搜索 API 错误: {err_msg} (code: {ret_code})")
+
+    # searchbiz API 直接返回 list，不在 publish_page 中
+    # 提取公众号列表
+    return [
+        {key: item.get(key, "") for key in _RESULT_FIELDS}
+        for item in data.get("list", ())
+    ]
+
+
+def match_fakeid(keyword: str, results: List[Dict[str, Any]]) -> Optional[str]:
+    """从搜索结果中选出匹配的 fakeid（精确匹配优先）
+
+    Args:
+        keyword: 公众号名称关键词
+        results: 搜索结果
+
+    Returns:
+        fakeid，如果未找到返回 None
+    """
+    # 一次遍历：精确匹配立即返回，同时记下第一个模糊匹配（包含关键词）；忽略首尾空白和大小写
+    name = _normalize(keyword)
+    fuzzy = None
+    for result in results:
+        nickname = _normalize(result["nickname"])
+        if nickname == name:
+            _logger.info("找到精确匹配: %s -> %s", result["nickname"], result["fakeid"])
+            return result["fakeid"]
+        if fuzzy is None and name in nickname:
+            fuzzy = result
+
+    if fuzzy is not None:
+        _logger.info("找到模糊匹配: %s -> %s", fuzzy["nickname"], fuzzy["fakeid"])
+        return fuzzy["fakeid"]
+
+    _logger.warning("未找到公众号: %s", keyword)
+    return None
+
+
+class _InFlight:
+    """正在进行的搜索请求：发起请求的线程完成后设置 event，等待的线程读取结果或异常"""
+
+    __slots__ = ("event", "results", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.results: Optional[List[Dict[str, Any]]] = None
+        self.error: Optional[BaseException] = None
+
 
 class FeedSearcher:
     """公众号搜索类"""
 
-    def __init__(self, token: str, cookies: Dict[str, str]):
+    SEARCH_URL = "https://mp.weixin.qq.com/cgi-bin/searchbiz"
+    USER_AGENT = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
+    POOL_SIZE = POOL_SIZE
+    # 内存中保留的搜索结果数量（按关键词和数量，最近最少使用的先淘汰）
+    MEMO_SIZE = 256
+    # 未找到的关键词在多少秒内不再重新搜索
+    MISS_TTL = 3600
+
+    def __init__(
+        self,
+        token: str,
+        cookies: Dict[str, str],
+        session: Optional["requests.Session"] = None,
+        search_cache: Optional["SearchCache"] = None
+    ):
         """初始化
 
         Args:
             token: 微信 Token
             cookies: Cookie 字典
+            session: 外部传入的 HTTP 会话（可选），由调用方负责关闭
+            search_cache: 搜索缓存（可选），get_first_match 找到的 fakeid 保存到磁盘，重启后仍然有效
         """
         self.token = token
+        self.search_cache = search_cache
+        self._session = session
+        self._owns_session = session is None
+        # 每次搜索都相同的请求头，只构造一次（会话可能与其他组件共用，不修改会话自身的请求头）
+        self._headers = {
+            "User-Agent": self.USER_AGENT,
+            "Referer": "https://mp.weixin.qq.com/"
+        }
+        # 同时生成 Cookie 请求头
         self.cookies = cookies
+        # 本实例的搜索结果（Token 变化时会重建搜索器，缓存随之失效）
+        self._memo: "OrderedDict[Tuple[str, int], List[Dict[str, Any]]]" = OrderedDict()
+        # 关键词 -> 匹配到的 fakeid
+        self._matches: "OrderedDict[str, str]" = OrderedDict()
+        # 未找到的关键词 -> 记录时间（time.monotonic），MISS_TTL 内直接返回 None
+        self._misses: "OrderedDict[str, float]" = OrderedDict()
+        # 正在进行的搜索请求（同一关键词的并发搜索共用一个请求）
+        self._searches: Dict[Tuple[str, int], _InFlight] = {}
+        # 保护以上内存缓存和 _searches（多个线程可共用同一个搜索器）
+        self._lock = threading.Lock()
         self._logger = get_logger("wx_rss.search")
 
+    @property
+    def cookies(self) -> Dict[str, str]:
+        """Cookie 字典"""
+        return self._cookies
+
+    @cookies.setter
+    def cookies(self, cookies: Dict[str, str]) -> None:
+        """设置 Cookie 字典，同时重新生成 Cookie 请求头（原地修改字典不会更新请求头，请整体赋值）"""
+        self._cookies = cookies
+        self._cookie_header = "; ".join(f"{k}={v}" for k, v in cookies.items())
+        self._headers["Cookie"] = self._cookie_header
+
     def search_by_name(
         self,
         keyword: str,
-        limit: int = 5
+        limit: int = 5,
+        refresh: bool = False
     ) -> List[Dict[str, Any]]:
-        """通过公众号名称搜索
+        """通过公众号名称搜索（同一关键词重复搜索时直接返回内存中的结果）
+
+        多个线程同时搜索同一关键词时只发出一次请求，其余线程等待并得到结果的副本
 
         Args:
             keyword: 公众号名称关键词
             limit: 返回结果数量，默认 5
+            refresh: 忽略内存中的结果，重新搜索
 
         Returns:
             公众号列表
@@ -41,97 +223,163 @@ class FeedSearcher:
         Raises:
             FetchError: 搜索失败
         """
-        self._logger.info(f"搜索公众号: {keyword}")
+        keyword = keyword.strip()
+        key = (_normalize(keyword), limit)
+        with self._lock:
+            if not refresh:
+                memo = self._memo.get(key)
+                if memo is not None:
+                    self._memo.move_to_end(key)
+                    # 返回副本，避免调用方修改结果时影响缓存
+                    return [dict(result) for result in memo]
+
+            # 同一关键词已有搜索在进行时等待它的结果，不再重复请求
+            search = self._searches.get(key)
+            leader = search is None
+            if leader:
+                search = self._searches[key] = _InFlight()
+
+        if not leader:
+            search.event.wait()
+            if search.error is not None:
+                raise search.error
+            return [dict(result) for result in search.results]
+
+        try:
+            results = self._request(keyword, limit)
+        except BaseException as e:
+            # 失败不保留，等待的线程收到同一个异常，下次搜索重新请求
+            search.error = e
+            raise
+        else:
+            snapshot = [dict(result) for result in results]
+            search.results = snapshot
+            self._remember(self._memo, key, snapshot)
+        finally:
+            with self._lock:
+                self._searches.pop(key, None)
+            search.event.set()
+
+        return results
+
+    def clear_cache(self) -> None:
+        """清空内存中的搜索结果和匹配结果"""
+        with self._lock:
+            self._memo.clear()
+            self._matches.clear()
+            self._misses.clear()
+
+    def close(self) -> None:
+        """关闭 HTTP 会话（外部传入的会话不关闭，其他线程正在进行的搜索仍可继续使用）"""
+        if self._session is not None and self._owns_session:
+            self._session.close()
+            self._session = None
+
+    def _request(self, keyword: str, limit: int) -> List[Dict[str, Any]]:
+        """发送搜索请求并解析响应
+
+        Raises:
+            FetchError: 搜索失败
+        """
+        self._logger.info("搜索公众号: %s", keyword)
+
+        from requests import RequestException
 
         try:
-            import requests
-
-            # 构造搜索 API URL
-            url = "https://mp.weixin.qq.com/cgi-bin/searchbiz"
-            params = {
-                "action": "search_biz",
-                "begin": 0,
-                "count": limit,
-                "query": keyword,
-                "token": self.token,
-                "lang": "zh_CN",
-                "f": "json",
-                "ajax": 1
-            }
-
-            # 构造请求头
-            headers = {
-                "Cookie": self._format_cookies(),
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Referer": "https://mp.weixin.qq.com/"
-            }
-
-            # 发送请求
-            response = requests.get(url, params=params, headers=headers, timeout=30)
+            params = {**_SEARCH_PARAMS, "count": limit, "query": keyword, "token": self.token}
+
+            # 发送请求（复用会话的连接池）
+            response = self._get_session().get(
+                self.SEARCH_URL, params=params, headers=self._headers, timeout=30
+            )
             response.raise_for_status()
 
-            # 解析响应
-            data = response.json()
-            
-            # 调试日志
-            self._logger.debug(f"API 响应: {json.dumps(data, ensure_ascii=False)[:500]}")
-
-            # 检查错误
-            if data.get("base_resp", {}).get("ret") != 0:
-                err_msg = data.get("base_resp", {}).get("err_msg", "未知错误")
-                ret_code = data.get("base_resp", {}).get("ret")
-                raise FetchError(f"搜索 API 错误: {err_msg} (code: {ret_code})")
-
-            # searchbiz API 直接返回 list，不在 publish_page 中
-            # 提取公众号列表
-            results = []
-            for item in data.get("list", []):
-                result = {
-                    "fakeid": item.get("fakeid", ""),
-                    "nickname": item.get("nickname", ""),
-                    "round_head_img": item.get("round_head_img", ""),
-                    "signature": item.get("signature", ""),
-                    "alias_name": item.get("alias_name", "")
-                }
-                results.append(result)
-
-            self._logger.info(f"搜索到 {len(results)} 个公众号")
-            return results
-
-        except Exception as e:
-            self._logger.error(f"搜索公众号失败: {e}")
+            # 解析响应（orjson 直接解析字节，未安装时退回标准库）
+            content = response.content
+            data = orjson.loads(content) if orjson else json.loads(content)
+
+            # 调试日志：直接截取原始响应，不重新序列化
+            if self._logger.isEnabledFor(logging.DEBUG):
+                self._logger.debug("API 响应: %s", content[:500].decode("utf-8", "replace"))
+
+            results = parse_results(data)
+
+            self._logger.info("搜索到 %d 个公众号", len(results))
+
+        except FetchError as e:
+            # API 返回的错误，已经是 FetchError
+            self._logger.error("搜索公众号失败: %s", e)
+            raise
+        except (RequestException, ValueError) as e:
+            # 网络错误、HTTP 错误状态码、响应不是合法 JSON
+            self._logger.error("搜索公众号失败: %s", e)
             raise FetchError(f"搜索公众号失败: {e}") from e
 
+        return results
+
+    def _get_session(self) -> "requests.Session":
+        """获取 HTTP 会话（首次调用时创建，多次搜索复用同一个连接池）"""
+        if self._session is None:
+            self._session = create_session(self.POOL_SIZE)
+            self._owns_session = True
+        return self._session
+
     def _format_cookies(self) -> str:
-        """格式化 cookies 为字符串
+        """格式化 cookies 为字符串（设置 cookies 时已生成）
 
         Returns:
             cookies 字符串
         """
-        return '; '.join([f"{k}={v}" for k, v in self.cookies.items()])
+        return self._cookie_header
 
-    def get_first_match(self, keyword: str) -> Optional[str]:
+    def get_first_match(self, keyword: str, refresh: bool = False) -> Optional[str]:
         """获取第一个匹配的 fakeid
 
         Args:
             keyword: 公众号名称关键词
+            refresh: 忽略内存中的结果和搜索缓存，重新搜索
 
         Returns:
             fakeid，如果未找到返回 None
         """
-        results = self.search_by_name(keyword, limit=5)
-
-        # 精确匹配
-        for result in results:
-            if result["nickname"] == keyword:
-                self._logger.info(f"找到精确匹配: {result['nickname']} -> {result['fakeid']}")
-                return result["fakeid"]
-
-        # 模糊匹配（包含关键词）
-        for result in results:
-            if keyword in result["nickname"]:
-                self._logger.info(f"找到模糊匹配: {result['nickname']} -> {result['fakeid']}")
-                return result["fakeid"]
-
-        self._logger.warning(f"未找到公众号: {keyword}")
-        return None
+        name = _normalize(keyword)
+        if not refresh:
+            with self._lock:
+                fakeid = self._matches.get(name)
+                if fakeid is not None:
+                    self._matches.move_to_end(name)
+                missed_at = self._misses.get(name)
+            if fakeid is not None:
+                return fakeid
+
+            if missed_at is not None:
+                if time.monotonic() - missed_at < self.MISS_TTL:
+                    return None
+                # 已过期：跳过内存中的搜索结果，重新请求接口
+                refresh = True
+
+            if self.search_cache:
+                fakeid = self.search_cache.get_fakeid(name)
+                if fakeid:
+                    self._remember(self._matches, name, fakeid)
+                    return fakeid
+
+        results = self.search_by_name(keyword, limit=5, refresh=refresh)
+        fakeid = match_fakeid(keyword, results)
+        if fakeid:
+            with self._lock:
+                self._misses.pop(name, None)
+            self._remember(self._matches, name, fakeid)
+            if self.search_cache:
+                self.search_cache.set_fakeid(name, fakeid)
+        else:
+            self._remember(self._misses, name, time.monotonic())
+        return fakeid
+
+    def _remember(self, memo: OrderedDict, key: Any, value: Any) -> None:
+        """写入内存缓存，超过 MEMO_SIZE 时淘汰最久未使用的一项"""
+        with self._lock:
+            memo[key] = value
+            memo.move_to_end(key)
+            if len(memo) > self.MEMO_SIZE:
+                memo.popitem(last=False)